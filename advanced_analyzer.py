@@ -15,13 +15,13 @@ from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.neural_network import MLPClassifier
 from sklearn.model_selection import cross_val_score
 from sklearn.preprocessing import StandardScaler
-import sqlite3
 import os
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
 import pickle
 from pathlib import Path
 import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # V3.0: XGBoost (optional)
 try:
@@ -31,37 +31,11 @@ except ImportError:
     XGBOOST_AVAILABLE = False
 
 from data_engine import DataEngine
-
-
-def _get_supabase_url() -> Optional[str]:
-    """Get Supabase URL from Streamlit secrets or environment"""
-    # Method 1: Streamlit secrets
-    try:
-        import streamlit as st
-        if hasattr(st, 'secrets') and 'SUPABASE_DB_URL' in st.secrets:
-            return st.secrets['SUPABASE_DB_URL']
-    except:
-        pass
-    
-    # Method 2: Environment variable
-    return os.environ.get('SUPABASE_DB_URL')
-
-
-def _get_db_connection(db_path: str = "btts_data.db"):
-    """Get database connection (PostgreSQL or SQLite)"""
-    supabase_url = _get_supabase_url()
-    
-    if supabase_url:
-        try:
-            import psycopg2
-            conn = psycopg2.connect(supabase_url)
-            return conn, True  # (connection, is_postgres)
-        except ImportError:
-            print("⚠️ psycopg2 not installed")
-        except Exception as e:
-            print(f"⚠️ PostgreSQL connection error: {e}")
-    
-    return sqlite3.connect(db_path), False  # (connection, is_postgres)
+from api_football import APIFootball, get_api_football
+from match_snapshot import refresh_snapshot
+from probability_kernel import at_least
+from scoreline_engine import DEFAULT_RHO, ScorelineMatrix, price_fixtures
+from dixon_coles_fit import league_home_away_factors, league_rho
 
 
 try:
@@ -72,6 +46,7 @@ except ImportError:
 
 try:
     from clv_tracker import CLVTracker
+    from prediction_logger import get_prediction_logger
     CLV_AVAILABLE = True
 except ImportError:
     CLV_AVAILABLE = False
@@ -85,35 +60,16 @@ class DixonColesModel:
     Dixon-Coles Correction for Poisson Distribution
     
     Korrigiert die Unabhängigkeits-Annahme für niedrige Spielstände (0-0, 1-0, 0-1, 1-1)
-    Empirisch validiert: rho ≈ -0.03 bis -0.13 je nach Liga
+    Empirisch validiert: rho ≈ -0.03 bis -0.13 je nach Liga (dixon_coles_fit)
+    
+    Bei rho < 0: 0-0 und 1-1 werden wahrscheinlicher (defensive Spiele)
+    Bei rho > 0: 1-0 und 0-1 werden wahrscheinlicher (einseitige Spiele)
     """
-    def __init__(self, rho: float = -0.05):
+    def __init__(self, rho: float = DEFAULT_RHO):
         self.rho = rho
     
-    def tau(self, home_goals: int, away_goals: int) -> float:
-        """
-        Korrektur-Faktor für niedrige Spielstände
-        
-        Bei rho < 0: 0-0 und 1-1 werden wahrscheinlicher (defensive Spiele)
-        Bei rho > 0: 1-0 und 0-1 werden wahrscheinlicher (einseitige Spiele)
-        """
-        if home_goals == 0 and away_goals == 0:
-            return 1 - self.rho
-        elif home_goals == 1 and away_goals == 0:
-            return 1 + self.rho / 2
-        elif home_goals == 0 and away_goals == 1:
-            return 1 + self.rho / 2
-        elif home_goals == 1 and away_goals == 1:
-            return 1 - self.rho
-        else:
-            return 1.0
-    
-    def poisson_prob(self, k: int, lambda_val: float) -> float:
-        if lambda_val <= 0:
-            return 1.0 if k == 0 else 0.0
-        return (lambda_val ** k) * math.exp(-lambda_val) / math.factorial(k)
-    
-    def calculate_btts_probability(self, lambda_home: float, lambda_away: float) -> float:
+    def calculate_btts_probability(self, lambda_home: float, lambda_away: float,
+                                   rho: Optional[float] = None) -> float:
         """
         KORRIGIERTE BTTS-Berechnung mit Dixon-Coles
         
@@ -121,24 +77,12 @@ class DixonColesModel:
         SONDERN: P(BTTS) = 1 - P(0-0) - P(Home only scores) - P(Away only scores)
         
         Mit tau-Korrektur für 0-0, 1-0, 0-1, 1-1 Spielstände
+        rho: Liga-ρ (None = self.rho)
         """
-        # P(0-0) mit Korrektur
-        p_00 = self.poisson_prob(0, lambda_home) * self.poisson_prob(0, lambda_away) * self.tau(0, 0)
-        
-        # P(Home scores, Away = 0) - alle Kombinationen
-        p_home_only = 0
-        for h in range(1, 10):
-            tau_factor = self.tau(h, 0) if h == 1 else 1.0
-            p_home_only += self.poisson_prob(h, lambda_home) * self.poisson_prob(0, lambda_away) * tau_factor
-        
-        # P(Away scores, Home = 0) - alle Kombinationen
-        p_away_only = 0
-        for a in range(1, 10):
-            tau_factor = self.tau(0, a) if a == 1 else 1.0
-            p_away_only += self.poisson_prob(0, lambda_home) * self.poisson_prob(a, lambda_away) * tau_factor
-        
-        # P(BTTS) = 1 - P(no BTTS)
-        p_btts = 1 - (p_00 + p_home_only + p_away_only)
+        rho = self.rho if rho is None else rho
+        matrix = ScorelineMatrix.from_lambdas(lambda_home, lambda_away, rho=rho, max_goals=9,
+                                              normalize=False)
+        p_btts, _ = matrix.btts()
         
         return max(0, min(100, p_btts * 100))
 
@@ -167,12 +111,6 @@ class BivariatePoissonModel:
         """
         self.cov = covariance
     
-    def _poisson_pmf(self, k: int, lam: float) -> float:
-        """Poisson probability mass function"""
-        if lam <= 0:
-            return 1.0 if k == 0 else 0.0
-        return (lam ** k) * math.exp(-lam) / math.factorial(k)
-    
     def calculate_btts_probability(self, lambda_home: float, lambda_away: float) -> float:
         """
         Berechne P(BTTS) mit Bivariate Poisson
@@ -183,30 +121,15 @@ class BivariatePoissonModel:
         # Normalisierungs-Konstante für die Approximation
         cov_factor = self.cov / max(0.1, lambda_home * lambda_away)
         
-        # P(Home = 0, Away = 0)
-        p_00 = self._poisson_pmf(0, lambda_home) * self._poisson_pmf(0, lambda_away)
-        p_00 *= (1 + cov_factor * lambda_home * lambda_away)  # Korrektur für (0,0)
-        
-        # P(Home > 0, Away = 0)
-        p_home_only = 0
-        for h in range(1, 10):
-            p_h = self._poisson_pmf(h, lambda_home)
-            p_0 = self._poisson_pmf(0, lambda_away)
-            # Korrektur: (h - λ_h) * (0 - λ_a) = -(h - λ_h) * λ_a
-            correction = 1 + cov_factor * (h - lambda_home) * (-lambda_away)
-            p_home_only += p_h * p_0 * max(0.5, min(1.5, correction))
-        
-        # P(Home = 0, Away > 0)
-        p_away_only = 0
-        for a in range(1, 10):
-            p_0 = self._poisson_pmf(0, lambda_home)
-            p_a = self._poisson_pmf(a, lambda_away)
-            # Korrektur: (0 - λ_h) * (a - λ_a) = -λ_h * (a - λ_a)
-            correction = 1 + cov_factor * (-lambda_home) * (a - lambda_away)
-            p_away_only += p_0 * p_a * max(0.5, min(1.5, correction))
-        
-        # P(BTTS) = 1 - P(no BTTS)
-        p_btts = 1 - (p_00 + p_home_only + p_away_only)
+        # Korrektur auf [0.5, 1.5] begrenzt, (0,0) unbegrenzt
+        goals = np.arange(10)
+        correction = 1 + cov_factor * np.outer(goals - lambda_home, goals - lambda_away)
+        correction = np.clip(correction, 0.5, 1.5)
+        correction[0, 0] = 1 + cov_factor * lambda_home * lambda_away
+        
+        matrix = ScorelineMatrix.from_lambdas(lambda_home, lambda_away, max_goals=9,
+                                              tau=correction, normalize=False)
+        p_btts, _ = matrix.btts()
         
         return max(0, min(100, p_btts * 100))
 
@@ -217,12 +140,18 @@ class AdvancedBTTSAnalyzer:
     """
     
     def __init__(self, api_key: Optional[str] = None, db_path: str = "btts_data.db", 
-                 weather_api_key: Optional[str] = None, api_football_key: Optional[str] = None):
-        self.engine = DataEngine(api_football_key or api_key, db_path)  # FIX: Use api_football_key!
+                 weather_api_key: Optional[str] = None, api_football_key: Optional[str] = None,
+                 api_football: Optional[APIFootball] = None):
         self.db_path = db_path
-        self.api_football_key = api_football_key        
+        self.api_football_key = api_football_key or (api_football.api_key if api_football else None)
+        
+        # Shared API-Football client (one session + one rate limit for all modules)
+        client_key = self.api_football_key or api_key
+        self.api = api_football or (get_api_football(client_key) if client_key else None)
+        self.engine = DataEngine(client_key, db_path, api_football=self.api)  # FIX: Use api_football_key!
+        
         # Dixon-Coles Model (korrigiert niedrige Spielstände)
-        self.dixon_coles = DixonColesModel(rho=-0.05)
+        self.dixon_coles = DixonColesModel()
         
         # Bivariate Poisson Model (modelliert Tor-Korrelation)
         self.bivariate_poisson = BivariatePoissonModel(covariance=0.10)
@@ -238,6 +167,8 @@ class AdvancedBTTSAnalyzer:
         else:
             self.clv_tracker = None
 
+        # Write-behind logging of every analysis (no added latency)
+        self.prediction_logger = get_prediction_logger(self.clv_tracker) if self.clv_tracker else None
         
         # Weather Analyzer
         if WEATHER_AVAILABLE and weather_api_key:
@@ -260,6 +191,11 @@ class AdvancedBTTSAnalyzer:
             'neural_network': 0.15
         }
         
+        # API-Caches (werden von prefetch_match_inputs parallel befüllt)
+        self._team_stats_cache = {}
+        self._h2h_cache = {}
+        self._form_cache = {}
+        
         # Weights für Ensemble (prediction)
         self.weights = {
             'ml_model': 0.35,  # V3.0: Increased ML weight
@@ -273,29 +209,16 @@ class AdvancedBTTSAnalyzer:
     
     def prepare_training_data(self) -> Tuple[np.ndarray, np.ndarray]:
         """V3.0: Prepare training data with 20 features instead of 6"""
-        conn, is_postgres = _get_db_connection(self.db_path)
-        
-        query = '''
-            SELECT 
-                home_team,
-                away_team,
-                home_goals,
-                away_goals,
-                btts,
-                league_code
-            FROM matches
-            WHERE btts IS NOT NULL
-                AND home_goals IS NOT NULL
-                AND away_goals IS NOT NULL
-        '''
+        # Spalten-Snapshot (Memory-Map) statt die ganze Tabelle neu zu laden;
+        # neu exportiert nur wenn fehlend oder matches (COUNT/MAX(fetched_at)) sich geändert hat
+        snapshot = refresh_snapshot(self.db_path)
         
         try:
-            df = pd.read_sql_query(query, conn)
+            df = snapshot.to_dataframe()[['home_team', 'away_team', 'home_goals',
+                                          'away_goals', 'btts', 'league_code']]
         except Exception as e:
-            print(f"⚠️ SQL error: {e}")
+            print(f"⚠️ Snapshot error: {e}")
             df = pd.DataFrame()
-        finally:
-            conn.close()
         
         if df.empty or len(df) < 50:
             print(f"⚠️ Not enough training data ({len(df) if not df.empty else 0} matches)")
@@ -595,8 +518,7 @@ class AdvancedBTTSAnalyzer:
         # Try to get from API-Football
         if self.api_football_key:
             try:
-                from api_football import APIFootball
-                api = APIFootball(self.api_football_key)
+                api = self.api
                 
                 stats = api.get_team_statistics(team_id, league_id, 2025)  # Fixed: 2025/26 season
                 
@@ -705,9 +627,7 @@ class AdvancedBTTSAnalyzer:
         """P(X >= goals_needed) mit Poisson"""
         if expected <= 0:
             return 20.0
-        p_under = sum((expected ** k) * math.exp(-expected) / math.factorial(k) 
-                      for k in range(goals_needed))
-        return max(10, min(90, (1 - p_under) * 100))
+        return max(10, min(90, at_least(expected, goals_needed) * 100))
     
     def statistical_predict(self, home_btts: float, away_btts: float, 
                           home_goals: float, away_goals: float,
@@ -720,13 +640,15 @@ class AdvancedBTTSAnalyzer:
         return (p_home * p_away) / 100
     
     def analyze_match(self, home_team_id: int, away_team_id: int, 
-                     league_code: str) -> Dict:
+                     league_code: str, fixture_id: Optional[int] = None) -> Dict:
         """
         VOLLSTÄNDIGE Match-Analyse nach Spezifikation:
         
         BTTS % = (Saison BTTS% × 0.3) + (Form letzte 5 × 0.3) + (H2H × 0.2) + (Heim/Auswärts × 0.2)
         
         Plus Poisson-Verteilung für Torwahrscheinlichkeit
+        
+        Mit fixture_id wird die Prediction asynchron für das CLV-Tracking geloggt.
         """
         # Initialize caches
         if not hasattr(self, '_team_stats_cache'):
@@ -795,8 +717,10 @@ class AdvancedBTTSAnalyzer:
         # POISSON-VERTEILUNG für Torwahrscheinlichkeit
         # =============================================
         # λ = erwartete Tore
-        lambda_home = (home_season['avg_scored'] + away_season['avg_conceded']) / 2 * 1.08  # Heimvorteil
-        lambda_away = (away_season['avg_scored'] + home_season['avg_conceded']) / 2 * 0.92  # Auswärtsnachteil
+        # Heimvorteil/Auswärtsnachteil pro Liga gefittet, ohne Fit 1.08 / 0.92
+        home_factor, away_factor = league_home_away_factors(league_id, default=(1.08, 0.92))
+        lambda_home = (home_season['avg_scored'] + away_season['avg_conceded']) / 2 * home_factor
+        lambda_away = (away_season['avg_scored'] + home_season['avg_conceded']) / 2 * away_factor
         
         # P(Team ≥ 1 Tor) = 1 - e^(-λ) - für Anzeige
         p_home_scores = (1 - math.exp(-lambda_home)) * 100
@@ -809,7 +733,8 @@ class AdvancedBTTSAnalyzer:
         # SONDERN: Dixon-Coles + Bivariate Poisson
         
         # 1. Dixon-Coles: Korrigiert niedrige Spielstände (0-0, 1-0, 0-1, 1-1)
-        dc_btts = self.dixon_coles.calculate_btts_probability(lambda_home, lambda_away)
+        dc_btts = self.dixon_coles.calculate_btts_probability(lambda_home, lambda_away,
+                                                              rho=league_rho(league_id))
         
         # 2. Bivariate Poisson: Modelliert Tor-Korrelation (Spieldynamik-Änderung nach Toren)
         bv_btts = self.bivariate_poisson.calculate_btts_probability(lambda_home, lambda_away)
@@ -929,7 +854,7 @@ class AdvancedBTTSAnalyzer:
         # =============================================
         # RETURN FULL ANALYSIS
         # =============================================
-        return {
+        result = {
             'home_team': home_season.get('team_name', 'Home'),
             'away_team': away_season.get('team_name', 'Away'),
             'home_team_id': home_team_id,
@@ -995,69 +920,39 @@ class AdvancedBTTSAnalyzer:
             },
             'weather': None
         }
+        
+        if fixture_id and self.prediction_logger:
+            self.prediction_logger.log({
+                'fixture_id': fixture_id,
+                'home_team': result['home_team'],
+                'away_team': result['away_team'],
+                'market_type': 'BTTS',
+                'prediction': 'Yes',
+                'odds': None,
+                'model_probability': result['btts_probability'],
+                'confidence': int(round(confidence)),
+            })
+        
+        return result
     
     def _get_season_stats(self, team_id: int, league_id: int, venue: str) -> Dict:
         """Get season statistics from API or cache"""
         cache_key = f"season_{team_id}_{league_id}"
         
         if cache_key in self._team_stats_cache:
-            cached = self._team_stats_cache[cache_key]
-            if venue == 'home':
-                return {
-                    'team_name': cached.get('team_name', 'Unknown'),
-                    'btts_rate': cached.get('btts_rate_home', 60),
-                    'btts_rate_venue': cached.get('btts_rate_home', 60),
-                    'avg_scored': cached.get('avg_goals_scored_home', 1.5),
-                    'avg_conceded': cached.get('avg_goals_conceded_home', 1.2),
-                    'matches_played': cached.get('matches_played_home', 0),
-                    'clean_sheets': cached.get('clean_sheets_home', 0),
-                    'failed_to_score': cached.get('failed_to_score_home', 0),
-                }
-            else:
-                return {
-                    'team_name': cached.get('team_name', 'Unknown'),
-                    'btts_rate': cached.get('btts_rate_away', 60),
-                    'btts_rate_venue': cached.get('btts_rate_away', 60),
-                    'avg_scored': cached.get('avg_goals_scored_away', 1.2),
-                    'avg_conceded': cached.get('avg_goals_conceded_away', 1.4),
-                    'matches_played': cached.get('matches_played_away', 0),
-                    'clean_sheets': cached.get('clean_sheets_away', 0),
-                    'failed_to_score': cached.get('failed_to_score_away', 0),
-                }
+            return self._format_season_stats(self._team_stats_cache[cache_key], venue)
         
         # Try API
         if self.api_football_key:
             try:
-                from api_football import APIFootball
-                api = APIFootball(self.api_football_key)
+                api = self.api
                 stats = api.get_team_statistics(team_id, league_id, 2025)  # Fixed: 2025/26 season
                 
                 if stats:
                     self._team_stats_cache[cache_key] = stats
                     print(f"   📊 Loaded stats for {stats.get('team_name')}: {stats.get('btts_rate_total', 60):.0f}% BTTS")
                     
-                    if venue == 'home':
-                        return {
-                            'team_name': stats.get('team_name', 'Unknown'),
-                            'btts_rate': stats.get('btts_rate_total', 60),
-                            'btts_rate_venue': stats.get('btts_rate_home', 60),
-                            'avg_scored': stats.get('avg_goals_scored_home', 1.5),
-                            'avg_conceded': stats.get('avg_goals_conceded_home', 1.2),
-                            'matches_played': stats.get('matches_played_home', 0),
-                            'clean_sheets': stats.get('clean_sheets_home', 0),
-                            'failed_to_score': stats.get('failed_to_score_home', 0),
-                        }
-                    else:
-                        return {
-                            'team_name': stats.get('team_name', 'Unknown'),
-                            'btts_rate': stats.get('btts_rate_total', 60),
-                            'btts_rate_venue': stats.get('btts_rate_away', 60),
-                            'avg_scored': stats.get('avg_goals_scored_away', 1.2),
-                            'avg_conceded': stats.get('avg_goals_conceded_away', 1.4),
-                            'matches_played': stats.get('matches_played_away', 0),
-                            'clean_sheets': stats.get('clean_sheets_away', 0),
-                            'failed_to_score': stats.get('failed_to_score_away', 0),
-                        }
+                    return self._format_season_stats(stats, venue)
             except Exception as e:
                 print(f"   ⚠️ API error: {e}")
         
@@ -1065,6 +960,31 @@ class AdvancedBTTSAnalyzer:
         print(f"   ❌ No data available for team {team_id} in league {league_id}")
         return None
     
+    def _format_season_stats(self, stats: Dict, venue: str) -> Dict:
+        """Format API team statistics for home or away side"""
+        if venue == 'home':
+            return {
+                'team_name': stats.get('team_name', 'Unknown'),
+                'btts_rate': stats.get('btts_rate_total', 60),
+                'btts_rate_venue': stats.get('btts_rate_home', 60),
+                'avg_scored': stats.get('avg_goals_scored_home', 1.5),
+                'avg_conceded': stats.get('avg_goals_conceded_home', 1.2),
+                'matches_played': stats.get('matches_played_home', 0),
+                'clean_sheets': stats.get('clean_sheets_home', 0),
+                'failed_to_score': stats.get('failed_to_score_home', 0),
+            }
+        else:
+            return {
+                'team_name': stats.get('team_name', 'Unknown'),
+                'btts_rate': stats.get('btts_rate_total', 60),
+                'btts_rate_venue': stats.get('btts_rate_away', 60),
+                'avg_scored': stats.get('avg_goals_scored_away', 1.2),
+                'avg_conceded': stats.get('avg_goals_conceded_away', 1.4),
+                'matches_played': stats.get('matches_played_away', 0),
+                'clean_sheets': stats.get('clean_sheets_away', 0),
+                'failed_to_score': stats.get('failed_to_score_away', 0),
+            }
+    
     def _get_form_stats(self, team_id: int) -> Dict:
         """Get last 5 matches form from API or cache"""
         cache_key = f"form_{team_id}"
@@ -1075,8 +995,7 @@ class AdvancedBTTSAnalyzer:
         # Try API
         if self.api_football_key:
             try:
-                from api_football import APIFootball
-                api = APIFootball(self.api_football_key)
+                api = self.api
                 form = api.get_team_last_matches(team_id, 5)
                 
                 if form:
@@ -1109,8 +1028,7 @@ class AdvancedBTTSAnalyzer:
         # Try API
         if self.api_football_key:
             try:
-                from api_football import APIFootball
-                api = APIFootball(self.api_football_key)
+                api = self.api
                 h2h_matches = api.get_head_to_head(team1_id, team2_id, 10)
                 
                 if h2h_matches and isinstance(h2h_matches, list):
@@ -1385,8 +1303,7 @@ class AdvancedBTTSAnalyzer:
             return []
         
         try:
-            from api_football import APIFootball
-            api = APIFootball(self.api_football_key)
+            api = self.api
             
             print(f"📡 Fetching upcoming fixtures for {league_code}...")
             fixtures = api.get_upcoming_fixtures(league_code, days_ahead)
@@ -1417,6 +1334,54 @@ class AdvancedBTTSAnalyzer:
             print(f"❌ Error fetching fixtures: {e}")
             return []
     
+    def prefetch_match_inputs(self, matches: List[Dict], league_code: str,
+                              max_workers: int = 8) -> int:
+        """
+        Fetch all API inputs for a slate of matches concurrently
+        
+        Collects the DISTINCT season stats, form and H2H requests of all
+        matches first and fills the analyzer caches from a bounded thread
+        pool. analyze_match() then only reads the caches. All requests go
+        through the shared API-Football client, so they stay inside the
+        common rate limit (and response cache).
+        
+        Returns:
+            Number of distinct inputs fetched
+        """
+        if not self.api_football_key or not matches:
+            return 0
+        
+        league_id = self.engine.LEAGUES_CONFIG.get(league_code, 0)
+        
+        tasks = {}
+        for match in matches:
+            home_id = match['homeTeam']['id']
+            away_id = match['awayTeam']['id']
+            
+            for team_id in (home_id, away_id):
+                if f"season_{team_id}_{league_id}" not in self._team_stats_cache:
+                    tasks[('season', team_id)] = (self._get_season_stats, team_id, league_id, 'home')
+                if f"form_{team_id}" not in self._form_cache:
+                    tasks[('form', team_id)] = (self._get_form_stats, team_id)
+            
+            if f"h2h_{min(home_id, away_id)}_{max(home_id, away_id)}" not in self._h2h_cache:
+                tasks[('h2h', min(home_id, away_id), max(home_id, away_id))] = (self._get_h2h_stats, home_id, away_id)
+        
+        if not tasks:
+            return 0
+        
+        print(f"   ⚡ Prefetching {len(tasks)} inputs for {len(matches)} matches...")
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(fn, *args) for fn, *args in tasks.values()]
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"   ⚠️ Prefetch error: {e}")
+        
+        return len(tasks)
+    
     def analyze_upcoming_matches(self, league_code: str, days_ahead: int = 7,
                                 min_probability: float = 60.0) -> pd.DataFrame:
         """Analyze all upcoming matches and return recommendations"""
@@ -1428,7 +1393,10 @@ class AdvancedBTTSAnalyzer:
             print("⚠️ No upcoming matches found")
             return pd.DataFrame()
         
-        results = []
+        # Gather stage: alle API-Inputs parallel holen, danach nur noch Rechnen
+        self.prefetch_match_inputs(matches, league_code)
+        
+        selected = []
         
         for match in matches:
             home_team = match['homeTeam']
@@ -1436,42 +1404,60 @@ class AdvancedBTTSAnalyzer:
             
             print(f"   Analyzing: {home_team['name']} vs {away_team['name']}...")
             
-            analysis = self.analyze_match(home_team['id'], away_team['id'], league_code)
+            analysis = self.analyze_match(home_team['id'], away_team['id'], league_code,
+                                          fixture_id=match.get('fixture_id'))
             
             if 'error' in analysis:
                 print(f"   ⚠️ Skipped: {analysis['error']}")
                 continue
             
             if analysis['ensemble_probability'] >= min_probability:
-                try:
-                    date_str = match.get('utcDate', match.get('date', ''))
-                    if date_str and 'T' in str(date_str):
-                        date_formatted = datetime.strptime(str(date_str).replace('Z', ''), '%Y-%m-%dT%H:%M:%S').strftime('%d.%m.%Y %H:%M')
-                    else:
-                        date_formatted = str(date_str)[:16] if date_str else 'Unknown'
-                except:
-                    date_formatted = str(match.get('date', 'Unknown'))[:16]
-                
-                results.append({
-                    'Date': date_formatted,
-                    'Home': home_team['name'],
-                    'Away': away_team['name'],
-                    'BTTS %': f"{analysis['ensemble_probability']:.1f}%",
-                    'Confidence': f"{analysis['confidence']:.1f}%",
-                    'Level': analysis['confidence_level'],
-                    'Tip': analysis['recommendation'],
-                    'ML': f"{analysis['ml_probability']:.1f}%",
-                    'Stat': f"{analysis['statistical_probability']:.1f}%",
-                    'Form': f"{analysis['form_probability']:.1f}%",
-                    'H2H': f"{analysis['h2h_probability']:.1f}%",
-                    'xG Total': f"{analysis['details']['expected_total_goals']:.1f}",
-                    '_analysis': analysis
-                })
-        
-        if not results:
+                selected.append((match, analysis))
+        
+        if not selected:
             print("⚠️ No matches meet the criteria")
             return pd.DataFrame()
         
+        # Pricing stage: alle Tor-Märkte der Auswahl in einem Batch
+        prices = price_fixtures(
+            [analysis['details']['expected_home_goals'] for _, analysis in selected],
+            [analysis['details']['expected_away_goals'] for _, analysis in selected],
+            rhos=league_rho(self.engine.LEAGUES_CONFIG.get(league_code))
+        )
+        
+        results = []
+        
+        for (match, analysis), (_, markets) in zip(selected, prices.iterrows()):
+            home_team = match['homeTeam']
+            away_team = match['awayTeam']
+            
+            try:
+                date_str = match.get('utcDate', match.get('date', ''))
+                if date_str and 'T' in str(date_str):
+                    date_formatted = datetime.strptime(str(date_str).replace('Z', ''), '%Y-%m-%dT%H:%M:%S').strftime('%d.%m.%Y %H:%M')
+                else:
+                    date_formatted = str(date_str)[:16] if date_str else 'Unknown'
+            except:
+                date_formatted = str(match.get('date', 'Unknown'))[:16]
+            
+            results.append({
+                'Date': date_formatted,
+                'Home': home_team['name'],
+                'Away': away_team['name'],
+                'BTTS %': f"{analysis['ensemble_probability']:.1f}%",
+                'Confidence': f"{analysis['confidence']:.1f}%",
+                'Level': analysis['confidence_level'],
+                'Tip': analysis['recommendation'],
+                'ML': f"{analysis['ml_probability']:.1f}%",
+                'Stat': f"{analysis['statistical_probability']:.1f}%",
+                'Form': f"{analysis['form_probability']:.1f}%",
+                'H2H': f"{analysis['h2h_probability']:.1f}%",
+                'xG Total': f"{analysis['details']['expected_total_goals']:.1f}",
+                'O2.5 %': f"{markets['over_2.5'] * 100:.1f}%",
+                '_analysis': analysis,
+                '_markets': markets.to_dict()
+            })
+        
         df = pd.DataFrame(results)
         df = df.sort_values('BTTS %', ascending=False)
         
@@ -41,9 +41,11 @@ import numpy as np
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
-import requests
-import time
-import math
+
+from api_football import APIFootball, get_api_football
+from probability_kernel import nb_over, over, pmf
+from dixon_coles_fit import get_league_params, league_home_away_factors, league_rho
+from scoreline_engine import DEFAULT_RHO, OVER_UNDER_LINES, ScorelineMatrix, price_fixtures
 
 # =============================================================================
 # 🚀 V2.0: Import der Verbesserungen
@@ -149,11 +151,15 @@ class PreMatchAlternativeAnalyzer:
         ('ajax', 'feyenoord'), ('paris', 'marseille'),
     ]
     
-    def __init__(self, api_key: str):
+    # Max fixture IDs per fixtures?ids= request (API-Football limit)
+    FIXTURE_BATCH_SIZE = 20
+    
+    # Negative Binomial r for total corners (lower = more clustering), empirically validated
+    CORNER_DISPERSION = 5.0
+    
+    def __init__(self, api_key: str, api_football: Optional[APIFootball] = None):
         self.api_key = api_key
-        self.base_url = "https://v3.football.api-sports.io"
-        self.headers = {'x-apisports-key': api_key}
-        self.last_request = 0
+        self.api = api_football or get_api_football(api_key)  # Shared pooled client
         self.cache = {}  # Cache team stats to save API calls
         
         # 🚀 V2.0: Initialize improvement classes
@@ -169,13 +175,6 @@ class PreMatchAlternativeAnalyzer:
             self.derby_detector = None
             self.weather_impact = None
     
-    def _rate_limit(self):
-        """Respect API rate limits"""
-        elapsed = time.time() - self.last_request
-        if elapsed < 1.0:
-            time.sleep(1.0 - elapsed)
-        self.last_request = time.time()
-    
     def get_team_statistics(self, team_id: int, league_id: int) -> Dict:
         """
         Get team's season statistics from API
@@ -186,12 +185,9 @@ class PreMatchAlternativeAnalyzer:
         if cache_key in self.cache:
             return self.cache[cache_key]
         
-        self._rate_limit()
-        
         try:
-            response = requests.get(
-                f"{self.base_url}/teams/statistics",
-                headers=self.headers,
+            response = self.api.get(
+                'teams/statistics',
                 params={
                     'team': team_id,
                     'league': league_id,
@@ -273,36 +269,15 @@ class PreMatchAlternativeAnalyzer:
         default_for = round(5.0 + variance * 1.5, 2)  # 4.25 to 5.75
         default_against = round(5.0 - variance * 1.0, 2)  # 4.5 to 5.5
         
-        self._rate_limit()
-        
         try:
-            # Build params - include league if specified for league-specific stats
-            params = {
-                'team': team_id,
-                'last': n_matches,
-                'status': 'FT'
-            }
-            
-            # Add league filter if specified (for league-specific analysis)
-            if league_id:
-                params['league'] = league_id
-            
-            # Get last N finished matches
-            response = requests.get(
-                f"{self.base_url}/fixtures",
-                headers=self.headers,
-                params=params,
-                timeout=15
-            )
-            
-            if response.status_code != 200:
-                return {'avg_corners_for': default_for, 'avg_corners_against': default_against, 'matches': 0}
-            
-            matches = response.json().get('response', [])
+            matches = self._get_last_fixtures(team_id, league_id, n_matches)
             
             if not matches:
                 return {'avg_corners_for': default_for, 'avg_corners_against': default_against, 'matches': 0}
             
+            # Statistics of all N fixtures in one batched request instead of N calls
+            self.prefetch_fixture_statistics([m['fixture']['id'] for m in matches])
+            
             corners_for = []
             corners_against = []
             
@@ -338,6 +313,109 @@ class PreMatchAlternativeAnalyzer:
             print(f"⚠️ Error getting corner stats: {e}")
             return {'avg_corners_for': default_for, 'avg_corners_against': default_against, 'matches': 0}
     
+    def _get_last_fixtures(self, team_id: int, league_id: Optional[int], n_matches: int) -> List[Dict]:
+        """Get a team's last N finished fixtures (league-specific if league_id given)"""
+        # prefetch_corner_stats() lädt die Listen schon - nicht doppelt anfragen
+        cache_key = f"last_fixtures_{team_id}_{league_id}_{n_matches}"
+        if cache_key in self.cache:
+            return self.cache[cache_key]
+        
+        # Build params - include league if specified for league-specific stats
+        params = {
+            'team': team_id,
+            'last': n_matches,
+            'status': 'FT'
+        }
+        
+        # Add league filter if specified (for league-specific analysis)
+        if league_id:
+            params['league'] = league_id
+        
+        response = self.api.get(
+            'fixtures',
+            params=params,
+            timeout=15
+        )
+        
+        if response.status_code != 200:
+            return []
+        
+        matches = response.json().get('response', [])
+        self.cache[cache_key] = matches
+        return matches
+    
+    def prefetch_fixture_statistics(self, fixture_ids: List[int]) -> int:
+        """
+        Batch-fetch statistics for many fixtures via fixtures?ids=
+        
+        API-Football returns embedded statistics for up to 20 fixture IDs
+        per request. Results go into the same 'fixture_stats_{id}' cache
+        that _get_fixture_statistics() reads, so 10 fixtures cost 1 call
+        instead of 10.
+        
+        Returns:
+            Number of fixtures fetched
+        """
+        missing = list(dict.fromkeys(
+            fid for fid in fixture_ids if fid and f"fixture_stats_{fid}" not in self.cache
+        ))
+        
+        fetched = 0
+        for i in range(0, len(missing), self.FIXTURE_BATCH_SIZE):
+            chunk = missing[i:i + self.FIXTURE_BATCH_SIZE]
+            
+            try:
+                response = self.api.get(
+                    'fixtures',
+                    params={'ids': '-'.join(str(fid) for fid in chunk)},
+                    timeout=20
+                )
+                
+                if response.status_code != 200:
+                    continue
+                
+                for fixture in response.json().get('response', []):
+                    fixture_id = fixture.get('fixture', {}).get('id')
+                    if not fixture_id:
+                        continue
+                    
+                    # None = Spiel ohne Statistiken → kein Einzel-Request mehr
+                    self.cache[f"fixture_stats_{fixture_id}"] = self._parse_fixture_statistics(
+                        fixture.get('statistics', [])
+                    )
+                    fetched += 1
+            except Exception as e:
+                print(f"⚠️ Error batch-fetching fixture statistics: {e}")
+        
+        return fetched
+    
+    def prefetch_corner_stats(self, fixtures: List[Dict], n_matches: int = 10) -> int:
+        """
+        Prefetch corner inputs for a whole slate
+        
+        Loads the last-N fixture lists of all teams, then fetches the
+        statistics of ALL those fixtures in shared batches of 20
+        (teams meeting each other share fixtures).
+        
+        Returns:
+            Number of fixtures fetched
+        """
+        fixture_ids = []
+        
+        for fixture in fixtures:
+            league_id = fixture.get('league_id', 39)
+            
+            for team_id in (fixture.get('home_team_id'), fixture.get('away_team_id')):
+                if not team_id or f"corners_{team_id}_{league_id}_{n_matches}" in self.cache:
+                    continue
+                try:
+                    matches = self._get_last_fixtures(team_id, league_id, n_matches)
+                    fixture_ids.extend(m['fixture']['id'] for m in matches)
+                except Exception as e:
+                    print(f"⚠️ Error getting last fixtures for team {team_id}: {e}")
+        
+        return self.prefetch_fixture_statistics(fixture_ids)
+    
     def _get_fixture_statistics(self, fixture_id: int) -> Optional[Dict]:
         """Get statistics for a specific fixture"""
         # Check cache first
@@ -345,44 +423,17 @@ class PreMatchAlternativeAnalyzer:
         if cache_key in self.cache:
             return self.cache[cache_key]
         
-        self._rate_limit()
-        
         try:
-            response = requests.get(
-                f"{self.base_url}/fixtures/statistics",
-                headers=self.headers,
+            response = self.api.get(
+                'fixtures/statistics',
                 params={'fixture': fixture_id},
                 timeout=15
             )
             
             if response.status_code == 200:
-                stats_list = response.json().get('response', [])
+                result = self._parse_fixture_statistics(response.json().get('response', []))
                 
-                if len(stats_list) >= 2:
-                    home_stats = stats_list[0].get('statistics', [])
-                    away_stats = stats_list[1].get('statistics', [])
-                    
-                    def get_stat(stats, stat_type):
-                        for s in stats:
-                            if s.get('type') == stat_type:
-                                val = s.get('value')
-                                if val is None:
-                                    return 0
-                                try:
-                                    return int(val)
-                                except:
-                                    return 0
-                        return 0
-                    
-                    result = {
-                        'corners_home': get_stat(home_stats, 'Corner Kicks'),
-                        'corners_away': get_stat(away_stats, 'Corner Kicks'),
-                        'shots_home': get_stat(home_stats, 'Total Shots'),
-                        'shots_away': get_stat(away_stats, 'Total Shots'),
-                        'fouls_home': get_stat(home_stats, 'Fouls'),
-                        'fouls_away': get_stat(away_stats, 'Fouls'),
-                    }
-                    
+                if result:
                     # Cache the result
                     self.cache[cache_key] = result
                     return result
@@ -392,6 +443,35 @@ class PreMatchAlternativeAnalyzer:
         except Exception:
             return None
     
+    def _parse_fixture_statistics(self, stats_list: List[Dict]) -> Optional[Dict]:
+        """Parse a [home, away] statistics list into corners/shots/fouls"""
+        if len(stats_list) < 2:
+            return None
+        
+        home_stats = stats_list[0].get('statistics', [])
+        away_stats = stats_list[1].get('statistics', [])
+        
+        def get_stat(stats, stat_type):
+            for s in stats:
+                if s.get('type') == stat_type:
+                    val = s.get('value')
+                    if val is None:
+                        return 0
+                    try:
+                        return int(val)
+                    except:
+                        return 0
+            return 0
+        
+        return {
+            'corners_home': get_stat(home_stats, 'Corner Kicks'),
+            'corners_away': get_stat(away_stats, 'Corner Kicks'),
+            'shots_home': get_stat(home_stats, 'Total Shots'),
+            'shots_away': get_stat(away_stats, 'Total Shots'),
+            'fouls_home': get_stat(home_stats, 'Fouls'),
+            'fouls_away': get_stat(away_stats, 'Fouls'),
+        }
+    
     def _get_defaults(self, league_id: int, team_id: int = None) -> Dict:
         """Get default stats based on league averages with team-based variance"""
         league_avg = self.LEAGUE_AVERAGES.get(league_id, {
@@ -480,10 +560,11 @@ class PreMatchAlternativeAnalyzer:
             if rain:
                 weather_factor *= 1.03
         
-        # Calculate probabilities for each threshold using Negative Binomial
+        # Calculate probabilities for all thresholds at once using Negative Binomial
+        lines = [7.5, 8.5, 9.5, 10.5, 11.5, 12.5]
+        probs = self._negbinom_over_probability(total_expected, np.array(lines), self.CORNER_DISPERSION)
         thresholds = {}
-        for t in [7.5, 8.5, 9.5, 10.5, 11.5, 12.5]:
-            prob = self._negbinom_over_probability(total_expected, t, dispersion=5.0)
+        for t, prob in zip(lines, probs.tolist()):
             thresholds[f'over_{t}'] = {
                 'threshold': t,
                 'probability': round(prob * 100, 1),
@@ -579,10 +660,11 @@ class PreMatchAlternativeAnalyzer:
         
         total_expected *= derby_mult
         
-        # Calculate probabilities using Poisson
+        # Calculate probabilities using Poisson (cards cluster less than corners)
+        lines = [2.5, 3.5, 4.5, 5.5, 6.5]
+        probs = self._poisson_over_probability(total_expected, np.array(lines))
         thresholds = {}
-        for t in [2.5, 3.5, 4.5, 5.5, 6.5]:
-            prob = self._poisson_over_probability(total_expected, t)
+        for t, prob in zip(lines, probs.tolist()):
             thresholds[f'over_{t}'] = {
                 'threshold': t,
                 'probability': round(prob * 100, 1),
@@ -652,19 +734,9 @@ class PreMatchAlternativeAnalyzer:
         Calculate P(X > threshold) using Poisson distribution
         
         Used for Cards (less clustering than corners)
+        threshold may be an array of lines
         """
-        import math
-        
-        # P(X > threshold) = 1 - P(X <= floor(threshold))
-        k_max = int(threshold)
-        prob_under = 0
-        
-        for k in range(k_max + 1):
-            # P(X = k) = (lambda^k * e^-lambda) / k!
-            prob_under += (expected ** k) * math.exp(-expected) / math.factorial(k)
-        
-        prob_over = 1 - prob_under
-        return max(0.02, min(0.98, prob_over))
+        return np.clip(over(expected, threshold), 0.02, 0.98)
     
     def _negbinom_over_probability(self, expected: float, threshold: float, dispersion: float = 5.0) -> float:
         """
@@ -677,27 +749,14 @@ class PreMatchAlternativeAnalyzer:
         
         Args:
             expected: Expected number of corners
-            threshold: Threshold (e.g., 10.5)
+            threshold: Threshold (e.g., 10.5) or array of thresholds
             dispersion: r parameter (lower = more variance/clustering)
                        r=5 is empirically validated for corners
         
         Formula: P(X=k) = C(k+r-1,k) * p^r * (1-p)^k
         where p = r / (r + expected)
         """
-        from scipy.stats import nbinom
-        
-        try:
-            r = dispersion
-            p = r / (r + expected)
-            
-            # P(X <= threshold) using CDF
-            prob_under = nbinom.cdf(int(threshold), r, p)
-            prob_over = 1 - prob_under
-            
-            return max(0.02, min(0.98, prob_over))
-        except:
-            # Fallback to Poisson if scipy fails
-            return self._poisson_over_probability(expected, threshold)
+        return np.clip(nb_over(expected, threshold, dispersion), 0.02, 0.98)
     
     def _get_recommendation(self, prob: float, threshold: float, market: str) -> str:
         """Generate recommendation text"""
@@ -912,17 +971,19 @@ class HighestProbabilityFinder:
     - Both Teams Score First Half
     """
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, api_football: Optional[APIFootball] = None):
         self.api_key = api_key
-        self.prematch_analyzer = PreMatchAlternativeAnalyzer(api_key)
+        self.prematch_analyzer = PreMatchAlternativeAnalyzer(api_key, api_football)
     
-    def find_highest_probability(self, fixture: Dict, btts_probability: float = None) -> Dict:
+    def find_highest_probability(self, fixture: Dict, btts_probability: float = None,
+                                 goal_prices: Optional[Dict] = None) -> Dict:
         """
         Find the single highest probability bet across ALL markets
         
         Args:
             fixture: Fixture data with team IDs
             btts_probability: If already calculated, pass it here
+            goal_prices: Row of price_fixtures() if already priced in a batch
         
         Returns:
             Dict with best bet details
@@ -985,7 +1046,7 @@ class HighestProbabilityFinder:
             })
         
         # 4. GOALS (calculated from BTTS and team stats)
-        goals_analysis = self._analyze_goals(fixture)
+        goals_analysis = self._analyze_goals(fixture, goal_prices)
         for bet in goals_analysis:
             all_bets.append(bet)
         
@@ -1055,8 +1116,8 @@ class HighestProbabilityFinder:
             }
         }
     
-    def _analyze_goals(self, fixture: Dict) -> List[Dict]:
-        """Analyze goal markets"""
+    def _expected_goals(self, fixture: Dict) -> Tuple[float, float]:
+        """Expected goals (home, away) from season stats incl. home advantage"""
         home_id = fixture.get('home_team_id')
         away_id = fixture.get('away_team_id')
         league_id = fixture.get('league_id', 39)
@@ -1068,17 +1129,23 @@ class HighestProbabilityFinder:
         home_xg = (home_stats['goals_scored_avg'] + away_stats['goals_conceded_avg']) / 2
         away_xg = (away_stats['goals_scored_avg'] + home_stats['goals_conceded_avg']) / 2
         
-        # Home advantage
-        home_xg *= 1.1
-        away_xg *= 0.9
+        # Home advantage (fitted per league, 1.1 / 0.9 without a fit)
+        home_factor, away_factor = league_home_away_factors(league_id, default=(1.1, 0.9))
+        return home_xg * home_factor, away_xg * away_factor
+    
+    def _analyze_goals(self, fixture: Dict, prices: Optional[Dict] = None) -> List[Dict]:
+        """Analyze goal markets (prices: row of price_fixtures(), priced here if missing)"""
+        if prices is None:
+            home_xg, away_xg = self._expected_goals(fixture)
+            prices = price_fixtures([home_xg], [away_xg], rhos=league_rho(fixture.get('league_id', 39))).iloc[0]
         
-        total_xg = home_xg + away_xg
+        total_xg = float(prices['home_lambda'] + prices['away_lambda'])
         
         bets = []
         
-        # Over/Under goals using Poisson
+        # Over/Under goals from the scoreline matrix
         for threshold in [1.5, 2.5, 3.5]:
-            prob_over = self._poisson_over(total_xg, threshold)
+            prob_over = max(0.02, min(0.98, float(prices[f'over_{threshold}'])))
             bets.append({
                 'market': 'GOALS',
                 'bet': f"Over {threshold}",
@@ -1096,18 +1163,6 @@ class HighestProbabilityFinder:
         
         return bets
     
-    def _poisson_over(self, expected: float, threshold: float) -> float:
-        """Calculate P(X > threshold) using Poisson distribution"""
-        import math
-        
-        # P(X > threshold) = 1 - P(X <= threshold)
-        prob_under = 0
-        for k in range(int(threshold) + 1):
-            prob_under += (expected ** k) * math.exp(-expected) / math.factorial(k)
-        
-        # Return actual probability without artificial caps
-        return max(0.02, min(0.98, 1 - prob_under))
-    
     def scan_all_fixtures(self, fixtures: List[Dict], btts_results: Dict = None, min_probability: float = 65) -> List[Dict]:
         """
         Scan all fixtures and find highest probability bets
@@ -1122,13 +1177,27 @@ class HighestProbabilityFinder:
         """
         all_opportunities = []
         
-        for fixture in fixtures:
+        # Corner-Statistiken aller Teams gebündelt vorladen (statt 1 + N Calls pro Team)
+        try:
+            self.prematch_analyzer.prefetch_corner_stats(fixtures)
+        except Exception as e:
+            print(f"⚠️ Corner prefetch failed: {e}")
+        
+        if not fixtures:
+            return all_opportunities
+        
+        # Tor-Märkte aller Fixtures in einem Batch pricen
+        expected = [self._expected_goals(fixture) for fixture in fixtures]
+        prices = price_fixtures([home for home, _ in expected], [away for _, away in expected],
+                                rhos=[league_rho(fixture.get('league_id', 39)) for fixture in fixtures])
+        
+        for fixture, (_, goal_prices) in zip(fixtures, prices.iterrows()):
             btts_prob = None
             if btts_results:
                 fixture_id = fixture.get('fixture_id')
                 btts_prob = btts_results.get(fixture_id)
             
-            result = self.find_highest_probability(fixture, btts_prob)
+            result = self.find_highest_probability(fixture, btts_prob, goal_prices)
             
             if result['best_bet'] and result['best_bet']['probability'] >= min_probability:
                 all_opportunities.append({
@@ -2045,23 +2114,17 @@ def poisson_probability(k: int, lambda_: float) -> float:
     if lambda_ <= 0:
         return 0.0
     
-    try:
-        prob = (lambda_**k * math.exp(-lambda_)) / math.factorial(k)
-        return min(max(prob, 0.0), 1.0)
-    except (OverflowError, ValueError):
-        return 0.0
+    return min(max(pmf(lambda_, k), 0.0), 1.0)
 
 
 def dixon_coles_adjustment(home_goals: int, away_goals: int, 
                            home_lambda: float, away_lambda: float,
-                           rho: float = -0.10) -> float:
+                           rho: float = DEFAULT_RHO) -> float:
     """
     Dixon-Coles adjustment for low-scoring games
     
     Corrects for under-estimation of draws and low scores in Poisson model
-    rho: correlation parameter
-    
-    STANDARDISIERT: rho = -0.10 (Literatur-Mittelwert für Konsistenz)
+    rho: correlation parameter (per league: dixon_coles_fit.league_rho)
     """
     if home_goals > 1 or away_goals > 1:
         return 1.0
@@ -2080,26 +2143,6 @@ def dixon_coles_adjustment(home_goals: int, away_goals: int,
     return max(tau, 0.01)
 
 
-def negative_binomial_probability(k: int, mu: float, alpha: float = 0.3) -> float:
-    """
-    Negative Binomial distribution for over-dispersed count data
-    Better than Poisson when variance > mean (common in football)
-    """
-    if mu <= 0:
-        return 0.0
-    
-    r = mu / alpha
-    p = alpha / (1 + alpha)
-    
-    try:
-        from math import gamma
-        coeff = gamma(k + r) / (gamma(k + 1) * gamma(r))
-        prob = coeff * (p ** k) * ((1 - p) ** r)
-        return min(max(prob, 0.0), 1.0)
-    except (OverflowError, ValueError):
-        return poisson_probability(k, mu)
-
-
 # ============================================================================
 # DATA CLASSES FOR MATCH PREDICTION
 # ============================================================================
@@ -2149,6 +2192,9 @@ class MatchPrediction:
     fair_odds_home: float
     fair_odds_draw: float
     fair_odds_away: float
+    
+    # All goal markets from the scoreline matrix (clean sheets, team totals, AH, ...)
+    scoreline_markets: Optional[Dict] = None
 
 
 # ============================================================================
@@ -2178,7 +2224,7 @@ class MatchResultPredictor:
     HOME_GOAL_MULTIPLIER = 1.25
     HOME_CONCEDE_MULTIPLIER = 0.85
     
-    # League-specific home advantage
+    # League-specific home advantage (fallback without a Dixon-Coles fit)
     LEAGUE_HOME_ADVANTAGE = {
         78: 1.22,  # Bundesliga
         39: 1.28,  # Premier League
@@ -2192,7 +2238,7 @@ class MatchResultPredictor:
         79: 1.22,  # Bundesliga 2
     }
     
-    # League average goals per game
+    # League average goals per game (fallback without a Dixon-Coles fit)
     LEAGUE_AVERAGE_GOALS = {
         78: 3.08,  # Bundesliga
         39: 2.82,  # Premier League
@@ -2206,10 +2252,25 @@ class MatchResultPredictor:
         79: 2.95,  # Bundesliga 2
     }
     
+    # Dixon-Coles low-score correlation (fallback without a fit)
+    DIXON_COLES_RHO = DEFAULT_RHO
+    
     def __init__(self, league_id: int):
         self.league_id = league_id
         self.home_advantage = self.LEAGUE_HOME_ADVANTAGE.get(league_id, 1.25)
         self.league_avg_goals = self.LEAGUE_AVERAGE_GOALS.get(league_id, 2.75)
+        self.rho = self.DIXON_COLES_RHO
+        self.home_goal_multiplier = self.HOME_GOAL_MULTIPLIER
+        self.away_goal_multiplier = self.HOME_CONCEDE_MULTIPLIER
+        
+        # Gefittete Liga-Parameter (dixon_coles_fit) haben Vorrang;
+        # exp(home) ist das Verhältnis λh/λa → je Seite die Wurzel
+        self.league_params = get_league_params(league_id)
+        if self.league_params:
+            self.home_goal_multiplier, self.away_goal_multiplier = self.league_params.home_away_factors
+            self.home_advantage = self.home_goal_multiplier
+            self.league_avg_goals = self.league_params.avg_goals
+            self.rho = self.league_params.rho
         
         # 🚀 V2.0: Initialize H2H Analyzer
         if IMPROVEMENTS_AVAILABLE:
@@ -2273,55 +2334,37 @@ class MatchResultPredictor:
         lambda_base = attacking_strength * (defensive_weakness / league_avg)
         
         if is_home:
-            lambda_base *= self.HOME_GOAL_MULTIPLIER
+            lambda_base *= self.home_goal_multiplier
         else:
-            lambda_base *= self.HOME_CONCEDE_MULTIPLIER
+            lambda_base *= self.away_goal_multiplier
         
         lambda_base *= form_factor
         lambda_final = 0.8 * lambda_base + 0.2 * league_avg
         
         return max(lambda_final, 0.3)
     
+    def scoreline_matrix(self,
+                         home_lambda: float,
+                         away_lambda: float,
+                         max_goals: int = 8,
+                         use_dixon_coles: bool = True) -> ScorelineMatrix:
+        """Dixon-Coles adjusted scoreline matrix, every goal market is a reduction of it"""
+        rho = self.rho if use_dixon_coles else 0.0
+        return ScorelineMatrix.from_lambdas(home_lambda, away_lambda, rho=rho, max_goals=max_goals)
+    
     def calculate_score_probability(self,
                                     home_lambda: float,
                                     away_lambda: float,
                                     max_goals: int = 8,
                                     use_dixon_coles: bool = True) -> Dict[Tuple[int, int], float]:
         """Calculate probability of each scoreline"""
-        probabilities = {}
-        
-        for home_goals in range(max_goals + 1):
-            for away_goals in range(max_goals + 1):
-                prob_home = poisson_probability(home_goals, home_lambda)
-                prob_away = poisson_probability(away_goals, away_lambda)
-                prob_score = prob_home * prob_away
-                
-                if use_dixon_coles:
-                    adjustment = dixon_coles_adjustment(
-                        home_goals, away_goals,
-                        home_lambda, away_lambda
-                    )
-                    prob_score *= adjustment
-                
-                probabilities[(home_goals, away_goals)] = prob_score
-        
-        total_prob = sum(probabilities.values())
-        if total_prob > 0:
-            probabilities = {k: v/total_prob for k, v in probabilities.items()}
-        
-        return probabilities
+        return self.scoreline_matrix(home_lambda, away_lambda, max_goals, use_dixon_coles).as_dict()
     
     def calculate_match_result(self,
                                home_lambda: float,
                                away_lambda: float) -> Tuple[float, float, float]:
         """Calculate match result probabilities: (Home Win, Draw, Away Win)"""
-        score_probs = self.calculate_score_probability(home_lambda, away_lambda)
-        
-        home_win = sum(prob for (h, a), prob in score_probs.items() if h > a)
-        draw = sum(prob for (h, a), prob in score_probs.items() if h == a)
-        away_win = sum(prob for (h, a), prob in score_probs.items() if h < a)
-        
-        return (home_win, draw, away_win)
+        return self.scoreline_matrix(home_lambda, away_lambda).match_result()
     
     def calculate_double_chance(self,
                                 home_win: float,
@@ -2330,40 +2373,11 @@ class MatchResultPredictor:
         """Calculate double chance probabilities"""
         return (home_win + draw, draw + away_win, home_win + away_win)
     
-    def calculate_over_under(self,
-                            home_lambda: float,
-                            away_lambda: float,
-                            thresholds: List[float] = [0.5, 1.5, 2.5, 3.5, 4.5]) -> Dict[float, Tuple[float, float]]:
-        """Calculate Over/Under probabilities"""
-        total_lambda = home_lambda + away_lambda
-        results = {}
-        
-        for threshold in thresholds:
-            over_prob = 0.0
-            under_prob = 0.0
-            
-            for total_goals in range(15):
-                prob = negative_binomial_probability(total_goals, total_lambda)
-                
-                if total_goals > threshold:
-                    over_prob += prob
-                else:
-                    under_prob += prob
-            
-            results[threshold] = (over_prob, under_prob)
-        
-        return results
-    
     def calculate_btts(self,
                       home_lambda: float,
                       away_lambda: float) -> Tuple[float, float]:
         """Calculate BTTS probabilities"""
-        score_probs = self.calculate_score_probability(home_lambda, away_lambda)
-        
-        btts_yes = sum(prob for (h, a), prob in score_probs.items() if h > 0 and a > 0)
-        btts_no = sum(prob for (h, a), prob in score_probs.items() if h == 0 or a == 0)
-        
-        return (btts_yes, btts_no)
+        return self.scoreline_matrix(home_lambda, away_lambda).btts()
     
     def find_best_value_bets(self,
                             home_win: float,
@@ -2511,7 +2525,9 @@ class MatchResultPredictor:
         
         total_xg = home_xg + away_xg
         
-        home_win, draw, away_win = self.calculate_match_result(home_xg, away_xg)
+        # One matrix → 1X2, O/U, BTTS and all other goal markets
+        matrix = self.scoreline_matrix(home_xg, away_xg)
+        home_win, draw, away_win = matrix.match_result()
         
         # 🚀 V2.0: H2H Adjustment
         h2h_applied = False
@@ -2548,8 +2564,9 @@ class MatchResultPredictor:
         home_or_draw, draw_or_away, home_or_away = self.calculate_double_chance(
             home_win, draw, away_win
         )
-        over_under = self.calculate_over_under(home_xg, away_xg)
-        btts_yes, btts_no = self.calculate_btts(home_xg, away_xg)
+        # Tore O/U aus derselben Dixon-Coles Matrix wie 1X2/BTTS (konsistente Märkte)
+        over_under = matrix.over_under(OVER_UNDER_LINES[:5])
+        btts_yes, btts_no = matrix.btts()
         
         best_bets = self.find_best_value_bets(
             home_win, draw, away_win,
@@ -2575,7 +2592,8 @@ class MatchResultPredictor:
             best_over_under=best_bets['over_under'],
             fair_odds_home=1.0 / home_win if home_win > 0 else 999,
             fair_odds_draw=1.0 / draw if draw > 0 else 999,
-            fair_odds_away=1.0 / away_win if away_win > 0 else 999
+            fair_odds_away=1.0 / away_win if away_win > 0 else 999,
+            scoreline_markets=matrix.markets()
         )
         
         # 🚀 V2.0: Add H2H metadata
@@ -2601,6 +2619,5 @@ __all__ = [
     'TeamStrength',
     'MatchPrediction',
     'poisson_probability',
-    'dixon_coles_adjustment',
-    'negative_binomial_probability'
+    'dixon_coles_adjustment'
 ]
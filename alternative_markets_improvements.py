@@ -16,7 +16,9 @@ USAGE: Import diese Klassen in alternative_markets.py
 
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
-import math
+
+from probability_kernel import over
+from scoreline_engine import DEFAULT_RHO
 
 
 # =============================================================================
@@ -538,13 +540,7 @@ class ImprovedCardsPredictor:
         if expected <= 0:
             return 0.0
         
-        # P(X > t) = 1 - P(X <= t) = 1 - sum(P(X=k) for k=0 to floor(t))
-        floor_t = int(threshold)
-        prob_under = sum(
-            (expected ** k) * math.exp(-expected) / math.factorial(k)
-            for k in range(floor_t + 1)
-        )
-        return max(0.02, min(0.98, 1 - prob_under))
+        return max(0.02, min(0.98, over(expected, threshold)))
     
     def _find_best_bet(self, thresholds: Dict, expected: float) -> Dict:
         """Find best value bet"""
@@ -574,19 +570,18 @@ class ImprovedCardsPredictor:
 
 
 # =============================================================================
-# UNIFIED DIXON-COLES (rho = -0.10)
+# UNIFIED DIXON-COLES
 # =============================================================================
 
 def unified_dixon_coles_adjustment(home_goals: int, away_goals: int, 
-                                    home_lambda: float, away_lambda: float) -> float:
+                                    home_lambda: float, away_lambda: float,
+                                    rho: float = DEFAULT_RHO) -> float:
     """
-    Dixon-Coles adjustment with UNIFIED rho = -0.10
+    Dixon-Coles adjustment with the shared default rho
     
-    This is the standard value from literature and provides consistent
-    results across all prediction modules.
+    Pass the fitted league value (dixon_coles_fit.league_rho) where the
+    league is known.
     """
-    rho = -0.10  # UNIFIED VALUE
-    
     if home_goals > 1 or away_goals > 1:
         return 1.0
     
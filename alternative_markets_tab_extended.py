@@ -18,7 +18,7 @@ from alternative_markets import (
 )
 from datetime import datetime, timedelta
 from collections import defaultdict
-import requests
+from api_football import get_api_football
 
 # Import Smart Bet Finder
 try:
@@ -97,14 +97,11 @@ def _collect_match_analysis(match: dict, api_key: str) -> dict:
         # MATCH RESULT PREDICTIONS - REAL CALCULATION!
         # ============================================
         try:
-            import requests
-            headers = {'x-apisports-key': api_key}
-            base_url = "https://v3.football.api-sports.io"
+            api = get_api_football(api_key)
             
             # Fetch home team fixtures
-            home_response = requests.get(
-                f"{base_url}/fixtures",
-                headers=headers,
+            home_response = api.get(
+                'fixtures',
                 params={
                     'team': home_team_id,
                     'league': league_id,
@@ -116,9 +113,8 @@ def _collect_match_analysis(match: dict, api_key: str) -> dict:
             )
             
             # Fetch away team fixtures
-            away_response = requests.get(
-                f"{base_url}/fixtures",
-                headers=headers,
+            away_response = api.get(
+                'fixtures',
                 params={
                     'team': away_team_id,
                     'league': league_id,
@@ -179,10 +175,10 @@ def _collect_match_analysis(match: dict, api_key: str) -> dict:
                 
                 # Update Over/Under
                 if hasattr(prediction, 'over_under'):
-                    for threshold, prob in prediction.over_under.items():
+                    for threshold, (over_prob, _) in prediction.over_under.items():
                         over_key = f'over_{threshold}_probability'
                         if over_key in analysis:
-                            analysis[over_key] = round(prob * 100, 1)
+                            analysis[over_key] = round(over_prob * 100, 1)
                 
         except Exception as e:
             pass  # Use defaults if prediction fails
@@ -462,10 +458,11 @@ def _render_match_result_analysis(match, api_key):
     # Get real team statistics from API
     with st.spinner("🔄 Lade Team-Statistiken..."):
         try:
+            api = get_api_football(api_key)
+            
             # Get last 10 matches for home team IN THIS LEAGUE
-            home_response = requests.get(
-                "https://v3.football.api-sports.io/fixtures",
-                headers={'x-apisports-key': api_key},
+            home_response = api.get(
+                'fixtures',
                 params={
                     'team': home_team_id,
                     'league': league_id,  # Liga-spezifisch!
@@ -477,9 +474,8 @@ def _render_match_result_analysis(match, api_key):
             )
             
             # Get last 10 matches for away team IN THIS LEAGUE
-            away_response = requests.get(
-                "https://v3.football.api-sports.io/fixtures",
-                headers={'x-apisports-key': api_key},
+            away_response = api.get(
+                'fixtures',
                 params={
                     'team': away_team_id,
                     'league': league_id,  # Liga-spezifisch!
@@ -495,9 +491,8 @@ def _render_match_result_analysis(match, api_key):
             
             # Fallback: If not enough league-specific matches, get ALL matches
             if len(home_fixtures) < 3:
-                home_response = requests.get(
-                    "https://v3.football.api-sports.io/fixtures",
-                    headers={'x-apisports-key': api_key},
+                home_response = api.get(
+                    'fixtures',
                     params={
                         'team': home_team_id,
                         'season': season,
@@ -510,9 +505,8 @@ def _render_match_result_analysis(match, api_key):
                 st.warning(f"⚠️ Wenig {league_name}-Spiele für {home_team}, nutze alle Wettbewerbe")
             
             if len(away_fixtures) < 3:
-                away_response = requests.get(
-                    "https://v3.football.api-sports.io/fixtures",
-                    headers={'x-apisports-key': api_key},
+                away_response = api.get(
+                    'fixtures',
                     params={
                         'team': away_team_id,
                         'season': season,
@@ -927,24 +921,12 @@ def create_alternative_markets_tab_extended():
                 
                 st.info(f"🔍 Suche in Season {current_season}/{current_season+1} am {search_date}")
                 
-                for league_id in selected_leagues:
-                    try:
-                        response = requests.get(
-                            "https://v3.football.api-sports.io/fixtures",
-                            headers={'x-apisports-key': api_key},
-                            params={
-                                'league': league_id,
-                                'season': current_season,
-                                'date': search_date.strftime('%Y-%m-%d')
-                            },
-                            timeout=15
-                        )
-                        
-                        if response.status_code == 200:
-                            fixtures = response.json().get('response', [])
-                            all_fixtures.extend(fixtures)
-                    except Exception as e:
-                        st.warning(f"⚠️ Fehler beim Laden von {ALL_LEAGUES.get(league_id, league_id)}: {e}")
+                # Ein fixtures?date= Call für alle Ligen, lokal gefiltert
+                try:
+                    calendar = get_api_football(api_key).calendar
+                    all_fixtures = calendar.get_fixtures_for_leagues(search_date, selected_leagues)
+                except Exception as e:
+                    st.warning(f"⚠️ Fehler beim Laden der Matches: {e}")
                 
                 st.session_state['tab7_fixtures'] = all_fixtures
                 
@@ -1051,7 +1033,9 @@ def create_alternative_markets_tab_extended():
                                         st.markdown("### 🎯 VALUE BET SCANNER")
                                         st.caption("Top 3 Wetten mit höchstem Edge vs. Bookmaker")
                                         
-                                        smart_bets = finder.find_value_bets(match_analysis)
+                                        smart_bets = finder.find_value_bets(
+                                            match_analysis, fixture_id=match['fixture']['id']
+                                        )
                                         
                                         if smart_bets:
                                             for i, bet in enumerate(smart_bets, 1):
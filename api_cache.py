@@ -0,0 +1,318 @@
+"""
+API RESPONSE CACHE - Persistent HTTP Cache für API-Football
+============================================================
+Disk-basierter Cache (SQLite) unter APIFootball.get().
+Überlebt Neustarts und wird von allen Prozessen geteilt
+(Streamlit-Worker, red_card_bot.py, train_ml_models.py, ...).
+
+TTL-Regeln pro Endpoint:
+- fixtures/statistics, fixtures/events, fixtures/lineups:
+    beendetes Spiel → für immer, sonst nicht gecacht (Live!)
+- teams/statistics: 6h
+- fixtures/headtohead: 12h
+- fixtures?live=...: nie gecacht
+- fixtures (nur beendete Spiele, z.B. status=FT): 3h
+- fixtures (Rest, z.B. kommende Spiele): 30 min
+
+Konfiguration (Environment):
+- API_CACHE_PATH: Pfad zur Cache-DB (default: api_cache.db)
+- API_CACHE_DISABLED=1: Cache komplett aus
+"""
+
+import os
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+from urllib.parse import urlencode
+
+# TTL Sentinels
+CACHE_FOREVER = -1
+NO_CACHE = 0
+
+# Status-Codes für beendete Spiele (API-Football fixture.status.short)
+FINISHED_STATUSES = {'FT', 'AET', 'PEN', 'AWD', 'WO', 'CANC', 'ABD'}
+
+# Endpoints deren Daten sich nach Abpfiff nicht mehr ändern
+PER_FIXTURE_ENDPOINTS = {'fixtures/statistics', 'fixtures/events', 'fixtures/lineups', 'fixtures/players'}
+
+# Default TTLs in Sekunden
+ENDPOINT_TTLS = {
+    'teams/statistics': 6 * 3600,
+    'fixtures/headtohead': 12 * 3600,
+    'standings': 6 * 3600,
+    'injuries': 3 * 3600,
+    'odds': 15 * 60,
+}
+
+FIXTURES_FINISHED_TTL = 3 * 3600
+FIXTURES_DEFAULT_TTL = 30 * 60
+
+
+def make_cache_key(endpoint: str, params: Optional[Dict] = None) -> str:
+    """Stable cache key: endpoint + sorted query params"""
+    items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+    return f"{endpoint}?{urlencode(items)}"
+
+
+def _is_finished_status_filter(status: str) -> bool:
+    """True if a fixtures 'status' filter only selects finished matches"""
+    codes = [s for s in str(status).split('-') if s]
+    return bool(codes) and all(code in FINISHED_STATUSES for code in codes)
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache for API-Football JSON responses
+
+    Bodies are stored zlib-compressed. Each thread gets its own connection
+    (WAL mode), so the cache can be shared by threads and processes.
+    """
+
+    def __init__(self, db_path: str = "api_cache.db"):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._init_database()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get this thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_database(self):
+        """Create cache tables"""
+        conn = self._get_connection()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                cache_key TEXT PRIMARY KEY,
+                endpoint TEXT,
+                body BLOB,
+                created_at REAL,
+                expires_at REAL
+            )
+        ''')
+        # Fixtures die als beendet gesehen wurden → Statistiken für immer cachebar
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS finished_fixtures (
+                fixture_id INTEGER PRIMARY KEY,
+                seen_at REAL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_expires ON responses(expires_at)')
+        conn.commit()
+
+    # ------------------------------------------------------------------
+    # TTL policy
+    # ------------------------------------------------------------------
+
+    def is_fixture_finished(self, fixture_id) -> bool:
+        """Check if a fixture was seen as finished in an earlier response"""
+        try:
+            row = self._get_connection().execute(
+                'SELECT 1 FROM finished_fixtures WHERE fixture_id = ?', (int(fixture_id),)
+            ).fetchone()
+            return row is not None
+        except (TypeError, ValueError):
+            return False
+
+    def ttl_for(self, endpoint: str, params: Optional[Dict], payload: Dict) -> int:
+        """
+        Decide how long a response may be cached
+
+        Returns:
+            Seconds, CACHE_FOREVER or NO_CACHE
+        """
+        params = params or {}
+
+        if endpoint in PER_FIXTURE_ENDPOINTS:
+            return CACHE_FOREVER if self.is_fixture_finished(params.get('fixture')) else NO_CACHE
+
+        if endpoint == 'fixtures':
+            if 'live' in params:
+                return NO_CACHE
+
+            fixtures = payload.get('response', [])
+            statuses = [f.get('fixture', {}).get('status', {}).get('short') for f in fixtures]
+
+            # Einzelne Fixtures per ID, alle beendet → ändern sich nie mehr
+            if ('id' in params or 'ids' in params) and statuses and all(s in FINISHED_STATUSES for s in statuses):
+                return CACHE_FOREVER
+
+            if 'status' in params and _is_finished_status_filter(params['status']):
+                return FIXTURES_FINISHED_TTL
+
+            return FIXTURES_DEFAULT_TTL
+
+        return ENDPOINT_TTLS.get(endpoint, NO_CACHE)
+
+    # ------------------------------------------------------------------
+    # Read / write
+    # ------------------------------------------------------------------
+
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Optional[bytes]:
+        """Get a cached response body (raw JSON bytes) or None"""
+        key = make_cache_key(endpoint, params)
+
+        try:
+            row = self._get_connection().execute(
+                'SELECT body, expires_at FROM responses WHERE cache_key = ?', (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️ API cache read error: {e}")
+            row = None
+
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            self._count(endpoint, 'misses')
+            return None
+
+        self._count(endpoint, 'hits')
+        return zlib.decompress(row[0])
+
+    def put(self, endpoint: str, params: Optional[Dict], body: bytes,
+            ttl: Optional[int] = None) -> bool:
+        """
+        Store a response body if the TTL policy allows it
+
+        Args:
+            endpoint: API endpoint (e.g. 'fixtures/statistics')
+            params: Query params used for the request
+            body: Raw JSON response body
+            ttl: Override the endpoint TTL (seconds, CACHE_FOREVER or NO_CACHE)
+
+        Returns:
+            True if stored
+        """
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return False
+
+        # Quota-/Fehler-Antworten kommen mit HTTP 200 - niemals cachen
+        if not isinstance(payload, dict) or payload.get('errors'):
+            return False
+
+        try:
+            conn = self._get_connection()
+
+            if endpoint == 'fixtures':
+                self._mark_finished(conn, payload.get('response', []))
+
+            if ttl is None:
+                ttl = self.ttl_for(endpoint, params, payload)
+            if ttl == NO_CACHE:
+                conn.commit()
+                return False
+
+            now = time.time()
+            expires_at = None if ttl == CACHE_FOREVER else now + ttl
+
+            conn.execute(
+                'INSERT OR REPLACE INTO responses (cache_key, endpoint, body, created_at, expires_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (make_cache_key(endpoint, params), endpoint, zlib.compress(body), now, expires_at)
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ API cache write error: {e}")
+            return False
+
+        self._count(endpoint, 'stores')
+        return True
+
+    def _mark_finished(self, conn: sqlite3.Connection, fixtures: list):
+        """Remember finished fixture IDs from a fixtures response"""
+        now = time.time()
+        rows = []
+        for fixture in fixtures:
+            info = fixture.get('fixture', {})
+            if info.get('status', {}).get('short') in FINISHED_STATUSES and info.get('id'):
+                rows.append((info['id'], now))
+
+        if rows:
+            conn.executemany(
+                'INSERT OR IGNORE INTO finished_fixtures (fixture_id, seen_at) VALUES (?, ?)', rows
+            )
+
+    def purge_expired(self) -> int:
+        """Delete expired entries, returns number of rows removed"""
+        conn = self._get_connection()
+        cur = conn.execute(
+            'DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at < ?', (time.time(),)
+        )
+        conn.commit()
+        return cur.rowcount
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def _count(self, endpoint: str, field: str):
+        with self._stats_lock:
+            counters = self._stats.setdefault(endpoint, {'hits': 0, 'misses': 0, 'stores': 0})
+            counters[field] += 1
+
+    def stats(self) -> Dict:
+        """
+        Hit/miss counters of this process + size of the shared cache
+
+        Returns:
+        {
+            'hits': 120, 'misses': 30, 'stores': 25, 'hit_rate': 0.8,
+            'entries': 1834,
+            'by_endpoint': {'fixtures/statistics': {'hits': 90, ...}, ...}
+        }
+        """
+        with self._stats_lock:
+            by_endpoint = {k: dict(v) for k, v in self._stats.items()}
+
+        hits = sum(v['hits'] for v in by_endpoint.values())
+        misses = sum(v['misses'] for v in by_endpoint.values())
+        stores = sum(v['stores'] for v in by_endpoint.values())
+
+        try:
+            entries = self._get_connection().execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        except sqlite3.Error:
+            entries = 0
+
+        return {
+            'hits': hits,
+            'misses': misses,
+            'stores': stores,
+            'hit_rate': hits / (hits + misses) if (hits + misses) else 0.0,
+            'entries': entries,
+            'by_endpoint': by_endpoint,
+        }
+
+
+# =============================================================================
+# PROCESS-WIDE INSTANCE
+# =============================================================================
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the shared ResponseCache (None if disabled or unavailable)"""
+    global _response_cache
+
+    if os.environ.get('API_CACHE_DISABLED') == '1':
+        return None
+
+    with _response_cache_lock:
+        if _response_cache is None:
+            try:
+                _response_cache = ResponseCache(os.environ.get('API_CACHE_PATH', 'api_cache.db'))
+            except sqlite3.Error as e:
+                print(f"⚠️ API cache unavailable: {e}")
+                return None
+        return _response_cache
@@ -5,22 +5,125 @@ API-Football Integration - FINAL FIXED VERSION
 ✅ All required methods included
 """
 
+import os
 import requests
-import time
-from datetime import datetime, timedelta
+import threading
 from typing import Dict, List, Optional
 
+from api_cache import get_response_cache, make_cache_key
+from rate_limiter import get_rate_limiter
+from fixture_calendar import FixtureCalendar
+from http_cassette import create_transport_adapter
+
+# Überschreibbar für Lasttests gegen mock_api_football.py
+API_FOOTBALL_BASE_URL = os.environ.get('API_FOOTBALL_BASE_URL', 'https://v3.football.api-sports.io').rstrip('/')
+
+# =============================================================================
+# SHARED HTTP SESSION + CLIENT REGISTRY
+# =============================================================================
+# Ein Session-Objekt pro Prozess: Keep-Alive + TLS-Reuse für alle API-Calls.
+# Ein APIFootball-Client pro API-Key: gemeinsames Rate-Limit über alle Module.
+
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+_clients: Dict[str, 'APIFootball'] = {}
+_clients_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """Get the process-wide pooled requests.Session"""
+    global _http_session
+    
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            # HTTPAdapter, or record/replay adapter if HTTP_CASSETTE_MODE is set
+            adapter = create_transport_adapter(pool_connections=4, pool_maxsize=16)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _http_session = session
+        return _http_session
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical requests
+    
+    The first caller for a key runs the request; callers arriving while it
+    is in flight wait and get the same result (or exception).
+    """
+    
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error: Optional[BaseException] = None
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, 'SingleFlight._Call'] = {}
+        self.coalesced = 0
+    
+    def do(self, key: str, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._Call()
+                self._calls[key] = call
+            else:
+                self.coalesced += 1
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+# Prozessweit: gleiche (endpoint, params) → nur ein HTTP-Call gleichzeitig
+_single_flight = SingleFlight()
+
+
+def get_api_football(api_key: str) -> 'APIFootball':
+    """
+    Get the shared APIFootball client for an API key
+    
+    Use this instead of APIFootball(api_key) so that every module shares
+    one connection pool and one rate limit.
+    """
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            client = APIFootball(api_key)
+            _clients[api_key] = client
+        return client
+
+
 class APIFootball:
     """API-Football wrapper with all 28 leagues"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, session: Optional[requests.Session] = None):
         self.api_key = api_key
-        self.base_url = 'https://v3.football.api-sports.io'
+        self.base_url = API_FOOTBALL_BASE_URL
         self.headers = {
             'x-apisports-key': api_key  # CORRECTED
         }
-        self.last_request_time = 0
-        self.min_request_interval = 1.0  # 1 second between requests
+        self.session = session or get_http_session()
+        self.rate_limiter = get_rate_limiter(api_key)  # Shared token bucket (adapts to quota headers)
+        self.calendar = FixtureCalendar(self)  # fixtures?date= based fixture source
         
         # ALL 28 LEAGUES - League ID mappings
         self.league_ids = {
@@ -64,11 +167,65 @@ class APIFootball:
         print(f"✅ API-Football initialized with {len(self.league_ids)} leagues")
     
     def _rate_limit(self):
-        """Ensure minimum time between requests"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-        self.last_request_time = time.time()
+        """Wait for a token from the shared rate limiter"""
+        self.rate_limiter.acquire()
+    
+    def get(self, endpoint: str, params: Optional[Dict] = None, timeout: int = 15,
+            ttl: Optional[int] = None, fresh: bool = False) -> requests.Response:
+        """
+        GET an API-Football endpoint through the shared session
+        
+        Responses are served from / stored in the persistent response cache
+        (see api_cache.py); cache hits don't count against the rate limit.
+        Concurrent identical requests share one HTTP call (single-flight).
+        
+        Args:
+            endpoint: Endpoint path without leading slash (e.g. 'fixtures/statistics')
+            params: Query parameters
+            timeout: Request timeout in seconds
+            ttl: Override the cache TTL for this call (api_cache.CACHE_FOREVER / NO_CACHE / seconds)
+            fresh: Skip the cache lookup (response is still stored)
+        """
+        cache = get_response_cache()
+        
+        if cache is not None and not fresh:
+            body = cache.get(endpoint, params)
+            if body is not None:
+                return self._cached_response(endpoint, params, body)
+        
+        return _single_flight.do(
+            make_cache_key(endpoint, params),
+            lambda: self._fetch(endpoint, params, timeout, ttl, cache)
+        )
+    
+    def _fetch(self, endpoint: str, params: Optional[Dict], timeout: int,
+               ttl: Optional[int], cache) -> requests.Response:
+        """Rate-limited HTTP GET, stores the response in the cache"""
+        self._rate_limit()
+        
+        response = self.session.get(
+            f"{self.base_url}/{endpoint}",
+            headers=self.headers,
+            params=params,
+            timeout=timeout
+        )
+        self.rate_limiter.update_from_response(response)
+        
+        if cache is not None and response.status_code == 200:
+            cache.put(endpoint, params, response.content, ttl)
+        
+        return response
+    
+    def _cached_response(self, endpoint: str, params: Optional[Dict], body: bytes) -> requests.Response:
+        """Wrap a cached body in a Response so callers don't need to care"""
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.encoding = 'utf-8'
+        response.headers['Content-Type'] = 'application/json'
+        response.headers['X-Cache'] = 'HIT'
+        response.url = requests.Request('GET', f"{self.base_url}/{endpoint}", params=params).prepare().url
+        return response
     
     def get_upcoming_fixtures(self, league_code: str, days_ahead: int = 7) -> List[Dict]:
         """
@@ -87,53 +244,30 @@ class APIFootball:
             print(f"⚠️ Unknown league code: {league_code}")
             return []
         
-        self._rate_limit()
-        
-        # Calculate date range
-        today = datetime.now()
-        end_date = today + timedelta(days=days_ahead)
-        
         try:
-            response = requests.get(
-                f"{self.base_url}/fixtures",
-                headers=self.headers,
-                params={
-                    'league': league_id,
-                    'season': 2025,  # CORRECTED: Current season 2025/26
-                    'from': today.strftime('%Y-%m-%d'),
-                    'to': end_date.strftime('%Y-%m-%d'),
-                    'status': 'NS'  # Not Started
-                },
-                timeout=15
-            )
+            # One fixtures?date= call per day, shared by all leagues (see fixture_calendar.py)
+            fixtures = self.calendar.get_upcoming([league_id], days_ahead, status='NS')
             
-            if response.status_code == 200:
-                data = response.json()
-                fixtures = data.get('response', [])
-                
-                print(f"   📅 Found {len(fixtures)} upcoming fixtures for {league_code}")
-                
-                result = []
-                for fixture in fixtures:
-                    try:
-                        result.append({
-                            'fixture_id': fixture['fixture']['id'],
-                            'date': fixture['fixture']['date'],
-                            'home_team': fixture['teams']['home']['name'],
-                            'away_team': fixture['teams']['away']['name'],
-                            'home_team_id': fixture['teams']['home']['id'],
-                            'away_team_id': fixture['teams']['away']['id'],
-                            'league_code': league_code,
-                            'league_name': fixture['league']['name']
-                        })
-                    except KeyError as e:
-                        print(f"   ⚠️ Missing data in fixture: {e}")
-                        continue
-                
-                return result
-            else:
-                print(f"   ❌ API error {response.status_code} for {league_code}")
-                return []
+            print(f"   📅 Found {len(fixtures)} upcoming fixtures for {league_code}")
+            
+            result = []
+            for fixture in fixtures:
+                try:
+                    result.append({
+                        'fixture_id': fixture['fixture']['id'],
+                        'date': fixture['fixture']['date'],
+                        'home_team': fixture['teams']['home']['name'],
+                        'away_team': fixture['teams']['away']['name'],
+                        'home_team_id': fixture['teams']['home']['id'],
+                        'away_team_id': fixture['teams']['away']['id'],
+                        'league_code': league_code,
+                        'league_name': fixture['league']['name']
+                    })
+                except KeyError as e:
+                    print(f"   ⚠️ Missing data in fixture: {e}")
+                    continue
+            
+            return result
                 
         except Exception as e:
             print(f"   ❌ Exception fetching fixtures for {league_code}: {e}")
@@ -141,12 +275,9 @@ class APIFootball:
     
     def get_live_matches(self) -> List[Dict]:
         """Get all live matches across all leagues"""
-        self._rate_limit()
-        
         try:
-            response = requests.get(
-                f"{self.base_url}/fixtures",
-                headers=self.headers,
+            response = self.get(
+                'fixtures',
                 params={'live': 'all'},
                 timeout=15
             )
@@ -164,12 +295,9 @@ class APIFootball:
     
     def get_match_statistics(self, fixture_id: int) -> Optional[Dict]:
         """Get detailed statistics for a specific match"""
-        self._rate_limit()
-        
         try:
-            response = requests.get(
-                f"{self.base_url}/fixtures/statistics",
-                headers=self.headers,
+            response = self.get(
+                'fixtures/statistics',
                 params={'fixture': fixture_id},
                 timeout=15
             )
@@ -252,12 +380,9 @@ class APIFootball:
     
     def get_team_statistics(self, team_id: int, league_id: int, season: int = 2025) -> Optional[Dict]:
         """Get team statistics from API-Football"""
-        self._rate_limit()
-        
         try:
-            response = requests.get(
-                f"{self.base_url}/teams/statistics",
-                headers=self.headers,
+            response = self.get(
+                'teams/statistics',
                 params={
                     'team': team_id,
                     'league': league_id,
@@ -329,12 +454,9 @@ class APIFootball:
     
     def get_h2h(self, team1_id: int, team2_id: int, last_n: int = 10) -> List[Dict]:
         """Get head-to-head matches"""
-        self._rate_limit()
-        
         try:
-            response = requests.get(
-                f"{self.base_url}/fixtures/headtohead",
-                headers=self.headers,
+            response = self.get(
+                'fixtures/headtohead',
                 params={
                     'h2h': f'{team1_id}-{team2_id}',
                     'last': last_n
@@ -354,12 +476,9 @@ class APIFootball:
     
     def get_last_matches(self, team_id: int, league_id: int, n: int = 5) -> List[Dict]:
         """Get last N matches for a team"""
-        self._rate_limit()
-        
         try:
-            response = requests.get(
-                f"{self.base_url}/fixtures",
-                headers=self.headers,
+            response = self.get(
+                'fixtures',
                 params={
                     'team': team_id,
                     'league': league_id,
@@ -388,13 +507,10 @@ class APIFootball:
         Get last N matches for a team and calculate form stats
         Used by advanced_analyzer for form calculation
         """
-        self._rate_limit()
-        
         try:
             # Get last N finished matches for this team (any league)
-            response = requests.get(
-                f"{self.base_url}/fixtures",
-                headers=self.headers,
+            response = self.get(
+                'fixtures',
                 params={
                     'team': team_id,
                     'last': n,
@@ -523,7 +639,7 @@ if __name__ == '__main__':
     api_key = input("\nEnter API key (or press Enter to skip): ").strip()
     
     if api_key:
-        api = APIFootball(api_key)
+        api = get_api_football(api_key)
         
         print("\n📊 Testing get_upcoming_fixtures() for Premier League...")
         fixtures = api.get_upcoming_fixtures('PL', days_ahead=7)
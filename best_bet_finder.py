@@ -29,6 +29,8 @@ import numpy as np
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from probability_kernel import at_least
+
 
 class BestBetFinder:
     """
@@ -499,10 +501,7 @@ class BestBetFinder:
                 needed = threshold - current_goals + 0.5
                 
                 # P(X >= needed) mit Poisson
-                prob_under_threshold = 0
-                for k in range(int(needed)):
-                    prob_under_threshold += (math.exp(-expected_remaining) * 
-                                            (expected_remaining ** k) / math.factorial(k))
+                prob_under_threshold = 1 - at_least(expected_remaining, int(needed))
                 
                 under_prob = prob_under_threshold * 100
                 over_prob = 100 - under_prob
@@ -564,10 +563,7 @@ class BestBetFinder:
                 needed = threshold - current_cards + 0.5
                 
                 # Poisson
-                prob_under = 0
-                for k in range(int(needed)):
-                    prob_under += (math.exp(-expected_cards_remaining) *
-                                  (expected_cards_remaining ** k) / math.factorial(k))
+                prob_under = 1 - at_least(expected_cards_remaining, int(needed))
                 
                 under_prob = prob_under * 100
                 over_prob = 100 - under_prob
@@ -616,10 +612,7 @@ class BestBetFinder:
                 needed = threshold - current_corners + 0.5
                 
                 # Poisson
-                prob_under = 0
-                for k in range(int(needed)):
-                    prob_under += (math.exp(-expected_remaining) *
-                                  (expected_remaining ** k) / math.factorial(k))
+                prob_under = 1 - at_least(expected_remaining, int(needed))
                 
                 under_prob = prob_under * 100
                 over_prob = 100 - under_prob
@@ -842,10 +835,7 @@ class BestBetFinder:
                 home_reasoning = f"Already scored {home_score} goals"
             else:
                 needed = threshold - home_score + 0.5
-                prob_under = 0
-                for k in range(int(needed)):
-                    prob_under += (math.exp(-xg_rate_home) *
-                                  (xg_rate_home ** k) / math.factorial(k))
+                prob_under = 1 - at_least(xg_rate_home, int(needed))
                 home_over = (1 - prob_under) * 100
                 home_reasoning = f"Current: {home_score}, Expected total: {home_score + xg_rate_home:.1f}"
             
@@ -855,10 +845,7 @@ class BestBetFinder:
                 away_reasoning = f"Already scored {away_score} goals"
             else:
                 needed = threshold - away_score + 0.5
-                prob_under = 0
-                for k in range(int(needed)):
-                    prob_under += (math.exp(-xg_rate_away) *
-                                  (xg_rate_away ** k) / math.factorial(k))
+                prob_under = 1 - at_least(xg_rate_away, int(needed))
                 away_over = (1 - prob_under) * 100
                 away_reasoning = f"Current: {away_score}, Expected total: {away_score + xg_rate_away:.1f}"
             
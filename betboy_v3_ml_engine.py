@@ -25,10 +25,12 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import math
-import requests
 import json
 import os
 
+from api_football import APIFootball, get_api_football
+from probability_kernel import over, pmf_table
+
 # ML Libraries (mit Fallback)
 try:
     from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
@@ -103,10 +105,9 @@ class InjuryTracker:
         'O. Dembele': 0.25,
     }
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, api_football: Optional[APIFootball] = None):
         self.api_key = api_key
-        self.base_url = "https://v3.football.api-sports.io"
-        self.headers = {'x-apisports-key': api_key}
+        self.api = api_football or get_api_football(api_key)
         self.cache = {}
     
     def get_team_injuries(self, team_id: int, fixture_id: int = None) -> Dict:
@@ -128,9 +129,8 @@ class InjuryTracker:
             return self.cache[cache_key]
         
         try:
-            response = requests.get(
-                f"{self.base_url}/injuries",
-                headers=self.headers,
+            response = self.api.get(
+                'injuries',
                 params={'team': team_id, 'season': 2025},
                 timeout=10
             )
@@ -255,10 +255,9 @@ class FatigueAnalyzer:
         1: 0.85,   # Domestic Cup
     }
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, api_football: Optional[APIFootball] = None):
         self.api_key = api_key
-        self.base_url = "https://v3.football.api-sports.io"
-        self.headers = {'x-apisports-key': api_key}
+        self.api = api_football or get_api_football(api_key)
     
     def analyze_fixture_congestion(self, team_id: int, 
                                     fixture_date: datetime,
@@ -283,9 +282,8 @@ class FatigueAnalyzer:
             from_date = (fixture_date - timedelta(days=days_lookback)).strftime('%Y-%m-%d')
             to_date = (fixture_date + timedelta(days=days_lookahead)).strftime('%Y-%m-%d')
             
-            response = requests.get(
-                f"{self.base_url}/fixtures",
-                headers=self.headers,
+            response = self.api.get(
+                'fixtures',
                 params={
                     'team': team_id,
                     'from': from_date,
@@ -401,10 +399,9 @@ class MotivationAnalyzer:
     - Europa-Plätze → Erhöhte Motivation
     """
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, api_football: Optional[APIFootball] = None):
         self.api_key = api_key
-        self.base_url = "https://v3.football.api-sports.io"
-        self.headers = {'x-apisports-key': api_key}
+        self.api = api_football or get_api_football(api_key)
         self.standings_cache = {}
     
     def get_motivation_factors(self, team_id: int, league_id: int) -> Dict:
@@ -449,9 +446,8 @@ class MotivationAnalyzer:
             return self.standings_cache[league_id]
         
         try:
-            response = requests.get(
-                f"{self.base_url}/standings",
-                headers=self.headers,
+            response = self.api.get(
+                'standings',
                 params={'league': league_id, 'season': 2025},
                 timeout=10
             )
@@ -938,23 +934,11 @@ class MLEnsemble:
             home_xg = X[0] * 1.25 / max(X[3], 0.5)  # Home attack vs Away defense
             away_xg = X[2] * 0.85 / max(X[1], 0.5)  # Away attack vs Home defense
             
-            # Einfache Poisson-Schätzung
-            home_win = 0.0
-            draw = 0.0
-            away_win = 0.0
-            
-            for h in range(6):
-                for a in range(6):
-                    p_h = (home_xg ** h) * np.exp(-home_xg) / math.factorial(h)
-                    p_a = (away_xg ** a) * np.exp(-away_xg) / math.factorial(a)
-                    p = p_h * p_a
-                    
-                    if h > a:
-                        home_win += p
-                    elif h == a:
-                        draw += p
-                    else:
-                        away_win += p
+            # Einfache Poisson-Schätzung (0-5 Tore je Team)
+            grid = np.outer(pmf_table(home_xg, 5), pmf_table(away_xg, 5))
+            home_win = np.tril(grid, -1).sum()
+            draw = np.trace(grid)
+            away_win = np.triu(grid, 1).sum()
             
             return np.array([home_win, draw, away_win])
         
@@ -1211,13 +1195,15 @@ class BetBoyV3Predictor:
     - Backtesting
     """
     
-    def __init__(self, api_key: str, model_path: str = 'models/'):
+    def __init__(self, api_key: str, model_path: str = 'models/',
+                 api_football: Optional[APIFootball] = None):
         self.api_key = api_key
+        self.api = api_football or get_api_football(api_key)
         
-        # Initialize all components
-        self.injury_tracker = InjuryTracker(api_key)
-        self.fatigue_analyzer = FatigueAnalyzer(api_key)
-        self.motivation_analyzer = MotivationAnalyzer(api_key)
+        # Initialize all components (one shared API-Football client)
+        self.injury_tracker = InjuryTracker(api_key, self.api)
+        self.fatigue_analyzer = FatigueAnalyzer(api_key, self.api)
+        self.motivation_analyzer = MotivationAnalyzer(api_key, self.api)
         self.manager_tracker = ManagerChangeTracker(api_key)
         self.ml_ensemble = MLEnsemble(model_path)
         self.backtest = BacktestingEngine()
@@ -1395,10 +1381,7 @@ class BetBoyV3Predictor:
         
         # Over/Under
         total_xg = home_xg + away_xg
-        over_25 = (1 - sum(
-            (total_xg ** k) * math.exp(-total_xg) / math.factorial(k)
-            for k in range(3)
-        )) * 100
+        over_25 = over(total_xg, 2.5) * 100
         over_25 = max(15, min(85, over_25))
         
         return {
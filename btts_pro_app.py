@@ -9,10 +9,8 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime
-import sqlite3
 import os
 from pathlib import Path
-from typing import Optional
 
 # Page config - MUST BE FIRST
 st.set_page_config(
@@ -58,6 +56,8 @@ st.markdown("""
 
 from advanced_analyzer import AdvancedBTTSAnalyzer
 from data_engine import DataEngine
+from db_pool import get_db_manager
+from match_snapshot import refresh_snapshot
 
 # Optional imports
 try:
@@ -73,26 +73,6 @@ except ImportError:
     ALTERNATIVE_MARKETS_AVAILABLE = False
 
 
-def _get_supabase_url() -> Optional[str]:
-    try:
-        if hasattr(st, 'secrets') and 'SUPABASE_DB_URL' in st.secrets:
-            return st.secrets['SUPABASE_DB_URL']
-    except:
-        pass
-    return os.environ.get('SUPABASE_DB_URL')
-
-
-def _get_db_connection(db_path: str = "btts_data.db"):
-    supabase_url = _get_supabase_url()
-    if supabase_url:
-        try:
-            import psycopg2
-            return psycopg2.connect(supabase_url)
-        except:
-            pass
-    return sqlite3.connect(db_path)
-
-
 # =============================================================================
 # INITIALIZE ANALYZER
 # =============================================================================
@@ -281,7 +261,7 @@ with tab2:
             
             display_df = df_filtered[[
                 'Date', 'League', 'Home', 'Away', 'BTTS %', 
-                'Confidence', 'Tip', 'xG Total'
+                'Confidence', 'Tip', 'xG Total', 'O2.5 %'
             ]].sort_values('BTTS %', key=lambda x: x.str.rstrip('%').astype(float), ascending=False)
             
             st.dataframe(display_df, use_container_width=True, hide_index=True)
@@ -307,7 +287,7 @@ with tab3:
     
     try:
         from ultra_live_scanner_v3 import UltraLiveScanner, display_ultra_opportunity
-        from api_football import APIFootball
+        from api_football import get_api_football
         
         api_key = st.secrets.get("API_FOOTBALL_KEY") if hasattr(st, 'secrets') else None
         
@@ -328,8 +308,8 @@ with tab3:
             
             if scan_btn:
                 with st.spinner("🔍 Scanne Live-Spiele..."):
-                    api = APIFootball(api_key)
-                    scanner = UltraLiveScanner(api)
+                    api = get_api_football(api_key)  # Shared client (same pool + rate limit as analyzer)
+                    scanner = UltraLiveScanner(analyzer, api)
                     
                     live_matches = api.get_live_matches()
                     
@@ -455,12 +435,13 @@ with tab7:
         col1, col2 = st.columns(2)
         
         with col1:
-            if st.button("⚡ Smart Update", help="Nur neue Spiele"):
+            if st.button("⚡ Smart Update", help="Nur neue Spiele (Delta-Sync seit letztem Update)"):
                 with st.spinner("Updating..."):
                     try:
-                        for league in ['BL1', 'PL', 'PD', 'SA', 'FL1']:
-                            if analyzer:
-                                analyzer.engine.fetch_league_matches(league, season=2025, force_refresh=False)
+                        all_leagues = list(analyzer.engine.LEAGUES_CONFIG.keys()) if analyzer else []
+                        for league in all_leagues:
+                            analyzer.engine.fetch_league_matches(league, season=2025, force_refresh=False)
+                        refresh_snapshot(analyzer.engine.db_path)
                         st.success("✅ Updated!")
                     except Exception as e:
                         st.error(f"Error: {e}")
@@ -472,6 +453,7 @@ with tab7:
                         all_leagues = list(analyzer.engine.LEAGUES_CONFIG.keys()) if analyzer else []
                         for league in all_leagues[:10]:
                             analyzer.engine.fetch_league_matches(league, season=2025, force_refresh=True)
+                        refresh_snapshot(analyzer.engine.db_path)
                         st.success("✅ Refreshed!")
                     except Exception as e:
                         st.error(f"Error: {e}")
@@ -497,15 +479,39 @@ with tab7:
             st.write(f"**Ensemble Models:** {list(analyzer.ml_models.keys())}")
         
         try:
-            conn = _get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM matches")
-            total = cursor.fetchone()[0]
-            conn.close()
+            with get_db_manager().connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT COUNT(*) FROM matches")
+                total = cursor.fetchone()[0]
             st.write(f"**Matches in DB:** {total}")
         except:
             pass
 
+        try:
+            mirror = analyzer.engine.get_mirror_status() if analyzer else None
+            if mirror:
+                age = f"{mirror['age_seconds'] / 60:.0f} min" if mirror['age_seconds'] is not None else 'nie'
+                st.write(f"**Lokaler Mirror:** {mirror['rows']} Spiele | letzter Sync vor {age}"
+                         f"{' ⚠️ veraltet' if mirror['stale'] else ''}")
+        except:
+            pass
+
+        try:
+            from api_cache import get_response_cache
+            cache = get_response_cache()
+            if cache:
+                cache_stats = cache.stats()
+                st.write(f"**API Cache:** {cache_stats['hits']} Hits / {cache_stats['misses']} Misses "
+                         f"({cache_stats['hit_rate']:.0%}) | {cache_stats['entries']} Einträge")
+        except:
+            pass
+
+        if analyzer and analyzer.api:
+            limiter_stats = analyzer.api.rate_limiter.stats()
+            st.write(f"**API Rate Limit:** {limiter_stats['rate_per_min']:.0f}/min | "
+                     f"Tagesquota übrig: {limiter_stats['daily_remaining'] if limiter_stats['daily_remaining'] is not None else '?'} | "
+                     f"429s: {limiter_stats['throttled']}")
+
 # =============================================================================
 # FOOTER
 # =============================================================================
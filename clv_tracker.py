@@ -1,160 +1,312 @@
 """
 CLV (Closing Line Value) Tracker
 Tracks predictions and calculates CLV to validate model performance
+
+Persistente Verbindung (db_pool, WAL) + Bulk-APIs, damit jeder analysierte
+Markt geloggt werden kann (zehntausende Zeilen pro Woche):
+- record_predictions(): viele Predictions in einer Transaktion; pro
+  (fixture_id, market_type, prediction) gibt es genau eine Zeile, erneute
+  Scans/Reruns ergänzen nur fehlende Odds statt Duplikate anzulegen
+- update_closing_odds_bulk(): Closing Odds aus einem Odds-Snapshot
+- settle_fixture() / settle_fixtures(): alle Märkte eines Spiels mit einem
+  UPDATE aus dem Endstand abrechnen
+- get_clv_statistics(): Kennzahlen komplett in SQL
 """
 
-import sqlite3
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from db_pool import get_db_manager
+
+PREDICTION_COLUMNS = ('fixture_id', 'home_team', 'away_team', 'market_type', 'prediction',
+                      'odds', 'model_probability', 'confidence', 'created_at')
+
+# Ergebnis eines Markts aus :home / :away (NULL = Markt nicht automatisch abrechenbar)
+#   BTTS: Yes / No
+#   Over/Under (Tore): 'Over 2.5' / 'Under 2.5' (ganze Linien → Push bei Gleichstand)
+#   1X2: Home / Draw / Away (auch 1 / X / 2)
+# Ecken-, Karten- usw. Märkte bleiben offen → settle_prediction()
+GOAL_MARKETS = ('Over/Under', 'Goals', 'Total Goals')
+RESULT_MARKETS = ('1X2', 'Match Winner')
+
+_OUTCOME_SQL = f'''
+    CASE
+        WHEN UPPER(market_type) = 'BTTS' AND prediction = 'Yes' THEN
+            CASE WHEN :home > 0 AND :away > 0 THEN 'Won' ELSE 'Lost' END
+        WHEN UPPER(market_type) = 'BTTS' AND prediction = 'No' THEN
+            CASE WHEN :home > 0 AND :away > 0 THEN 'Lost' ELSE 'Won' END
+        WHEN market_type IN {GOAL_MARKETS} AND prediction LIKE 'Over %' THEN
+            CASE WHEN :home + :away > CAST(SUBSTR(prediction, 6) AS REAL) THEN 'Won'
+                 WHEN :home + :away = CAST(SUBSTR(prediction, 6) AS REAL) THEN 'Push'
+                 ELSE 'Lost' END
+        WHEN market_type IN {GOAL_MARKETS} AND prediction LIKE 'Under %' THEN
+            CASE WHEN :home + :away < CAST(SUBSTR(prediction, 7) AS REAL) THEN 'Won'
+                 WHEN :home + :away = CAST(SUBSTR(prediction, 7) AS REAL) THEN 'Push'
+                 ELSE 'Lost' END
+        WHEN market_type IN {RESULT_MARKETS} AND prediction IN ('Home', '1') THEN CASE WHEN :home > :away THEN 'Won' ELSE 'Lost' END
+        WHEN market_type IN {RESULT_MARKETS} AND prediction IN ('Draw', 'X') THEN CASE WHEN :home = :away THEN 'Won' ELSE 'Lost' END
+        WHEN market_type IN {RESULT_MARKETS} AND prediction IN ('Away', '2') THEN CASE WHEN :home < :away THEN 'Won' ELSE 'Lost' END
+    END
+'''
+
+_SETTLE_FIXTURE_SQL = f'''
+    UPDATE predictions
+    SET result = {_OUTCOME_SQL},
+        profit = CASE {_OUTCOME_SQL}
+                     WHEN 'Won' THEN odds - 1
+                     WHEN 'Lost' THEN -1
+                     WHEN 'Push' THEN 0
+                 END,
+        home_score = :home,
+        away_score = :away,
+        settled_at = :settled_at
+    WHERE fixture_id = :fixture_id
+      AND result IS NULL
+      AND {_OUTCOME_SQL} IS NOT NULL
+'''
+
+# Eine Zeile pro Fixture/Markt/Tipp - die erste Prediction zählt, spätere
+# Logs ergänzen nur Odds, solange noch keine bekannt sind
+_INSERT_PREDICTION_SQL = f'''
+    INSERT INTO predictions ({', '.join(PREDICTION_COLUMNS)})
+    VALUES ({', '.join(['?'] * len(PREDICTION_COLUMNS))})
+    ON CONFLICT (fixture_id, market_type, prediction) DO UPDATE
+    SET odds = excluded.odds
+    WHERE predictions.odds IS NULL AND excluded.odds IS NOT NULL AND predictions.result IS NULL
+'''
+
+_CONFIDENCE_BUCKET_SQL = '''
+    CASE
+        WHEN confidence IS NULL THEN 'n/a'
+        WHEN confidence >= 80 THEN '80+'
+        WHEN confidence >= 70 THEN '70-79'
+        WHEN confidence >= 60 THEN '60-69'
+        ELSE '<60'
+    END
+'''
 
 
 class CLVTracker:
     """Track predictions and calculate Closing Line Value"""
-    
+
     def __init__(self, db_path: str = "btts_clv.db"):
         self.db_path = db_path
+        # Eigene SQLite-DB, persistente Verbindung pro Thread
+        self.db = get_db_manager(db_path, '')
         self._init_database()
-    
+
     def _init_database(self):
         """Initialize CLV database"""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
+        with self.db.connection() as conn:
+            c = conn.cursor()
+
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS predictions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    fixture_id INTEGER NOT NULL,
+                    home_team TEXT NOT NULL,
+                    away_team TEXT NOT NULL,
+                    market_type TEXT NOT NULL,
+                    prediction TEXT NOT NULL,
+                    odds REAL,
+                    closing_odds REAL,
+                    model_probability REAL,
+                    confidence INTEGER,
+                    result TEXT,
+                    profit REAL,
+                    home_score INTEGER,
+                    away_score INTEGER,
+                    created_at TEXT NOT NULL,
+                    settled_at TEXT
+                )
+            ''')
+
+            # Closing-Odds-Updates + Settlement pro Fixture/Markt, zugleich Dedupe-Schlüssel
+            c.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_prediction_key'")
+            if c.fetchone() is None:
+                self._deduplicate(c)
+                c.execute('DROP INDEX IF EXISTS idx_fixture_market')
+                c.execute('CREATE UNIQUE INDEX idx_prediction_key '
+                          'ON predictions(fixture_id, market_type, prediction)')
+            c.execute('CREATE INDEX IF NOT EXISTS idx_created ON predictions(created_at)')
+            c.execute('DROP INDEX IF EXISTS idx_fixture')
+
+    @staticmethod
+    def _deduplicate(c):
+        """Collapse duplicate rows from before the unique key (keeps the first, fills its odds)"""
         c.execute('''
-            CREATE TABLE IF NOT EXISTS predictions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                fixture_id INTEGER NOT NULL,
-                home_team TEXT NOT NULL,
-                away_team TEXT NOT NULL,
-                market_type TEXT NOT NULL,
-                prediction TEXT NOT NULL,
-                odds REAL,
-                closing_odds REAL,
-                model_probability REAL,
-                confidence INTEGER,
-                result TEXT,
-                profit REAL,
-                home_score INTEGER,
-                away_score INTEGER,
-                created_at TEXT NOT NULL,
-                settled_at TEXT
-            )
+            UPDATE predictions
+            SET odds = (SELECT p.odds FROM predictions p
+                        WHERE p.fixture_id = predictions.fixture_id
+                          AND p.market_type = predictions.market_type
+                          AND p.prediction = predictions.prediction
+                          AND p.odds IS NOT NULL
+                        ORDER BY p.id LIMIT 1)
+            WHERE odds IS NULL
+        ''')
+        c.execute('''
+            DELETE FROM predictions
+            WHERE id NOT IN (SELECT MIN(id) FROM predictions
+                             GROUP BY fixture_id, market_type, prediction)
         ''')
-        
-        c.execute('CREATE INDEX IF NOT EXISTS idx_fixture ON predictions(fixture_id)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_created ON predictions(created_at)')
-        
-        conn.commit()
-        conn.close()
-    
+        if c.rowcount > 0:
+            print(f"🧹 CLV: removed {c.rowcount} duplicate predictions")
+
     def record_prediction(self, fixture_id: int, home_team: str, away_team: str,
                          market_type: str, prediction: str, odds: float,
                          model_probability: float, confidence: int) -> int:
         """
         Record a prediction
-        
+
         Returns:
-            prediction_id
+            prediction_id (the existing row if this selection was already logged)
         """
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        c.execute('''
-            INSERT INTO predictions 
-            (fixture_id, home_team, away_team, market_type, prediction, odds,
-             model_probability, confidence, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (fixture_id, home_team, away_team, market_type, prediction, odds,
-              model_probability, confidence, datetime.now().isoformat()))
-        
-        pred_id = c.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return pred_id
-    
+        with self.db.connection() as conn:
+            c = conn.cursor()
+            c.execute(_INSERT_PREDICTION_SQL,
+                      (fixture_id, home_team, away_team, market_type, prediction, odds,
+                       model_probability, confidence, datetime.now().isoformat()))
+            c.execute('SELECT id FROM predictions WHERE fixture_id = ? AND market_type = ? AND prediction = ?',
+                      (fixture_id, market_type, prediction))
+            return c.fetchone()[0]
+
+    def record_predictions(self, predictions: Iterable[Dict]) -> int:
+        """
+        Record many predictions in one transaction
+
+        Args:
+            predictions: Dicts with the record_prediction arguments
+                         (created_at optional)
+
+        Returns:
+            Number of rows written (new selections + odds filled in)
+        """
+        now = datetime.now().isoformat()
+        rows = [(p['fixture_id'], p['home_team'], p['away_team'], p['market_type'], p['prediction'],
+                 p.get('odds'), p.get('model_probability'), p.get('confidence'),
+                 p.get('created_at') or now)
+                for p in predictions]
+        if not rows:
+            return 0
+
+        with self.db.connection() as conn:
+            before = conn.total_changes
+            conn.executemany(_INSERT_PREDICTION_SQL, rows)
+            return conn.total_changes - before
+
     def update_closing_odds(self, prediction_id: int, closing_odds: float):
         """Update closing odds for a prediction"""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        c.execute('''
-            UPDATE predictions 
-            SET closing_odds = ?
-            WHERE id = ?
-        ''', (closing_odds, prediction_id))
-        
-        conn.commit()
-        conn.close()
-    
+        with self.db.connection() as conn:
+            conn.execute('UPDATE predictions SET closing_odds = ? WHERE id = ?',
+                         (closing_odds, prediction_id))
+
+    def update_closing_odds_bulk(self, odds_snapshot: Iterable[Dict]) -> int:
+        """
+        Set closing odds from an odds snapshot
+
+        Args:
+            odds_snapshot: Dicts with fixture_id, market_type, prediction, odds
+                           (one entry per market selection)
+
+        Returns:
+            Number of predictions updated
+        """
+        rows = [(s['odds'], s['fixture_id'], s['market_type'], s['prediction'])
+                for s in odds_snapshot if s.get('odds')]
+        if not rows:
+            return 0
+
+        with self.db.connection() as conn:
+            before = conn.total_changes
+            conn.executemany('''
+                UPDATE predictions
+                SET closing_odds = ?
+                WHERE fixture_id = ? AND market_type = ? AND prediction = ? AND result IS NULL
+            ''', rows)
+            return conn.total_changes - before
+
     def settle_prediction(self, prediction_id: int, result: str,
                          home_score: int, away_score: int):
         """
         Settle a prediction
-        
+
         Args:
             result: 'Won', 'Lost', 'Push'
             home_score: Final home score
             away_score: Final away score
         """
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        # Get prediction details
-        c.execute('SELECT odds FROM predictions WHERE id = ?', (prediction_id,))
-        row = c.fetchone()
-        
-        if not row:
-            conn.close()
-            return
-        
-        odds = row[0]
-        
-        # Calculate profit
-        if result == 'Won':
-            profit = odds - 1
-        elif result == 'Lost':
-            profit = -1
-        else:  # Push
-            profit = 0
-        
-        c.execute('''
-            UPDATE predictions
-            SET result = ?, profit = ?, home_score = ?, away_score = ?,
-                settled_at = ?
-            WHERE id = ?
-        ''', (result, profit, home_score, away_score, 
-              datetime.now().isoformat(), prediction_id))
-        
-        conn.commit()
-        conn.close()
-    
+        with self.db.connection() as conn:
+            conn.execute('''
+                UPDATE predictions
+                SET result = ?,
+                    profit = CASE ? WHEN 'Won' THEN odds - 1 WHEN 'Lost' THEN -1 ELSE 0 END,
+                    home_score = ?, away_score = ?, settled_at = ?
+                WHERE id = ?
+            ''', (result, result, home_score, away_score, datetime.now().isoformat(), prediction_id))
+
+    def settle_fixture(self, fixture_id: int, home_score: int, away_score: int) -> int:
+        """
+        Settle all open predictions of a fixture from its final score
+
+        BTTS, Over/Under and 1X2 are derived in SQL; other markets stay open
+        (settle_prediction).
+
+        Returns:
+            Number of predictions settled
+        """
+        return self.settle_fixtures({fixture_id: (home_score, away_score)})
+
+    def settle_fixtures(self, final_scores: Dict[int, Tuple[int, int]]) -> int:
+        """Settle many fixtures in one transaction ({fixture_id: (home, away)})"""
+        settled_at = datetime.now().isoformat()
+        params = [{'fixture_id': fixture_id, 'home': home, 'away': away, 'settled_at': settled_at}
+                  for fixture_id, (home, away) in final_scores.items()
+                  if home is not None and away is not None]
+        if not params:
+            return 0
+
+        with self.db.connection() as conn:
+            before = conn.total_changes
+            conn.executemany(_SETTLE_FIXTURE_SQL, params)
+            return conn.total_changes - before
+
     def get_clv_statistics(self, days: int = 30) -> Dict:
         """
         Get CLV statistics for the last N days
-        
+
         Returns:
-            Dict with CLV metrics
+            Dict with CLV metrics (+ by_confidence breakdown)
         """
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        # Date filter
         date_filter = (datetime.now() - timedelta(days=days)).isoformat()
-        
-        # Get predictions with both opening and closing odds
-        c.execute('''
-            SELECT odds, closing_odds, result, profit, confidence
+
+        # Nur Predictions mit Opening + Closing Odds und Ergebnis
+        stats_sql = '''
+            SELECT {group}
+                   COUNT(*),
+                   AVG(CASE WHEN closing_odds > 0 THEN (odds / closing_odds - 1) * 100 END),
+                   SUM(CASE WHEN result = 'Won' THEN 1 ELSE 0 END),
+                   COALESCE(SUM(profit), 0)
             FROM predictions
             WHERE created_at > ?
-            AND closing_odds IS NOT NULL
-            AND result IS NOT NULL
-        ''', (date_filter,))
-        
-        predictions = c.fetchall()
-        conn.close()
-        
-        if not predictions:
+              AND closing_odds IS NOT NULL
+              AND result IS NOT NULL
+            {group_by}
+        '''
+
+        with self.db.connection() as conn:
+            total_row = conn.execute(stats_sql.format(group='', group_by=''), (date_filter,)).fetchone()
+            bucket_rows = conn.execute(stats_sql.format(group=f'{_CONFIDENCE_BUCKET_SQL} AS bucket,',
+                                                        group_by='GROUP BY bucket'),
+                                       (date_filter,)).fetchall()
+
+        stats = self._format_stats(*total_row)
+        stats['by_confidence'] = {row[0]: self._format_stats(*row[1:]) for row in bucket_rows}
+        return stats
+
+    @staticmethod
+    def _format_stats(total_bets: int, avg_clv: Optional[float], wins: Optional[int],
+                      total_profit: Optional[float]) -> Dict:
+        if not total_bets:
             return {
                 'total_bets': 0,
                 'avg_clv': 0,
@@ -162,86 +314,37 @@ class CLVTracker:
                 'profit': 0,
                 'roi': 0
             }
-        
-        # Calculate metrics
-        total_bets = len(predictions)
-        clv_values = []
-        wins = 0
-        total_profit = 0
-        
-        for odds, closing_odds, result, profit, confidence in predictions:
-            # CLV = (Opening Odds / Closing Odds - 1) * 100
-            if closing_odds > 0:
-                clv = (odds / closing_odds - 1) * 100
-                clv_values.append(clv)
-            
-            if result == 'Won':
-                wins += 1
-            
-            if profit is not None:
-                total_profit += profit
-        
-        avg_clv = sum(clv_values) / len(clv_values) if clv_values else 0
-        win_rate = (wins / total_bets) * 100 if total_bets > 0 else 0
-        roi = (total_profit / total_bets) * 100 if total_bets > 0 else 0
-        
+
         return {
             'total_bets': total_bets,
-            'avg_clv': round(avg_clv, 2),
-            'win_rate': round(win_rate, 1),
-            'profit': round(total_profit, 2),
-            'roi': round(roi, 1)
+            'avg_clv': round(avg_clv or 0, 2),
+            'win_rate': round((wins or 0) / total_bets * 100, 1),
+            'profit': round(total_profit or 0, 2),
+            'roi': round((total_profit or 0) / total_bets * 100, 1)
         }
-    
+
     def get_recent_predictions(self, limit: int = 10) -> List[Dict]:
         """Get recent predictions"""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        c.execute('''
-            SELECT id, fixture_id, home_team, away_team, market_type, 
-                   prediction, odds, closing_odds, result, profit, created_at
-            FROM predictions
-            ORDER BY created_at DESC
-            LIMIT ?
-        ''', (limit,))
-        
-        rows = c.fetchall()
-        conn.close()
-        
-        predictions = []
-        for row in rows:
-            pred = {
-                'id': row[0],
-                'fixture_id': row[1],
-                'home_team': row[2],
-                'away_team': row[3],
-                'market_type': row[4],
-                'prediction': row[5],
-                'odds': row[6],
-                'closing_odds': row[7],
-                'result': row[8],
-                'profit': row[9],
-                'created_at': row[10]
-            }
-            
-            # Calculate CLV if both odds available
-            if pred['odds'] and pred['closing_odds']:
-                pred['clv'] = round((pred['odds'] / pred['closing_odds'] - 1) * 100, 2)
-            else:
-                pred['clv'] = None
-            
-            predictions.append(pred)
-        
-        return predictions
+        with self.db.connection() as conn:
+            rows = conn.execute('''
+                SELECT id, fixture_id, home_team, away_team, market_type,
+                       prediction, odds, closing_odds, result, profit, created_at,
+                       CASE WHEN odds > 0 AND closing_odds > 0
+                            THEN ROUND((odds / closing_odds - 1) * 100, 2) END
+                FROM predictions
+                ORDER BY created_at DESC
+                LIMIT ?
+            ''', (limit,)).fetchall()
+
+        keys = ('id', 'fixture_id', 'home_team', 'away_team', 'market_type', 'prediction',
+                'odds', 'closing_odds', 'result', 'profit', 'created_at', 'clv')
+        return [dict(zip(keys, row)) for row in rows]
 
 
 if __name__ == "__main__":
     # Test
-    from datetime import timedelta
-    
     tracker = CLVTracker()
-    
+
     # Record test prediction
     pred_id = tracker.record_prediction(
         fixture_id=12345,
@@ -254,15 +357,15 @@ if __name__ == "__main__":
         confidence=75
     )
     print(f"Recorded prediction ID: {pred_id}")
-    
+
     # Update closing odds
     tracker.update_closing_odds(pred_id, 1.72)
     clv = (1.85 / 1.72 - 1) * 100
     print(f"CLV: {clv:.2f}%")
-    
+
     # Settle
-    tracker.settle_prediction(pred_id, 'Won', 2, 1)
-    
+    tracker.settle_fixture(12345, 2, 1)
+
     # Stats
     stats = tracker.get_clv_statistics(days=30)
     print(f"\nCLV Statistics:")
@@ -270,3 +373,4 @@ if __name__ == "__main__":
     print(f"  Avg CLV: {stats['avg_clv']}%")
     print(f"  Win Rate: {stats['win_rate']}%")
     print(f"  ROI: {stats['roi']}%")
+    print(f"  By confidence: {stats['by_confidence']}")
@@ -4,15 +4,24 @@ DATA ENGINE - SUPABASE/POSTGRESQL VERSION
 Nutzt Supabase (PostgreSQL) für persistente Daten auf Streamlit Cloud.
 Fallback auf SQLite für lokale Entwicklung.
 
+Mit Supabase laufen die Stats-Reads über einen lokalen SQLite-Mirror
+(match_mirror), Writes gehen an Supabase.
+
 Season: 2025 (für 2024/25 Saison)
 """
 
 import os
 import time
-import requests
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-import sqlite3
+
+from api_football import APIFootball, get_api_football
+from db_pool import get_db_manager
+from db_migrations import (AGGREGATE_COLUMNS, AGGREGATE_KEY_COLUMNS, ALL_SEASONS, MATCH_COLUMNS,
+                           day_to_iso, epoch_day, h2h_key_sql, hot_query, run_migrations,
+                           upsert_leagues)
+from dixon_coles_fit import load_league_params
+from match_mirror import MIRROR_ENABLED, MatchMirror
 
 # ========== SUPABASE DEBUG BEIM IMPORT ==========
 print("=" * 50)
@@ -70,6 +79,57 @@ print("=" * 50)
 # ========== DEBUG ENDE ==========
 
 
+def _season_from_date(match_date: str) -> int:
+    year, month = int(match_date[:4]), int(match_date[5:7])
+    return year if month >= 7 else year - 1
+
+
+def _aggregate_delta(goals_for: int, goals_against: int, sign: int = 1) -> List[int]:
+    """Contribution of one match to a team_aggregates row"""
+    return [sign,
+            sign * goals_for,
+            sign * goals_against,
+            sign * int(goals_for > 0 and goals_against > 0),
+            sign * int(goals_against == 0),
+            sign * int(goals_for == 0)]
+
+
+DEFAULT_TEAM_STATS = {'matches_played': 0, 'avg_scored': 1.3, 'avg_conceded': 1.2, 'btts_rate': 55}
+DEFAULT_FORM = {'btts_rate': 50, 'avg_scored': 1.3, 'avg_conceded': 1.2, 'matches': 0}
+DEFAULT_H2H = {'btts_rate': 50, 'avg_goals': 2.5, 'matches_played': 0}
+
+
+def _team_stats_result(matches, goals_for, goals_against, btts_count) -> Dict:
+    """Team stats dict from summed team_aggregates columns"""
+    if not matches:
+        return dict(DEFAULT_TEAM_STATS)
+    
+    matches = int(matches)  # Postgres SUM → Decimal
+    return {
+        'matches_played': matches,
+        'avg_scored': round(float(goals_for) / matches or 1.3, 2),
+        'avg_conceded': round(float(goals_against) / matches or 1.2, 2),
+        'btts_rate': round(float(btts_count) * 100.0 / matches or 50, 1)
+    }
+
+
+def _form_result(rows: List[tuple]) -> Dict:
+    """Form dict from (scored, conceded, btts) rows"""
+    if not rows:
+        return dict(DEFAULT_FORM)
+    
+    btts_count = sum(r[2] for r in rows)
+    avg_scored = sum(r[0] for r in rows) / len(rows)
+    avg_conceded = sum(r[1] for r in rows) / len(rows)
+    
+    return {
+        'btts_rate': round(btts_count / len(rows) * 100, 1),
+        'avg_scored': round(avg_scored, 2),
+        'avg_conceded': round(avg_conceded, 2),
+        'matches': len(rows)
+    }
+
+
 def _check_postgres():
     """Check if psycopg2 is available (lazy import)"""
     try:
@@ -123,14 +183,17 @@ class DataEngine:
         'UAE': 301,   # UAE
     }
     
-    def __init__(self, api_key: str, db_path: str = "btts_data.db"):
+    def __init__(self, api_key: str, db_path: str = "btts_data.db",
+                 api_football: Optional[APIFootball] = None):
         """Initialize Data Engine with Supabase or SQLite"""
         self.api_key = api_key
         self.db_path = db_path
-        self.base_url = "https://v3.football.api-sports.io"
-        self.headers = {'x-apisports-key': api_key}
-        self.last_request = 0
-        self.min_delay = 0.5
+        
+        # Shared API-Football client (pooled session + shared rate limit)
+        self.api = api_football or get_api_football(api_key)
+        
+        # Ergebnis des letzten fetch_league_matches (inserted/updated/unchanged)
+        self.last_sync_stats: Dict = {}
         
         # Use cached URL from module-level check
         global _SUPABASE_URL_CACHE
@@ -138,7 +201,10 @@ class DataEngine:
         
         # Check PostgreSQL availability
         postgres_available = _check_postgres()
-        self.use_postgres = bool(self.supabase_url and postgres_available)
+        
+        # Shared pooled connections (Postgres pool / persistent SQLite per thread)
+        self.db = get_db_manager(db_path, self.supabase_url if postgres_available else '')
+        self.use_postgres = self.db.is_postgres
         
         if self.use_postgres:
             print("✅ Using Supabase (PostgreSQL) - Data persists!")
@@ -149,111 +215,265 @@ class DataEngine:
         
         # Initialize database
         self._init_database()
+        
+        # Gefittete Dixon-Coles Parameter (ρ, Heimvorteil, Torschnitt pro Liga)
+        load_league_params(self.db)
+        
+        # Lokaler Read-Mirror (nur mit Supabase sinnvoll)
+        self.mirror: Optional[MatchMirror] = None
+        if self.use_postgres and MIRROR_ENABLED:
+            try:
+                self.mirror = MatchMirror(self.db, db_path.replace('.db', '_mirror.db'), self.LEAGUES_CONFIG)
+                print("✅ Local read mirror enabled!")
+            except Exception as e:
+                print(f"⚠️ Local mirror disabled: {e}")
+        
         print(f"✅ Data Engine initialized with {len(self.LEAGUES_CONFIG)} leagues!")
     
-    def _get_connection(self):
-        """Get database connection (PostgreSQL or SQLite)"""
-        if self.use_postgres:
-            import psycopg2
-            return psycopg2.connect(self.supabase_url)
-        else:
-            return sqlite3.connect(self.db_path)
-    
     def _get_placeholder(self) -> str:
         """Get SQL placeholder (? for SQLite, %s for PostgreSQL)"""
-        return "%s" if self.use_postgres else "?"
+        return self.db.placeholder
+    
+    def _reader(self):
+        """Database for stats reads: local mirror if usable, else the primary"""
+        if self.mirror is not None and self.mirror.ensure_fresh():
+            return self.mirror.db
+        return self.db
+    
+    def _sync_mirror(self, full: bool = False):
+        """Pull our own writes into the mirror right away"""
+        if self.mirror is None:
+            return
+        try:
+            self.mirror.sync(full=full)
+        except Exception as e:
+            print(f"⚠️ Mirror sync failed: {e}")
+    
+    def get_mirror_status(self) -> Optional[Dict]:
+        """Staleness of the local read mirror (None = reads go to the primary)"""
+        return self.mirror.status() if self.mirror is not None else None
     
     def _init_database(self):
-        """Create database tables"""
-        conn = self._get_connection()
-        c = conn.cursor()
+        """Bring the schema up to date (db_migrations) and seed team_aggregates"""
+        version = run_migrations(self.db, self.LEAGUES_CONFIG)
+        
+        with self.db.connection() as conn:
+            c = conn.cursor()
+            upsert_leagues(c, self.use_postgres, self.LEAGUES_CONFIG)
+            c.execute('SELECT COUNT(*) FROM team_aggregates')
+            if c.fetchone()[0] == 0:
+                self._rebuild_team_aggregates(c)
+        
+        print(f"✅ Database initialized ({'PostgreSQL' if self.use_postgres else 'SQLite'}, schema v{version})")
+    
+    def _get_sync_watermark(self, c, league_code: str, season: int) -> Optional[str]:
+        """
+        Last synced fixture date (YYYY-MM-DD) for a league/season
+        
+        Falls back to the newest stored match of the league, so existing
+        databases don't start with a full reload. (The API still filters by
+        season, so an older date just means a larger window.)
+        """
+        ph = self._get_placeholder()
+        
+        c.execute(f'SELECT last_fixture_date FROM sync_state WHERE league_code = {ph} AND season = {ph}',
+                  (league_code, season))
+        row = c.fetchone()
+        if row and row[0]:
+            return row[0]
+        
+        c.execute(hot_query('sync_watermark', self.use_postgres), (self.LEAGUES_CONFIG.get(league_code),))
+        row = c.fetchone()
+        return day_to_iso(row[0]) if row and row[0] is not None else None
+    
+    def _set_sync_watermark(self, c, league_code: str, season: int, last_fixture_date: Optional[str]):
+        """Store the sync watermark for a league/season"""
+        ph = self._get_placeholder()
+        now = datetime.now().isoformat()
         
         if self.use_postgres:
-            # PostgreSQL Schema
-            c.execute('''
-                CREATE TABLE IF NOT EXISTS matches (
-                    id INTEGER PRIMARY KEY,
-                    league_code TEXT,
-                    league_id INTEGER,
-                    date TEXT,
-                    home_team TEXT,
-                    away_team TEXT,
-                    home_team_id INTEGER,
-                    away_team_id INTEGER,
-                    home_goals INTEGER,
-                    away_goals INTEGER,
-                    btts INTEGER,
-                    total_goals INTEGER,
-                    fetched_at TEXT
-                )
-            ''')
+            c.execute(f'''
+                INSERT INTO sync_state (league_code, season, last_fixture_date, last_synced_at)
+                VALUES ({ph}, {ph}, {ph}, {ph})
+                ON CONFLICT (league_code, season) DO UPDATE SET
+                    last_fixture_date = EXCLUDED.last_fixture_date,
+                    last_synced_at = EXCLUDED.last_synced_at
+            ''', (league_code, season, last_fixture_date, now))
+        else:
+            c.execute(f'''
+                INSERT OR REPLACE INTO sync_state (league_code, season, last_fixture_date, last_synced_at)
+                VALUES ({ph}, {ph}, {ph}, {ph})
+            ''', (league_code, season, last_fixture_date, now))
+    
+    def _get_stored_scores(self, c, match_ids: List[int]) -> Dict[int, tuple]:
+        """Get {id: (home_goals, away_goals, season)} for already stored matches"""
+        ph = self._get_placeholder()
+        stored = {}
+        
+        for i in range(0, len(match_ids), 500):
+            chunk = match_ids[i:i + 500]
+            c.execute(f'SELECT id, home_goals, away_goals, season FROM matches '
+                      f'WHERE id IN ({", ".join([ph] * len(chunk))})', chunk)
+            for row in c.fetchall():
+                stored[row[0]] = (row[1], row[2], row[3])
+        
+        return stored
+    
+    def _bulk_upsert_matches(self, c, rows: List[tuple]):
+        """
+        Upsert many match rows in one round-trip
+        
+        PostgreSQL: execute_values into a temp staging table, then one
+        INSERT ... SELECT ... ON CONFLICT merge.
+        SQLite: executemany inside the caller's transaction.
+        """
+        if not rows:
+            return
+        
+        columns = ', '.join(MATCH_COLUMNS)
+        
+        if self.use_postgres:
+            from psycopg2.extras import execute_values
             
-            # Indexes
-            try:
-                c.execute('CREATE INDEX IF NOT EXISTS idx_league ON matches(league_code)')
-                c.execute('CREATE INDEX IF NOT EXISTS idx_date ON matches(date)')
-                c.execute('CREATE INDEX IF NOT EXISTS idx_home_team ON matches(home_team_id)')
-                c.execute('CREATE INDEX IF NOT EXISTS idx_away_team ON matches(away_team_id)')
-            except:
-                pass
+            c.execute('CREATE TEMP TABLE IF NOT EXISTS matches_staging '
+                      '(LIKE matches INCLUDING DEFAULTS) ON COMMIT DELETE ROWS')
+            execute_values(c, f'INSERT INTO matches_staging ({columns}) VALUES %s', rows, page_size=1000)
+            c.execute(f'''
+                INSERT INTO matches ({columns})
+                SELECT {columns} FROM matches_staging
+                ON CONFLICT (id) DO UPDATE SET
+                    home_goals = EXCLUDED.home_goals,
+                    away_goals = EXCLUDED.away_goals,
+                    btts = EXCLUDED.btts,
+                    fetched_at = EXCLUDED.fetched_at,
+                    season = EXCLUDED.season
+            ''')
         else:
-            # SQLite Schema
-            c.execute('''
-                CREATE TABLE IF NOT EXISTS matches (
-                    id INTEGER PRIMARY KEY,
-                    league_code TEXT,
-                    league_id INTEGER,
-                    date TEXT,
-                    home_team TEXT,
-                    away_team TEXT,
-                    home_team_id INTEGER,
-                    away_team_id INTEGER,
-                    home_goals INTEGER,
-                    away_goals INTEGER,
-                    btts INTEGER,
-                    total_goals INTEGER,
-                    fetched_at TEXT
-                )
+            placeholders = ', '.join(['?'] * len(MATCH_COLUMNS))
+            c.executemany(f'INSERT OR REPLACE INTO matches ({columns}) VALUES ({placeholders})', rows)
+    
+    def _upsert_teams(self, c, names: Dict[int, str]):
+        """Insert / rename teams in the teams dimension"""
+        rows = [(team_id, name) for team_id, name in names.items() if team_id is not None and name]
+        if not rows:
+            return
+        
+        sql = 'INSERT INTO teams (id, name) VALUES %s ON CONFLICT (id) DO UPDATE SET name = EXCLUDED.name'
+        if self.use_postgres:
+            from psycopg2.extras import execute_values
+            execute_values(c, sql, rows)
+        else:
+            c.executemany(sql.replace('%s', '(?, ?)'), rows)
+    
+    @staticmethod
+    def _add_delta(deltas: Dict[tuple, List[int]], key: tuple, delta: List[int]):
+        """Add a (team, league, season, venue) delta plus the ALL_SEASONS venue/'all' rows"""
+        team_id, league_id, _, venue = key
+        for target in (key, (team_id, league_id, ALL_SEASONS, venue), (team_id, league_id, ALL_SEASONS, 'all')):
+            current = deltas.setdefault(target, [0] * len(AGGREGATE_COLUMNS))
+            for i, value in enumerate(delta):
+                current[i] += value
+    
+    def _apply_aggregate_deltas(self, c, deltas: Dict[tuple, List[int]]):
+        """Add running-sum deltas to team_aggregates (same transaction as the matches)"""
+        rows = [key + tuple(delta) for key, delta in deltas.items() if any(delta)]
+        if not rows:
+            return
+        
+        keys = ', '.join(AGGREGATE_KEY_COLUMNS)
+        columns = ', '.join(AGGREGATE_COLUMNS)
+        updates = ', '.join(f'{col} = team_aggregates.{col} + EXCLUDED.{col}' for col in AGGREGATE_COLUMNS)
+        sql = (f'INSERT INTO team_aggregates ({keys}, {columns}) VALUES %s '
+               f'ON CONFLICT ({keys}) DO UPDATE SET {updates}')
+        
+        if self.use_postgres:
+            from psycopg2.extras import execute_values
+            execute_values(c, sql, rows)
+        else:
+            c.executemany(sql.replace('%s', f"({', '.join(['?'] * (4 + len(AGGREGATE_COLUMNS)))})"), rows)
+    
+    def _rebuild_team_aggregates(self, c):
+        """Recompute team_aggregates from the matches table"""
+        c.execute('DELETE FROM team_aggregates')
+        for venue, team_col, for_col, against_col in (('home', 'home_team_id', 'home_goals', 'away_goals'),
+                                                       ('away', 'away_team_id', 'away_goals', 'home_goals')):
+            c.execute(f'''
+                INSERT INTO team_aggregates (team_id, league_id, season, venue, matches, goals_for,
+                                             goals_against, btts_count, clean_sheets, failed_to_score)
+                SELECT {team_col}, league_id, season, '{venue}',
+                       COUNT(*),
+                       SUM({for_col}),
+                       SUM({against_col}),
+                       SUM(CASE WHEN {for_col} > 0 AND {against_col} > 0 THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN {against_col} = 0 THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN {for_col} = 0 THEN 1 ELSE 0 END)
+                FROM matches
+                WHERE {team_col} IS NOT NULL AND home_goals IS NOT NULL AND away_goals IS NOT NULL
+                GROUP BY {team_col}, league_id, season
             ''')
-            
-            c.execute('CREATE INDEX IF NOT EXISTS idx_league ON matches(league_code)')
-            c.execute('CREATE INDEX IF NOT EXISTS idx_date ON matches(date)')
-            c.execute('CREATE INDEX IF NOT EXISTS idx_teams ON matches(home_team_id, away_team_id)')
         
-        conn.commit()
-        conn.close()
-        print(f"✅ Database initialized ({'PostgreSQL' if self.use_postgres else 'SQLite'})")
+        # Laufende Summen über alle Saisons: pro Venue und gesamt ('all')
+        columns = ', '.join(AGGREGATE_COLUMNS)
+        sums = ', '.join(f'SUM({col})' for col in AGGREGATE_COLUMNS)
+        for venue_sql, group_by in (('venue', ', venue'), ("'all'", '')):
+            c.execute(f'''
+                INSERT INTO team_aggregates (team_id, league_id, season, venue, {columns})
+                SELECT team_id, league_id, {ALL_SEASONS}, {venue_sql}, {sums}
+                FROM team_aggregates
+                WHERE (season IS NULL OR season <> {ALL_SEASONS}) AND venue IN ('home', 'away')
+                GROUP BY team_id, league_id{group_by}
+            ''')
     
-    def _rate_limit(self):
-        """Respect API rate limits"""
-        elapsed = time.time() - self.last_request
-        if elapsed < self.min_delay:
-            time.sleep(self.min_delay - elapsed)
-        self.last_request = time.time()
+    def rebuild_team_aggregates(self):
+        """Rebuild the team_aggregates table (e.g. after manual edits of matches)"""
+        with self.db.connection() as conn:
+            self._rebuild_team_aggregates(conn.cursor())
+        self._sync_mirror(full=True)
+        print("✅ Team aggregates rebuilt")
     
     def fetch_league_matches(self, league_code: str, season: int = 2025, 
                             force_refresh: bool = False) -> int:
-        """Fetch and store ALL finished matches for a league"""
+        """
+        Sync finished matches for a league (delta sync)
+        
+        Default: only fixtures from the last synced date on are requested
+        (from=<watermark - 1 day> to=today) and unchanged rows are skipped.
+        force_refresh=True downloads the whole season and rewrites every row.
+        All rows are written in one bulk upsert (see _bulk_upsert_matches),
+        the inserted/updated/unchanged counts end up in self.last_sync_stats.
+        
+        Returns:
+            Number of new or updated matches
+        """
         league_id = self.LEAGUES_CONFIG.get(league_code)
         if not league_id:
             print(f"❌ Unknown league: {league_code}")
             return 0
         
-        print(f"📡 Fetching {league_code} (season {season})...")
-        
         try:
-            self._rate_limit()
+            params = {
+                'league': league_id,
+                'season': season,
+                'status': 'FT'
+            }
             
-            response = requests.get(
-                f"{self.base_url}/fixtures",
-                headers=self.headers,
-                params={
-                    'league': league_id,
-                    'season': season,
-                    'status': 'FT'
-                },
-                timeout=30
-            )
+            if force_refresh:
+                watermark = None
+            else:
+                with self.db.connection() as conn:
+                    watermark = self._get_sync_watermark(conn.cursor(), league_code, season)
+            
+            if watermark:
+                # 1 Tag Überlappung: spät gewertete Spiele / Zeitzonen
+                from_date = (datetime.strptime(watermark, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+                params['from'] = from_date
+                params['to'] = datetime.now().strftime('%Y-%m-%d')
+                print(f"📡 Syncing {league_code} (season {season}) since {from_date}...")
+            else:
+                print(f"📡 Fetching {league_code} (season {season}, full)...")
+            
+            # API-Call ohne gehaltene DB-Verbindung
+            response = self.api.get('fixtures', params=params, timeout=30, fresh=force_refresh)
             
             if response.status_code != 200:
                 print(f"❌ API Error {response.status_code} for {league_code}")
@@ -262,66 +482,86 @@ class DataEngine:
             data = response.json()
             fixtures = data.get('response', [])
             
-            if not fixtures:
-                print(f"⚠️ No finished matches for {league_code}")
-                return 0
-            
-            # Process matches
-            conn = self._get_connection()
-            c = conn.cursor()
-            ph = self._get_placeholder()
-            
-            count = 0
-            for fixture in fixtures:
-                try:
-                    match_id = fixture['fixture']['id']
-                    match_date = fixture['fixture']['date'][:10]
-                    home_team = fixture['teams']['home']['name']
-                    away_team = fixture['teams']['away']['name']
-                    home_id = fixture['teams']['home']['id']
-                    away_id = fixture['teams']['away']['id']
-                    home_goals = fixture['goals']['home'] or 0
-                    away_goals = fixture['goals']['away'] or 0
-                    btts = 1 if (home_goals > 0 and away_goals > 0) else 0
-                    total = home_goals + away_goals
-                    
-                    # Upsert
-                    if self.use_postgres:
-                        c.execute(f'''
-                            INSERT INTO matches (id, league_code, league_id, date, home_team, away_team,
-                                               home_team_id, away_team_id, home_goals, away_goals,
-                                               btts, total_goals, fetched_at)
-                            VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
-                            ON CONFLICT (id) DO UPDATE SET
-                                home_goals = EXCLUDED.home_goals,
-                                away_goals = EXCLUDED.away_goals,
-                                btts = EXCLUDED.btts,
-                                total_goals = EXCLUDED.total_goals,
-                                fetched_at = EXCLUDED.fetched_at
-                        ''', (match_id, league_code, league_id, match_date, home_team, away_team,
-                              home_id, away_id, home_goals, away_goals, btts, total, 
-                              datetime.now().isoformat()))
+            with self.db.connection() as conn:
+                c = conn.cursor()
+                
+                if not fixtures:
+                    if watermark:
+                        self._set_sync_watermark(c, league_code, season, watermark)
+                        print(f"✅ {league_code}: up to date")
                     else:
-                        c.execute(f'''
-                            INSERT OR REPLACE INTO matches 
-                            (id, league_code, league_id, date, home_team, away_team,
-                             home_team_id, away_team_id, home_goals, away_goals,
-                             btts, total_goals, fetched_at)
-                            VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
-                        ''', (match_id, league_code, league_id, match_date, home_team, away_team,
-                              home_id, away_id, home_goals, away_goals, btts, total,
-                              datetime.now().isoformat()))
-                    
-                    count += 1
-                    
-                except Exception as e:
-                    continue
-            
-            conn.commit()
-            conn.close()
-            
-            print(f"✅ {league_code}: {count} matches stored")
-            return count
+                        print(f"⚠️ No finished matches for {league_code}")
+                    return 0
+                
+                stored = self._get_stored_scores(
+                    c, [f['fixture']['id'] for f in fixtures if f.get('fixture', {}).get('id')]
+                )
+                
+                fetched_at = int(time.time())
+                rows = []
+                team_names: Dict[int, str] = {}
+                deltas: Dict[tuple, List[int]] = {}
+                inserted = updated = unchanged = 0
+                last_date = watermark
+                for fixture in fixtures:
+                    try:
+                        match_id = fixture['fixture']['id']
+                        match_date = fixture['fixture']['date'][:10]
+                        home_goals = fixture['goals']['home'] or 0
+                        away_goals = fixture['goals']['away'] or 0
+                        
+                        if last_date is None or match_date > last_date:
+                            last_date = match_date
+                        
+                        home_id = fixture['teams']['home']['id']
+                        away_id = fixture['teams']['away']['id']
+                        team_names[home_id] = fixture['teams']['home']['name']
+                        team_names[away_id] = fixture['teams']['away']['name']
+                        
+                        row = (match_id, league_id, season, epoch_day(match_date), home_id, away_id,
+                               home_goals, away_goals,
+                               1 if (home_goals > 0 and away_goals > 0) else 0,
+                               fetched_at)
+                        
+                        previous = stored.get(match_id)
+                        if previous and previous[:2] == (home_goals, away_goals) and previous[2] == season:
+                            unchanged += 1
+                            # Unveränderte Zeilen überspringen (außer bei Full Refresh)
+                            if not force_refresh:
+                                continue
+                        else:
+                            if previous is None:
+                                inserted += 1
+                            else:
+                                updated += 1
+                                # Alten Beitrag aus den Aggregaten entfernen
+                                old_home, old_away = previous[0] or 0, previous[1] or 0
+                                old_season = previous[2] or _season_from_date(match_date)
+                                self._add_delta(deltas, (home_id, league_id, old_season, 'home'),
+                                                _aggregate_delta(old_home, old_away, -1))
+                                self._add_delta(deltas, (away_id, league_id, old_season, 'away'),
+                                                _aggregate_delta(old_away, old_home, -1))
+                            self._add_delta(deltas, (home_id, league_id, season, 'home'),
+                                            _aggregate_delta(home_goals, away_goals))
+                            self._add_delta(deltas, (away_id, league_id, season, 'away'),
+                                            _aggregate_delta(away_goals, home_goals))
+                        
+                        rows.append(row)
+                        
+                    except Exception as e:
+                        continue
+                
+                self._upsert_teams(c, team_names)
+                self._bulk_upsert_matches(c, rows)
+                self._apply_aggregate_deltas(c, deltas)
+                self._set_sync_watermark(c, league_code, season, last_date)
+            
+            self.last_sync_stats = {'league_code': league_code, 'inserted': inserted,
+                                    'updated': updated, 'unchanged': unchanged}
+            if inserted or updated:
+                self._sync_mirror()
+            print(f"✅ {league_code}: {inserted} new, {updated} updated, {unchanged} unchanged")
+            return inserted + updated
             
         except Exception as e:
             print(f"❌ Error fetching {league_code}: {e}")
@@ -330,17 +570,18 @@ class DataEngine:
     def get_match_count(self, league_code: str = None) -> int:
         """Get total matches in database"""
         try:
-            conn = self._get_connection()
-            c = conn.cursor()
-            ph = self._get_placeholder()
-            
-            if league_code:
-                c.execute(f'SELECT COUNT(*) FROM matches WHERE league_code = {ph}', (league_code,))
-            else:
-                c.execute('SELECT COUNT(*) FROM matches')
-            
-            count = c.fetchone()[0]
-            conn.close()
+            db = self._reader()
+            with db.connection() as conn:
+                c = conn.cursor()
+                ph = db.placeholder
+                
+                if league_code:
+                    c.execute(f'SELECT COUNT(*) FROM matches WHERE league_id = {ph}',
+                              (self.LEAGUES_CONFIG.get(league_code),))
+                else:
+                    c.execute('SELECT COUNT(*) FROM matches')
+                
+                count = c.fetchone()[0]
             return count
         except:
             return 0
@@ -348,147 +589,64 @@ class DataEngine:
     def get_team_stats(self, team_id: int, league_code: str, venue: str = 'all') -> Optional[Dict]:
         """Get team statistics from database"""
         try:
-            conn = self._get_connection()
-            c = conn.cursor()
-            ph = self._get_placeholder()
-            
-            if venue == 'home':
-                c.execute(f'''
-                    SELECT 
-                        COUNT(*) as matches,
-                        AVG(home_goals) as avg_scored,
-                        AVG(away_goals) as avg_conceded,
-                        SUM(btts) * 100.0 / COUNT(*) as btts_rate
-                    FROM matches
-                    WHERE home_team_id = {ph} AND league_code = {ph}
-                ''', (team_id, league_code))
-            elif venue == 'away':
-                c.execute(f'''
-                    SELECT 
-                        COUNT(*) as matches,
-                        AVG(away_goals) as avg_scored,
-                        AVG(home_goals) as avg_conceded,
-                        SUM(btts) * 100.0 / COUNT(*) as btts_rate
-                    FROM matches
-                    WHERE away_team_id = {ph} AND league_code = {ph}
-                ''', (team_id, league_code))
-            else:
-                c.execute(f'''
-                    SELECT 
-                        COUNT(*) as matches,
-                        AVG(CASE WHEN home_team_id = {ph} THEN home_goals ELSE away_goals END) as avg_scored,
-                        AVG(CASE WHEN home_team_id = {ph} THEN away_goals ELSE home_goals END) as avg_conceded,
-                        SUM(btts) * 100.0 / COUNT(*) as btts_rate
-                    FROM matches
-                    WHERE (home_team_id = {ph} OR away_team_id = {ph}) AND league_code = {ph}
-                ''', (team_id, team_id, team_id, team_id, league_code))
-            
-            row = c.fetchone()
-            conn.close()
-            
-            if row and row[0] > 0:
-                return {
-                    'matches_played': row[0],
-                    'avg_scored': round(row[1] or 1.3, 2),
-                    'avg_conceded': round(row[2] or 1.2, 2),
-                    'btts_rate': round(row[3] or 50, 1)
-                }
-            
-            return {
-                'matches_played': 0,
-                'avg_scored': 1.3,
-                'avg_conceded': 1.2,
-                'btts_rate': 55
-            }
+            db = self._reader()
+            with db.connection() as conn:
+                c = conn.cursor()
+                
+                league_id = self.LEAGUES_CONFIG.get(league_code)
+                
+                # Ein Primärschlüssel-Read: laufende Summe über alle Saisons
+                c.execute(hot_query('team_stats', db.is_postgres),
+                          (team_id, league_id, ALL_SEASONS, venue if venue in ('home', 'away') else 'all'))
+                
+                row = c.fetchone()
+            
+            return _team_stats_result(*row) if row else dict(DEFAULT_TEAM_STATS)
             
         except Exception as e:
             print(f"⚠️ Stats error: {e}")
-            return {
-                'matches_played': 0,
-                'avg_scored': 1.3,
-                'avg_conceded': 1.2,
-                'btts_rate': 55
-            }
+            return dict(DEFAULT_TEAM_STATS)
     
     def get_recent_form(self, team_id: int, league_code: str, 
                        venue: str = 'all', last_n: int = 5) -> Optional[Dict]:
         """Get recent form for a team"""
         try:
-            conn = self._get_connection()
-            c = conn.cursor()
-            ph = self._get_placeholder()
-            
-            if venue == 'home':
-                c.execute(f'''
-                    SELECT home_goals, away_goals, btts
-                    FROM matches
-                    WHERE home_team_id = {ph} AND league_code = {ph}
-                    ORDER BY date DESC
-                    LIMIT {ph}
-                ''', (team_id, league_code, last_n))
-            elif venue == 'away':
-                c.execute(f'''
-                    SELECT away_goals, home_goals, btts
-                    FROM matches
-                    WHERE away_team_id = {ph} AND league_code = {ph}
-                    ORDER BY date DESC
-                    LIMIT {ph}
-                ''', (team_id, league_code, last_n))
-            else:
-                c.execute(f'''
-                    SELECT 
-                        CASE WHEN home_team_id = {ph} THEN home_goals ELSE away_goals END,
-                        CASE WHEN home_team_id = {ph} THEN away_goals ELSE home_goals END,
-                        btts
-                    FROM matches
-                    WHERE (home_team_id = {ph} OR away_team_id = {ph}) AND league_code = {ph}
-                    ORDER BY date DESC
-                    LIMIT {ph}
-                ''', (team_id, team_id, team_id, team_id, league_code, last_n))
-            
-            rows = c.fetchall()
-            conn.close()
-            
-            if not rows:
-                return {'btts_rate': 50, 'avg_scored': 1.3, 'avg_conceded': 1.2, 'matches': 0}
-            
-            btts_count = sum(r[2] for r in rows)
-            avg_scored = sum(r[0] for r in rows) / len(rows)
-            avg_conceded = sum(r[1] for r in rows) / len(rows)
-            
-            return {
-                'btts_rate': round(btts_count / len(rows) * 100, 1),
-                'avg_scored': round(avg_scored, 2),
-                'avg_conceded': round(avg_conceded, 2),
-                'matches': len(rows)
-            }
+            db = self._reader()
+            with db.connection() as conn:
+                c = conn.cursor()
+                league_id = self.LEAGUES_CONFIG.get(league_code)
+                
+                if venue == 'home':
+                    c.execute(hot_query('form_home', db.is_postgres), (team_id, league_id, last_n))
+                elif venue == 'away':
+                    c.execute(hot_query('form_away', db.is_postgres), (team_id, league_id, last_n))
+                else:
+                    c.execute(hot_query('form_all', db.is_postgres),
+                              (team_id, league_id, last_n, team_id, league_id, last_n, last_n))
+                
+                rows = c.fetchall()
+            
+            return _form_result(rows)
             
         except Exception as e:
             print(f"⚠️ Form error: {e}")
-            return {'btts_rate': 50, 'avg_scored': 1.3, 'avg_conceded': 1.2, 'matches': 0}
+            return dict(DEFAULT_FORM)
     
     def calculate_head_to_head(self, team1_id: int, team2_id: int, 
                                last_n: int = 10) -> Optional[Dict]:
         """Calculate H2H statistics"""
         try:
-            conn = self._get_connection()
-            c = conn.cursor()
-            ph = self._get_placeholder()
-            
-            c.execute(f'''
-                SELECT home_goals, away_goals, btts, home_team_id
-                FROM matches
-                WHERE (home_team_id = {ph} AND away_team_id = {ph})
-                   OR (home_team_id = {ph} AND away_team_id = {ph})
-                ORDER BY date DESC
-                LIMIT {ph}
-            ''', (team1_id, team2_id, team2_id, team1_id, last_n))
-            
-            rows = c.fetchall()
-            conn.close()
+            db = self._reader()
+            with db.connection() as conn:
+                c = conn.cursor()
+                
+                c.execute(hot_query('h2h', db.is_postgres),
+                          (min(team1_id, team2_id), max(team1_id, team2_id), last_n))
+                
+                rows = c.fetchall()
             
             if not rows:
-                return {'btts_rate': 50, 'avg_goals': 2.5, 'matches_played': 0}
+                return dict(DEFAULT_H2H)
             
             btts_count = sum(r[2] for r in rows)
             total_goals = sum(r[0] + r[1] for r in rows)
@@ -501,28 +659,176 @@ class DataEngine:
             
         except Exception as e:
             print(f"⚠️ H2H error: {e}")
-            return {'btts_rate': 50, 'avg_goals': 2.5, 'matches_played': 0}
+            return dict(DEFAULT_H2H)
+    
+    def get_slate_stats(self, fixtures: List[tuple], last_n: int = 5,
+                        h2h_last_n: int = 10) -> Dict[tuple, Dict]:
+        """
+        Season, venue, form and H2H stats for a whole slate in one go
+        
+        Replaces 5 single queries per fixture (get_team_stats ×2,
+        get_recent_form ×2, calculate_head_to_head) with three set-based
+        queries on one connection. Last-N form and H2H use
+        ROW_NUMBER() OVER (PARTITION BY team ORDER BY date DESC).
+        
+        Args:
+            fixtures: [(home_id, away_id, league_code), ...]
+            last_n: Matches for form
+            h2h_last_n: Matches for H2H
+        
+        Returns:
+            {(home_id, away_id, league_code): {
+                'home_season', 'away_season',   # like get_team_stats(venue='all')
+                'home_venue', 'away_venue',     # home team at home, away team away
+                'home_form', 'away_form',       # like get_recent_form(venue='all')
+                'home_form_venue', 'away_form_venue',
+                'h2h'                           # like calculate_head_to_head
+            }}
+        """
+        fixtures = list(dict.fromkeys(fixtures))
+        if not fixtures:
+            return {}
+        
+        db = self._reader()
+        ph = db.placeholder
+        teams = list(dict.fromkeys(
+            [(home, league) for home, _, league in fixtures] + [(away, league) for _, away, league in fixtures]
+        ))
+        pairs = list(dict.fromkeys((home, away) for home, away, _ in fixtures))
+        team_values = ', '.join([f'({ph}, {ph})'] * len(teams))
+        team_params = [v for team, league_code in teams for v in (team, self.LEAGUES_CONFIG.get(league_code))]
+        pair_values = ', '.join([f'({ph}, {ph}, {ph}, {ph})'] * len(pairs))
+        pair_params = [v for home, away in pairs for v in (home, away, min(home, away), max(home, away))]
+        
+        aggregates = {}
+        form_rows = {}
+        h2h_rows = {}
+        
+        try:
+            with db.connection() as conn:
+                c = conn.cursor()
+                
+                # 1) Laufende Summen über alle Saisons (home / away / all)
+                c.execute(f'''
+                    WITH slate(team_id, league_id) AS (VALUES {team_values})
+                    SELECT a.team_id, a.league_id, a.venue,
+                           a.matches, a.goals_for, a.goals_against, a.btts_count
+                    FROM slate s
+                    JOIN team_aggregates a ON a.team_id = s.team_id AND a.league_id = s.league_id
+                                          AND a.season = {ALL_SEASONS}
+                ''', team_params)
+                for team_id, league_id, venue, *sums in c.fetchall():
+                    aggregates[(team_id, league_id, venue)] = sums
+                
+                # 2) Letzte N Spiele pro Team (gesamt + pro Venue)
+                c.execute(f'''
+                    WITH slate(team_id, league_id) AS (VALUES {team_values}),
+                    team_games AS (
+                        SELECT s.team_id, s.league_id, m.date, 'home' AS venue,
+                               m.home_goals AS scored, m.away_goals AS conceded, m.btts
+                        FROM slate s
+                        JOIN matches m ON m.home_team_id = s.team_id AND m.league_id = s.league_id
+                        UNION ALL
+                        SELECT s.team_id, s.league_id, m.date, 'away' AS venue,
+                               m.away_goals AS scored, m.home_goals AS conceded, m.btts
+                        FROM slate s
+                        JOIN matches m ON m.away_team_id = s.team_id AND m.league_id = s.league_id
+                    ),
+                    ranked AS (
+                        SELECT team_id, league_id, venue, scored, conceded, btts,
+                               ROW_NUMBER() OVER (PARTITION BY team_id, league_id ORDER BY date DESC) AS rn_all,
+                               ROW_NUMBER() OVER (PARTITION BY team_id, league_id, venue ORDER BY date DESC) AS rn_venue
+                        FROM team_games
+                    )
+                    SELECT team_id, league_id, venue, scored, conceded, btts, rn_all, rn_venue
+                    FROM ranked
+                    WHERE rn_all <= {ph} OR rn_venue <= {ph}
+                    ORDER BY team_id, league_id, rn_all
+                ''', team_params + [last_n, last_n])
+                for team_id, league_id, venue, scored, conceded, btts, rn_all, rn_venue in c.fetchall():
+                    entry = form_rows.setdefault((team_id, league_id), {'all': [], 'home': [], 'away': []})
+                    if rn_all <= last_n:
+                        entry['all'].append((scored, conceded, btts))
+                    if rn_venue <= last_n:
+                        entry[venue].append((scored, conceded, btts))
+                
+                # 3) H2H (beide Heimrichtungen, ligaübergreifend wie calculate_head_to_head)
+                lo, hi = h2h_key_sql(db.is_postgres, 'm.')
+                c.execute(f'''
+                    WITH pairs(team1, team2, team_lo, team_hi) AS (VALUES {pair_values}),
+                    games AS (
+                        SELECT p.team1, p.team2, m.home_goals, m.away_goals, m.btts,
+                               ROW_NUMBER() OVER (PARTITION BY p.team1, p.team2 ORDER BY m.date DESC) AS rn
+                        FROM pairs p
+                        JOIN matches m ON {lo} = p.team_lo AND {hi} = p.team_hi
+                    )
+                    SELECT team1, team2, COUNT(*), SUM(btts), SUM(home_goals + away_goals)
+                    FROM games
+                    WHERE rn <= {ph}
+                    GROUP BY team1, team2
+                ''', pair_params + [h2h_last_n])
+                for team1, team2, n, btts_count, goals in c.fetchall():
+                    h2h_rows[(team1, team2)] = (int(n), int(btts_count or 0), int(goals or 0))
+                
+        except Exception as e:
+            print(f"⚠️ Slate stats error: {e}")
+        
+        def season_stats(team_id, league_code, venue='all'):
+            row = aggregates.get((team_id, self.LEAGUES_CONFIG.get(league_code), venue))
+            return _team_stats_result(*row) if row else dict(DEFAULT_TEAM_STATS)
+        
+        def h2h_stats(team1, team2):
+            n, btts_count, goals = h2h_rows.get((team1, team2), (0, 0, 0))
+            if not n:
+                return dict(DEFAULT_H2H)
+            return {
+                'btts_rate': round(btts_count / n * 100, 1),
+                'avg_goals': round(goals / n, 2),
+                'matches_played': n
+            }
+        
+        empty_form = {'all': [], 'home': [], 'away': []}
+        result = {}
+        for home, away, league_code in fixtures:
+            league_id = self.LEAGUES_CONFIG.get(league_code)
+            home_form = form_rows.get((home, league_id), empty_form)
+            away_form = form_rows.get((away, league_id), empty_form)
+            result[(home, away, league_code)] = {
+                'home_season': season_stats(home, league_code),
+                'away_season': season_stats(away, league_code),
+                'home_venue': season_stats(home, league_code, 'home'),
+                'away_venue': season_stats(away, league_code, 'away'),
+                'home_form': _form_result(home_form['all']),
+                'away_form': _form_result(away_form['all']),
+                'home_form_venue': _form_result(home_form['home']),
+                'away_form_venue': _form_result(away_form['away']),
+                'h2h': h2h_stats(home, away),
+            }
+        
+        return result
     
     def get_league_stats(self, league_code: str) -> Optional[Dict]:
         """Get league-wide statistics"""
         try:
-            conn = self._get_connection()
-            c = conn.cursor()
-            ph = self._get_placeholder()
-            
-            c.execute(f'''
-                SELECT 
-                    COUNT(*) as total_matches,
-                    AVG(home_goals) as avg_home_scored,
-                    AVG(away_goals) as avg_away_scored,
-                    AVG(total_goals) as avg_total,
-                    SUM(btts) * 100.0 / COUNT(*) as btts_rate
-                FROM matches
-                WHERE league_code = {ph}
-            ''', (league_code,))
-            
-            row = c.fetchone()
-            conn.close()
+            db = self._reader()
+            with db.connection() as conn:
+                c = conn.cursor()
+                
+                c.execute(hot_query('league_stats', db.is_postgres),
+                          (self.LEAGUES_CONFIG.get(league_code), ALL_SEASONS))
+                
+                by_venue = {r[0]: r[1:] for r in c.fetchall()}
+            
+            home = by_venue.get('home') or (0, 0, 0)
+            away = by_venue.get('away') or (0, 0, 0)
+            total = int(home[0] or 0)
+            if total:
+                # Jedes Spiel zählt einmal als 'home' und einmal als 'away'
+                home_goals, away_goals = float(home[1]), float(away[1])
+                row = (total, home_goals / total, away_goals / total,
+                       (home_goals + away_goals) / total, float(home[2]) * 100.0 / total)
+            else:
+                row = None
             
             if row and row[0] > 0:
                 return {
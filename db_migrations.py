@@ -0,0 +1,560 @@
+"""
+DB MIGRATIONS - Versioniertes Schema für matches & Co.
+=======================================================
+Jede Migration läuft genau einmal, die angewendeten Versionen stehen in
+schema_migrations. Funktioniert für SQLite und PostgreSQL (Supabase).
+
+Versionen:
+    1  Legacy-Schema (match_id / match_date / home_score, teams, team_stats,
+       head_to_head) → aktuelles matches-Schema, Daten per INSERT ... SELECT
+    2  Basis-Schema: matches, sync_state, team_aggregates, matches.season
+    3  Covering-Indexes für die Hot Queries (Form, H2H, Watermark)
+    4  Index auf matches.fetched_at (inkrementeller Sync des lokalen Mirrors)
+    5  Kompakte Typen: date = Tage seit 1970-01-01, fetched_at = Unix-Sekunden,
+       league_id statt league_code, Team-Namen in teams, Liga-Codes in leagues
+    6  Dixon-Coles Parameter pro Liga (dc_fits, dc_team_params), versioniert
+       pro Fit-Lauf (dixon_coles_fit.py)
+    7  team_aggregates mit laufenden Summen über alle Saisons (season =
+       ALL_SEASONS, venue home/away/all) → Team-Stats als ein PK-Read
+
+Prüfung der Query-Pläne:
+    python db_migrations.py --db btts_data.db --check
+"""
+
+import argparse
+import re
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from db_pool import DatabaseManager, get_db_manager
+
+# Spaltenreihenfolge der Bulk-Upserts / des Mirror-Syncs (Schema ab Version 5)
+MATCH_COLUMNS = ('id', 'league_id', 'season', 'date', 'home_team_id', 'away_team_id',
+                 'home_goals', 'away_goals', 'btts', 'fetched_at')
+
+AGGREGATE_KEY_COLUMNS = ('team_id', 'league_id', 'season', 'venue')
+AGGREGATE_COLUMNS = ('matches', 'goals_for', 'goals_against', 'btts_count',
+                     'clean_sheets', 'failed_to_score')
+
+# season-Wert der laufenden Summen über alle Saisons (venue 'home' / 'away' / 'all')
+ALL_SEASONS = 0
+
+# matches ab Version 5 (date: Tage seit 1970-01-01, fetched_at: Unix-Sekunden)
+MATCHES_V5_DDL = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY,
+        league_id INTEGER,
+        season SMALLINT,
+        date INTEGER,
+        home_team_id INTEGER,
+        away_team_id INTEGER,
+        home_goals SMALLINT,
+        away_goals SMALLINT,
+        btts SMALLINT,
+        fetched_at BIGINT
+    )
+'''
+
+# matches bis Version 4 (Migrationen 1-2)
+MATCHES_DDL = '''
+    CREATE TABLE IF NOT EXISTS matches (
+        id INTEGER PRIMARY KEY,
+        league_code TEXT,
+        league_id INTEGER,
+        date TEXT,
+        home_team TEXT,
+        away_team TEXT,
+        home_team_id INTEGER,
+        away_team_id INTEGER,
+        home_goals INTEGER,
+        away_goals INTEGER,
+        btts INTEGER,
+        total_goals INTEGER,
+        fetched_at TEXT,
+        season INTEGER
+    )
+'''
+
+# Tabellen des Legacy-Schemas, werden mit legacy_ Prefix aufbewahrt
+LEGACY_TABLES = ('teams', 'team_stats', 'head_to_head', 'predictions')
+
+
+def h2h_key_sql(is_postgres: bool, prefix: str = '') -> Tuple[str, str]:
+    """
+    Normalized pair key (lower team id, higher team id) as SQL expressions
+
+    Must match the expression index idx_matches_h2h exactly.
+    """
+    lo, hi = ('LEAST', 'GREATEST') if is_postgres else ('MIN', 'MAX')
+    columns = f'{prefix}home_team_id, {prefix}away_team_id'
+    return f'{lo}({columns})', f'{hi}({columns})'
+
+
+_EPOCH = date(1970, 1, 1)
+
+
+def epoch_day(value) -> Optional[int]:
+    """'YYYY-MM-DD...' → days since 1970-01-01 (None if unparseable)"""
+    try:
+        return (datetime.strptime(str(value)[:10], '%Y-%m-%d').date() - _EPOCH).days
+    except (TypeError, ValueError):
+        return None
+
+
+def day_to_iso(day: Optional[int]) -> Optional[str]:
+    """Days since 1970-01-01 → 'YYYY-MM-DD'"""
+    if day is None:
+        return None
+    return (_EPOCH + timedelta(days=int(day))).isoformat()
+
+
+def upsert_leagues(c, is_postgres: bool, league_ids: Dict[str, int]):
+    """Keep the leagues dimension (id → code) in line with the configured leagues"""
+    ph = '%s' if is_postgres else '?'
+    for code, league_id in league_ids.items():
+        c.execute(f'INSERT INTO leagues (id, code) VALUES ({ph}, {ph}) '
+                  f'ON CONFLICT (id) DO UPDATE SET code = EXCLUDED.code', (league_id, code))
+
+
+def _columns(c, is_postgres: bool, table: str) -> List[str]:
+    """Column names of a table (empty if it doesn't exist)"""
+    if is_postgres:
+        c.execute('SELECT column_name FROM information_schema.columns '
+                  'WHERE table_schema = current_schema() AND table_name = %s', (table,))
+        return [row[0] for row in c.fetchall()]
+
+    c.execute(f'PRAGMA table_info({table})')
+    return [row[1] for row in c.fetchall()]
+
+
+# =============================================================================
+# MIGRATIONS
+# =============================================================================
+
+def _m001_legacy_schema(c, is_postgres: bool, league_ids: Dict[str, int]):
+    """Move the legacy schema aside and bulk-copy its matches"""
+    if 'match_id' not in _columns(c, is_postgres, 'matches'):
+        return
+
+    print("🔧 Migrating legacy schema (match_id / home_score / match_date)...")
+
+    c.execute('ALTER TABLE matches RENAME TO legacy_matches')
+    for table in LEGACY_TABLES:
+        if _columns(c, is_postgres, table) and not _columns(c, is_postgres, f'legacy_{table}'):
+            c.execute(f'ALTER TABLE {table} RENAME TO legacy_{table}')
+
+    c.execute(MATCHES_DDL)
+
+    league_case = ' '.join(f"WHEN '{code}' THEN {league_id}" for code, league_id in league_ids.items())
+    league_id_sql = f'CASE m.league_code {league_case} END' if league_case else 'NULL'
+    has_teams = bool(_columns(c, is_postgres, 'legacy_teams'))
+    home_name = 'ht.name' if has_teams else 'NULL'
+    away_name = 'at.name' if has_teams else 'NULL'
+    joins = ('LEFT JOIN legacy_teams ht ON ht.team_id = m.home_team_id '
+             'LEFT JOIN legacy_teams at ON at.team_id = m.away_team_id') if has_teams else ''
+
+    c.execute(f'''
+        INSERT INTO matches (id, league_code, league_id, date, home_team, away_team,
+                             home_team_id, away_team_id, home_goals, away_goals,
+                             btts, total_goals, fetched_at)
+        SELECT m.match_id, m.league_code, {league_id_sql}, SUBSTR(CAST(m.match_date AS TEXT), 1, 10),
+               {home_name}, {away_name}, m.home_team_id, m.away_team_id,
+               m.home_score, m.away_score,
+               CASE WHEN m.home_score > 0 AND m.away_score > 0 THEN 1 ELSE 0 END,
+               m.home_score + m.away_score,
+               CAST(m.last_updated AS TEXT)
+        FROM legacy_matches m
+        {joins}
+        WHERE m.home_score IS NOT NULL AND m.away_score IS NOT NULL
+    ''')
+    print(f"   ✅ {c.rowcount} legacy matches copied")
+
+
+def _m002_base_schema(c, is_postgres: bool, league_ids: Dict[str, int]):
+    """matches, sync_state, team_aggregates (idempotent for pre-migration DBs)"""
+    c.execute(MATCHES_DDL)
+
+    # Ältere DBs ohne season-Spalte
+    if 'season' not in _columns(c, is_postgres, 'matches'):
+        c.execute('ALTER TABLE matches ADD COLUMN season INTEGER')
+
+    # Delta-Sync Watermarks (letztes gesynctes Spieldatum pro Liga/Saison)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS sync_state (
+            league_code TEXT,
+            season INTEGER,
+            last_fixture_date TEXT,
+            last_synced_at TEXT,
+            PRIMARY KEY (league_code, season)
+        )
+    ''')
+
+    # Laufende Summen pro Team/Liga/Saison/Venue ('home' / 'away')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS team_aggregates (
+            team_id INTEGER,
+            league_code TEXT,
+            season INTEGER,
+            venue TEXT,
+            matches INTEGER DEFAULT 0,
+            goals_for INTEGER DEFAULT 0,
+            goals_against INTEGER DEFAULT 0,
+            btts_count INTEGER DEFAULT 0,
+            clean_sheets INTEGER DEFAULT 0,
+            failed_to_score INTEGER DEFAULT 0,
+            PRIMARY KEY (team_id, league_code, season, venue)
+        )
+    ''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_team_agg_league ON team_aggregates(league_code)')
+
+
+def _m003_covering_indexes(c, is_postgres: bool, league_ids: Dict[str, int]):
+    """Covering indexes for form, H2H and sync watermark lookups"""
+    lo, hi = h2h_key_sql(is_postgres)
+
+    # Form: letzte N Spiele pro Team + Liga, Ergebnis-Spalten im Index
+    c.execute('CREATE INDEX IF NOT EXISTS idx_matches_home_form ON matches '
+              '(home_team_id, league_code, date DESC, home_goals, away_goals, btts)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_matches_away_form ON matches '
+              '(away_team_id, league_code, date DESC, home_goals, away_goals, btts)')
+
+    # H2H: Paar unabhängig von Heim/Auswärts
+    c.execute(f'CREATE INDEX IF NOT EXISTS idx_matches_h2h ON matches '
+              f'(({lo}), ({hi}), date DESC, home_goals, away_goals, btts, home_team_id)'
+              if is_postgres else
+              f'CREATE INDEX IF NOT EXISTS idx_matches_h2h ON matches '
+              f'({lo}, {hi}, date DESC, home_goals, away_goals, btts, home_team_id)')
+
+    # Watermark: MAX(date) pro Liga
+    c.execute('CREATE INDEX IF NOT EXISTS idx_matches_league_date ON matches (league_code, date)')
+
+    # Durch die Covering-Indexes abgedeckt
+    for index in ('idx_league', 'idx_home_team', 'idx_away_team', 'idx_home_form', 'idx_away_form'):
+        c.execute(f'DROP INDEX IF EXISTS {index}')
+
+
+def _m004_fetched_at_index(c, is_postgres: bool, league_ids: Dict[str, int]):
+    """Index for the incremental mirror sync (WHERE fetched_at >= watermark)"""
+    c.execute('CREATE INDEX IF NOT EXISTS idx_matches_fetched_at ON matches (fetched_at)')
+
+
+def _m005_compact_types(c, is_postgres: bool, league_ids: Dict[str, int]):
+    """Integer dates/timestamps, league_id instead of codes, teams + leagues dimensions"""
+    # Legacy teams-Tabelle ohne Migration 1 (andere Spalten) aus dem Weg räumen
+    team_columns = _columns(c, is_postgres, 'teams')
+    if team_columns and 'id' not in team_columns and not _columns(c, is_postgres, 'legacy_teams'):
+        c.execute('ALTER TABLE teams RENAME TO legacy_teams')
+
+    c.execute('CREATE TABLE IF NOT EXISTS teams (id INTEGER PRIMARY KEY, name TEXT)')
+    c.execute('CREATE TABLE IF NOT EXISTS leagues (id INTEGER PRIMARY KEY, code TEXT)')
+    upsert_leagues(c, is_postgres, league_ids)
+
+    # Team-Namen (neuester Name pro ID) in die Dimension
+    c.execute('''
+        INSERT INTO teams (id, name)
+        SELECT team_id, MAX(name) FROM (
+            SELECT home_team_id AS team_id, home_team AS name FROM matches
+            UNION ALL
+            SELECT away_team_id, away_team FROM matches
+        ) AS names
+        WHERE team_id IS NOT NULL AND name IS NOT NULL
+        GROUP BY team_id
+        ON CONFLICT (id) DO NOTHING
+    ''')
+
+    day = 'SUBSTR(date, 1, 10)'
+    if is_postgres:
+        day_sql = f"(CAST({day} AS DATE) - DATE '1970-01-01')"
+        fetched_sql = 'CAST(EXTRACT(EPOCH FROM CAST(SUBSTR(fetched_at, 1, 19) AS TIMESTAMP)) AS BIGINT)'
+    else:
+        day_sql = f'CAST(julianday({day}) - 2440587.5 AS INTEGER)'
+        fetched_sql = "CAST(strftime('%s', SUBSTR(fetched_at, 1, 19)) AS INTEGER)"
+    league_case = ' '.join(f"WHEN '{code}' THEN {league_id}" for code, league_id in league_ids.items())
+    league_id_sql = f'COALESCE(league_id, CASE league_code {league_case} END)' if league_case else 'league_id'
+    # Saison aus dem Datum für Zeilen ohne season (Saisonstart Juli)
+    season_sql = ('COALESCE(season, CAST(SUBSTR(date, 1, 4) AS INTEGER) - '
+                  'CASE WHEN CAST(SUBSTR(date, 6, 2) AS INTEGER) < 7 THEN 1 ELSE 0 END)')
+
+    c.execute(MATCHES_V5_DDL.format(table='matches_v5'))
+    c.execute(f'''
+        INSERT INTO matches_v5 ({', '.join(MATCH_COLUMNS)})
+        SELECT id, {league_id_sql}, {season_sql}, {day_sql}, home_team_id, away_team_id,
+               home_goals, away_goals, btts, {fetched_sql}
+        FROM matches
+        WHERE date IS NOT NULL
+    ''')
+    print(f"   ✅ {c.rowcount} matches converted to compact types")
+
+    c.execute('DROP TABLE matches')
+    c.execute('ALTER TABLE matches_v5 RENAME TO matches')
+
+    c.execute('CREATE INDEX IF NOT EXISTS idx_matches_home_form ON matches '
+              '(home_team_id, league_id, date DESC, home_goals, away_goals, btts)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_matches_away_form ON matches '
+              '(away_team_id, league_id, date DESC, home_goals, away_goals, btts)')
+    lo, hi = h2h_key_sql(is_postgres)
+    c.execute(f'CREATE INDEX IF NOT EXISTS idx_matches_h2h ON matches '
+              f'(({lo}), ({hi}), date DESC, home_goals, away_goals, btts, home_team_id)'
+              if is_postgres else
+              f'CREATE INDEX IF NOT EXISTS idx_matches_h2h ON matches '
+              f'({lo}, {hi}, date DESC, home_goals, away_goals, btts, home_team_id)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_matches_league_date ON matches (league_id, date)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_matches_fetched_at ON matches (fetched_at)')
+
+    # Aggregate pro league_id; DataEngine baut die leere Tabelle beim Start neu auf
+    c.execute('DROP TABLE IF EXISTS team_aggregates')
+    c.execute('''
+        CREATE TABLE team_aggregates (
+            team_id INTEGER,
+            league_id INTEGER,
+            season SMALLINT,
+            venue TEXT,
+            matches INTEGER DEFAULT 0,
+            goals_for INTEGER DEFAULT 0,
+            goals_against INTEGER DEFAULT 0,
+            btts_count INTEGER DEFAULT 0,
+            clean_sheets INTEGER DEFAULT 0,
+            failed_to_score INTEGER DEFAULT 0,
+            PRIMARY KEY (team_id, league_id, season, venue)
+        )
+    ''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_team_agg_league ON team_aggregates(league_id)')
+
+
+def _m006_dixon_coles_params(c, is_postgres: bool, league_ids: Dict[str, int]):
+    """Versioned per-league Dixon-Coles fits (one version per fitting run)"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS dc_fits (
+            version INTEGER,
+            league_id INTEGER,
+            fitted_at BIGINT,
+            matches INTEGER,
+            intercept REAL,
+            home_advantage REAL,
+            rho REAL,
+            avg_goals REAL,
+            decay REAL,
+            log_likelihood REAL,
+            PRIMARY KEY (version, league_id)
+        )
+    ''')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS dc_team_params (
+            version INTEGER,
+            league_id INTEGER,
+            team_id INTEGER,
+            attack REAL,
+            defence REAL,
+            PRIMARY KEY (version, league_id, team_id)
+        )
+    ''')
+
+
+def _m007_all_season_aggregates(c, is_postgres: bool, league_ids: Dict[str, int]):
+    """Empty team_aggregates so DataEngine rebuilds it with the ALL_SEASONS rows"""
+    c.execute('DELETE FROM team_aggregates')
+
+
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, 'legacy schema', _m001_legacy_schema),
+    (2, 'base schema', _m002_base_schema),
+    (3, 'covering indexes', _m003_covering_indexes),
+    (4, 'fetched_at index', _m004_fetched_at_index),
+    (5, 'compact types', _m005_compact_types),
+    (6, 'dixon-coles params', _m006_dixon_coles_params),
+    (7, 'all-season aggregates', _m007_all_season_aggregates),
+]
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+def get_schema_version(c) -> int:
+    """Highest applied migration (0 = none)"""
+    c.execute('CREATE TABLE IF NOT EXISTS schema_migrations '
+              '(version INTEGER PRIMARY KEY, description TEXT, applied_at TEXT)')
+    c.execute('SELECT MAX(version) FROM schema_migrations')
+    row = c.fetchone()
+    return (row[0] or 0) if row else 0
+
+
+def run_migrations(db: DatabaseManager, league_ids: Optional[Dict[str, int]] = None) -> int:
+    """
+    Apply all pending migrations, each in its own transaction
+
+    Returns:
+        Schema version after migrating
+    """
+    league_ids = league_ids or {}
+    ph = db.placeholder
+
+    with db.connection() as conn:
+        version = get_schema_version(conn.cursor())
+
+    for target, description, migrate in MIGRATIONS:
+        if target <= version:
+            continue
+
+        with db.connection() as conn:
+            c = conn.cursor()
+            migrate(c, db.is_postgres, league_ids)
+            c.execute(f'INSERT INTO schema_migrations (version, description, applied_at) VALUES ({ph}, {ph}, {ph})',
+                      (target, description, datetime.now().isoformat()))
+        print(f"✅ Schema migration {target}: {description}")
+        version = target
+
+    return version
+
+
+# =============================================================================
+# HOT QUERIES (von DataEngine / MatchMirror ausgeführt und per EXPLAIN geprüft)
+# =============================================================================
+
+# {ph} = Platzhalter, {lo}/{hi} = normalisiertes H2H-Paar (h2h_key_sql)
+HOT_QUERY_SQL = {
+    'form_home': '''
+        SELECT home_goals, away_goals, btts
+        FROM matches
+        WHERE home_team_id = {ph} AND league_id = {ph}
+        ORDER BY date DESC
+        LIMIT {ph}
+    ''',
+    'form_away': '''
+        SELECT away_goals, home_goals, btts
+        FROM matches
+        WHERE away_team_id = {ph} AND league_id = {ph}
+        ORDER BY date DESC
+        LIMIT {ph}
+    ''',
+    # Zwei Index-Scans (home / away) statt OR über beide Spalten
+    'form_all': '''
+        SELECT scored, conceded, btts FROM (
+            SELECT * FROM (
+                SELECT date, home_goals AS scored, away_goals AS conceded, btts
+                FROM matches
+                WHERE home_team_id = {ph} AND league_id = {ph}
+                ORDER BY date DESC
+                LIMIT {ph}
+            ) AS home_games
+            UNION ALL
+            SELECT * FROM (
+                SELECT date, away_goals AS scored, home_goals AS conceded, btts
+                FROM matches
+                WHERE away_team_id = {ph} AND league_id = {ph}
+                ORDER BY date DESC
+                LIMIT {ph}
+            ) AS away_games
+        ) AS recent
+        ORDER BY date DESC
+        LIMIT {ph}
+    ''',
+    # Normalisiertes Paar → ein Index-Lookup (idx_matches_h2h)
+    'h2h': '''
+        SELECT home_goals, away_goals, btts, home_team_id
+        FROM matches
+        WHERE {lo} = {ph} AND {hi} = {ph}
+        ORDER BY date DESC
+        LIMIT {ph}
+    ''',
+    # Ein Primärschlüssel-Read: laufende Summe über alle Saisons
+    'team_stats': '''
+        SELECT matches, goals_for, goals_against, btts_count
+        FROM team_aggregates
+        WHERE team_id = {ph} AND league_id = {ph} AND season = {ph} AND venue = {ph}
+    ''',
+    'league_stats': '''
+        SELECT venue, SUM(matches), SUM(goals_for), SUM(btts_count)
+        FROM team_aggregates
+        WHERE league_id = {ph} AND season = {ph}
+        GROUP BY venue
+    ''',
+    'sync_watermark': 'SELECT MAX(date) FROM matches WHERE league_id = {ph}',
+    'mirror_delta': 'SELECT {match_columns} FROM matches WHERE fetched_at >= {ph}',
+}
+
+
+def hot_query(name: str, is_postgres: bool) -> str:
+    """SQL of one hot-path query for the given backend"""
+    lo, hi = h2h_key_sql(is_postgres)
+    return HOT_QUERY_SQL[name].format(ph='%s' if is_postgres else '?', lo=lo, hi=hi,
+                                      match_columns=', '.join(MATCH_COLUMNS))
+
+
+# =============================================================================
+# QUERY PLAN CHECK
+# =============================================================================
+
+# Beispiel-Parameter für EXPLAIN
+_HOT_QUERY_SAMPLE_PARAMS = {
+    'form_home': (1, 78, 5),
+    'form_away': (1, 78, 5),
+    'form_all': (1, 78, 5, 1, 78, 5, 5),
+    'h2h': (1, 2, 10),
+    'team_stats': (1, 78, ALL_SEASONS, 'all'),
+    'league_stats': (78, ALL_SEASONS),
+    'sync_watermark': (78,),
+    'mirror_delta': (1735689600,),
+}
+
+
+def hot_queries(is_postgres: bool) -> Dict[str, Tuple[str, tuple]]:
+    """The hot-path queries DataEngine / MatchMirror run, with sample parameters"""
+    return {name: (hot_query(name, is_postgres), params)
+            for name, params in _HOT_QUERY_SAMPLE_PARAMS.items()}
+
+
+_SQLITE_FULL_SCAN = re.compile(r'^SCAN (matches|team_aggregates)\b')
+_PG_FULL_SCAN = re.compile(r'Seq Scan on (matches|team_aggregates)\b')
+
+
+def check_query_plans(db: DatabaseManager) -> List[Dict]:
+    """
+    EXPLAIN every hot query and flag full table scans
+
+    Returns:
+        [{'query', 'uses_index', 'plan'}]
+    """
+    results = []
+
+    with db.connection() as conn:
+        c = conn.cursor()
+        if db.is_postgres:
+            # Kleine Tabellen → Planner wählt sonst Seq Scan obwohl ein Index passt
+            c.execute('SET LOCAL enable_seqscan = off')
+
+        for name, (sql, params) in hot_queries(db.is_postgres).items():
+            if db.is_postgres:
+                c.execute(f'EXPLAIN {sql}', params)
+                plan = [row[0] for row in c.fetchall()]
+                full_scan = any(_PG_FULL_SCAN.search(line) for line in plan)
+            else:
+                c.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                plan = [row[-1] for row in c.fetchall()]
+                full_scan = any(_SQLITE_FULL_SCAN.search(line) for line in plan)
+
+            results.append({'query': name, 'uses_index': not full_scan, 'plan': plan})
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Apply schema migrations / check query plans')
+    parser.add_argument('--db', default='btts_data.db', help='SQLite path (ignored with SUPABASE_DB_URL)')
+    parser.add_argument('--check', action='store_true', help='EXPLAIN the hot queries after migrating')
+    args = parser.parse_args()
+
+    from data_engine import DataEngine
+
+    manager = get_db_manager(args.db)
+    print(f"📦 Schema version: {run_migrations(manager, DataEngine.LEAGUES_CONFIG)}")
+
+    if args.check:
+        ok = True
+        for result in check_query_plans(manager):
+            status = '✅' if result['uses_index'] else '❌ FULL SCAN'
+            print(f"{status} {result['query']}")
+            for line in result['plan']:
+                print(f"      {line}")
+            ok = ok and result['uses_index']
+        raise SystemExit(0 if ok else 1)
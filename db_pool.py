@@ -0,0 +1,183 @@
+"""
+DB POOL - Gemeinsamer Connection-Manager für Supabase & SQLite
+===============================================================
+Statt pro Abfrage psycopg2.connect() (TLS + Auth Handshake zu Supabase)
+bzw. sqlite3.connect() wird eine Verbindung wiederverwendet:
+
+- PostgreSQL: ThreadedConnectionPool (psycopg2.pool), Verbindungen werden
+  nach jedem Block zurückgegeben, kaputte Verbindungen verworfen. Sind alle
+  DB_POOL_MAX Verbindungen vergeben, wartet der Aufrufer (bis DB_POOL_TIMEOUT
+  Sekunden) statt sofort PoolError zu bekommen
+- SQLite: eine persistente Verbindung pro Thread mit WAL + Pragmas
+
+Genutzt von DataEngine, advanced_analyzer und btts_pro_app.
+
+Usage:
+    db = get_db_manager("btts_data.db")
+    with db.connection() as conn:
+        c = conn.cursor()
+        c.execute(f"SELECT COUNT(*) FROM matches WHERE league_id = {db.placeholder}", (78,))
+
+Der Block committet bei Erfolg und macht bei Exceptions ein Rollback.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+POOL_MIN_CONNECTIONS = 1
+POOL_MAX_CONNECTIONS = int(os.environ.get('DB_POOL_MAX', '8'))
+POOL_WAIT_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', '30'))
+
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-20000',      # ~20 MB Page-Cache
+    'PRAGMA mmap_size=268435456',    # 256 MB memory-mapped I/O
+    'PRAGMA busy_timeout=5000',
+)
+
+
+def get_supabase_url() -> Optional[str]:
+    """SUPABASE_DB_URL from Streamlit secrets or environment"""
+    try:
+        import streamlit as st
+        if hasattr(st, 'secrets') and 'SUPABASE_DB_URL' in st.secrets:
+            return st.secrets['SUPABASE_DB_URL']
+    except Exception:
+        pass
+
+    return os.environ.get('SUPABASE_DB_URL')
+
+
+class DatabaseManager:
+    """
+    Pooled connections for PostgreSQL (Supabase) with SQLite fallback
+
+    Args:
+        db_path: SQLite file (used when no Postgres URL / psycopg2 / connection)
+        supabase_url: PostgreSQL connection URL
+    """
+
+    def __init__(self, db_path: str = "btts_data.db", supabase_url: Optional[str] = None):
+        self.db_path = db_path
+        self.supabase_url = supabase_url
+        self._pool = None
+        self._slots = threading.BoundedSemaphore(POOL_MAX_CONNECTIONS)
+        self._local = threading.local()
+
+        if supabase_url:
+            try:
+                from psycopg2.pool import ThreadedConnectionPool
+                self._pool = ThreadedConnectionPool(POOL_MIN_CONNECTIONS, POOL_MAX_CONNECTIONS, supabase_url)
+            except ImportError:
+                print("⚠️ psycopg2 not installed - using SQLite")
+            except Exception as e:
+                print(f"⚠️ PostgreSQL pool error: {e} - using SQLite")
+
+    @property
+    def is_postgres(self) -> bool:
+        return self._pool is not None
+
+    @property
+    def placeholder(self) -> str:
+        """SQL placeholder (? for SQLite, %s for PostgreSQL)"""
+        return "%s" if self.is_postgres else "?"
+
+    def _sqlite_connection(self) -> sqlite3.Connection:
+        """Persistent per-thread SQLite connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            for pragma in SQLITE_PRAGMAS:
+                try:
+                    conn.execute(pragma)
+                except sqlite3.DatabaseError:
+                    pass
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection for one unit of work
+
+        Commits on success, rolls back on error. Postgres connections go
+        back to the pool (closed ones are discarded), SQLite stays open.
+        """
+        if not self.is_postgres:
+            conn = self._sqlite_connection()
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            return
+
+        # getconn() wirft PoolError statt zu warten, wenn der Pool leer ist
+        if not self._slots.acquire(timeout=POOL_WAIT_TIMEOUT):
+            raise TimeoutError(f"No free PostgreSQL connection after {POOL_WAIT_TIMEOUT:.0f}s "
+                               f"(DB_POOL_MAX={POOL_MAX_CONNECTIONS})")
+        try:
+            conn = self._pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+
+        broken = False
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+            raise
+        finally:
+            try:
+                self._pool.putconn(conn, close=broken or bool(conn.closed))
+            finally:
+                self._slots.release()
+
+    def close(self):
+        """Close the pool / this thread's SQLite connection"""
+        if self._pool is not None:
+            self._pool.closeall()
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+# =============================================================================
+# PROCESS-WIDE REGISTRY (one manager per database)
+# =============================================================================
+
+_managers: Dict[Tuple[Optional[str], str], DatabaseManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_db_manager(db_path: str = "btts_data.db", supabase_url: Optional[str] = None) -> DatabaseManager:
+    """
+    Get the shared DatabaseManager
+
+    Args:
+        db_path: SQLite fallback file
+        supabase_url: Postgres URL (None = Streamlit secrets / environment)
+    """
+    if supabase_url is None:
+        supabase_url = get_supabase_url()
+    supabase_url = supabase_url or None  # '' = SQLite erzwingen
+
+    key = (supabase_url, os.path.abspath(db_path))
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = DatabaseManager(db_path, supabase_url)
+            _managers[key] = manager
+        return manager
@@ -0,0 +1,395 @@
+"""
+DIXON-COLES FIT - Liga-Parameter per Maximum Likelihood
+========================================================
+ρ war an drei Stellen fest verdrahtet (DixonColesModel, dixon_coles_adjustment,
+unified_dixon_coles_adjustment), Heimvorteil und Torschnitt kamen aus
+statischen Dicts. Dieser Job schätzt pro Liga aus der matches-Tabelle:
+
+    log λ_home = intercept + home + attack[home] - defence[away]
+    log λ_away = intercept +        attack[away] - defence[home]
+    P(x, y)    = τ(x, y, λh, λa, ρ) · Poisson(x; λh) · Poisson(y; λa)
+
+- vektorisierte Log-Likelihood mit analytischem Gradienten (L-BFGS-B)
+- Zeitgewichtung w = exp(-decay · Alter in Tagen) (Dixon & Coles 1997)
+- Warm-Start aus dem letzten Fit (neue Teams starten bei 0)
+- Ergebnisse versioniert in dc_fits / dc_team_params (eine Version pro Lauf,
+  die letzten KEEP_VERSIONS bleiben erhalten)
+- DataEngine lädt beim Start den neuesten Fit pro Liga, Konsumenten fragen
+  get_league_params() / league_rho() / league_home_away_factors() und fallen ohne Fit auf die Defaults zurück
+
+Nächtlicher Refit aller Ligen:
+    python dixon_coles_fit.py --db btts_data.db
+"""
+
+import argparse
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    from scipy.optimize import minimize
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+from db_migrations import epoch_day
+from db_pool import DatabaseManager, get_db_manager
+from scoreline_engine import DEFAULT_RHO
+
+# ξ pro Tag: Halbwertszeit ~1 Jahr
+DECAY = 0.0019
+# Nur Spiele der letzten 3 Jahre (Gewicht danach < 13%)
+MAX_AGE_DAYS = 3 * 365
+MIN_MATCHES = 30
+KEEP_VERSIONS = 14
+
+# L2 auf attack/defence (Teams mit wenigen Spielen) und Summe-Null-Bedingung
+RIDGE = 0.01
+RHO_BOUNDS = (-0.3, 0.3)
+
+
+@dataclass
+class LeagueParams:
+    """Fitted Dixon-Coles parameters of one league"""
+    league_id: int
+    version: int
+    fitted_at: int
+    matches: int
+    intercept: float
+    home_advantage: float  # log scale
+    rho: float
+    avg_goals: float
+    decay: float
+    log_likelihood: float
+    attack: Dict[int, float] = field(default_factory=dict)
+    defence: Dict[int, float] = field(default_factory=dict)
+
+    @property
+    def home_multiplier(self) -> float:
+        """λ_home / λ_away for two average teams"""
+        return float(np.exp(self.home_advantage))
+
+    @property
+    def home_away_factors(self) -> Tuple[float, float]:
+        """(home, away) λ multipliers, split evenly so home / away = home_multiplier"""
+        half = self.home_advantage / 2
+        return float(np.exp(half)), float(np.exp(-half))
+
+    def expected_goals(self, home_team_id: int, away_team_id: int) -> Tuple[float, float]:
+        """(λ_home, λ_away) from the fitted strengths (unknown teams = league average)"""
+        home_attack, home_defence = self.attack.get(home_team_id, 0.0), self.defence.get(home_team_id, 0.0)
+        away_attack, away_defence = self.attack.get(away_team_id, 0.0), self.defence.get(away_team_id, 0.0)
+        return (float(np.exp(self.intercept + self.home_advantage + home_attack - away_defence)),
+                float(np.exp(self.intercept + away_attack - home_defence)))
+
+
+# =============================================================================
+# LIKELIHOOD
+# =============================================================================
+
+def neg_log_likelihood(theta: np.ndarray, home_idx: np.ndarray, away_idx: np.ndarray,
+                       home_goals: np.ndarray, away_goals: np.ndarray,
+                       weights: np.ndarray) -> Tuple[float, np.ndarray]:
+    """
+    Weighted Dixon-Coles negative log-likelihood and its gradient
+
+    theta = [intercept, home, rho, attack (n teams), defence (n teams)]
+    Normalized by the total weight, plus ridge and sum-to-zero penalties.
+    """
+    n_teams = (len(theta) - 3) // 2
+    intercept, home, rho = theta[0], theta[1], theta[2]
+    attack, defence = theta[3:3 + n_teams], theta[3 + n_teams:]
+
+    eta_home = intercept + home + attack[home_idx] - defence[away_idx]
+    eta_away = intercept + attack[away_idx] - defence[home_idx]
+    lam_home, lam_away = np.exp(eta_home), np.exp(eta_away)
+
+    # Poisson (log k! ist konstant)
+    ll = home_goals * eta_home - lam_home + away_goals * eta_away - lam_away
+    d_home = home_goals - lam_home
+    d_away = away_goals - lam_away
+
+    # τ für 0-0, 0-1, 1-0, 1-1 und dessen Ableitungen nach η_home, η_away, ρ
+    m00 = (home_goals == 0) & (away_goals == 0)
+    m01 = (home_goals == 0) & (away_goals == 1)
+    m10 = (home_goals == 1) & (away_goals == 0)
+    m11 = (home_goals == 1) & (away_goals == 1)
+    lam_prod = lam_home * lam_away
+    tau = np.select([m00, m01, m10, m11],
+                    [1 - lam_prod * rho, 1 + lam_home * rho, 1 + lam_away * rho, np.full_like(lam_home, 1 - rho)],
+                    1.0)
+    tau = np.maximum(tau, 1e-10)
+    ll = ll + np.log(tau)
+
+    d_home = d_home + np.select([m00, m01], [-lam_prod * rho, lam_home * rho], 0.0) / tau
+    d_away = d_away + np.select([m00, m10], [-lam_prod * rho, lam_away * rho], 0.0) / tau
+    d_rho = np.select([m00, m01, m10, m11], [-lam_prod, lam_home, lam_away, np.full_like(lam_home, -1.0)], 0.0) / tau
+
+    total_weight = weights.sum()
+    w_home, w_away = weights * d_home, weights * d_away
+
+    grad = np.empty_like(theta)
+    grad[0] = (w_home.sum() + w_away.sum())
+    grad[1] = w_home.sum()
+    grad[2] = (weights * d_rho).sum()
+    grad[3:3 + n_teams] = (np.bincount(home_idx, w_home, n_teams) + np.bincount(away_idx, w_away, n_teams))
+    grad[3 + n_teams:] = -(np.bincount(away_idx, w_home, n_teams) + np.bincount(home_idx, w_away, n_teams))
+
+    value = -(weights * ll).sum() / total_weight
+    grad = -grad / total_weight
+
+    # Regularisierung: Ridge + Summe-Null (Identifizierbarkeit)
+    value += RIDGE * (attack @ attack + defence @ defence) + attack.sum() ** 2 + defence.sum() ** 2
+    grad[3:3 + n_teams] += 2 * RIDGE * attack + 2 * attack.sum()
+    grad[3 + n_teams:] += 2 * RIDGE * defence + 2 * defence.sum()
+
+    return float(value), grad
+
+
+def fit_league(league_id: int, team_ids: np.ndarray, home_idx: np.ndarray, away_idx: np.ndarray,
+               home_goals: np.ndarray, away_goals: np.ndarray, weights: np.ndarray,
+               previous: Optional[LeagueParams] = None, decay: float = DECAY) -> LeagueParams:
+    """
+    Maximum-likelihood fit of one league
+
+    Args:
+        team_ids: Team id per index used in home_idx / away_idx
+        previous: Last fit (warm start)
+
+    Raises:
+        ValueError: Optimizer did not converge or returned non-finite values
+    """
+    n_teams = len(team_ids)
+    theta = np.zeros(3 + 2 * n_teams)
+
+    if previous is not None:
+        theta[0], theta[1], theta[2] = previous.intercept, previous.home_advantage, previous.rho
+        theta[3:3 + n_teams] = [previous.attack.get(int(t), 0.0) for t in team_ids]
+        theta[3 + n_teams:] = [previous.defence.get(int(t), 0.0) for t in team_ids]
+    else:
+        mean_home = max(np.average(home_goals, weights=weights), 0.1)
+        mean_away = max(np.average(away_goals, weights=weights), 0.1)
+        theta[0] = np.log(mean_away)
+        theta[1] = np.log(mean_home / mean_away)
+
+    bounds = [(None, None), (None, None), RHO_BOUNDS] + [(None, None)] * (2 * n_teams)
+    result = minimize(neg_log_likelihood, theta, jac=True, method='L-BFGS-B', bounds=bounds,
+                      args=(home_idx, away_idx, home_goals, away_goals, weights))
+    if not result.success:
+        raise ValueError(f"not converged: {result.message}")
+    if not (np.all(np.isfinite(result.x)) and np.isfinite(result.fun)):
+        raise ValueError("non-finite parameters")
+    theta = result.x
+
+    # Exakt zentrieren (λ bleibt gleich)
+    attack, defence = theta[3:3 + n_teams], theta[3 + n_teams:]
+    intercept = theta[0] + attack.mean() - defence.mean()
+    attack, defence = attack - attack.mean(), defence - defence.mean()
+
+    return LeagueParams(
+        league_id=int(league_id),
+        version=0,
+        fitted_at=int(time.time()),
+        matches=len(home_goals),
+        intercept=float(intercept),
+        home_advantage=float(theta[1]),
+        rho=float(theta[2]),
+        avg_goals=float(np.average(home_goals + away_goals, weights=weights)),
+        decay=decay,
+        log_likelihood=float(-result.fun),
+        attack={int(t): float(a) for t, a in zip(team_ids, attack)},
+        defence={int(t): float(d) for t, d in zip(team_ids, defence)},
+    )
+
+
+# =============================================================================
+# STORAGE (versioned parameter table)
+# =============================================================================
+
+def load_params(db: DatabaseManager) -> Dict[int, LeagueParams]:
+    """Newest fit per league"""
+    params: Dict[int, LeagueParams] = {}
+    with db.connection() as conn:
+        c = conn.cursor()
+        c.execute('''
+            SELECT version, league_id, fitted_at, matches, intercept, home_advantage,
+                   rho, avg_goals, decay, log_likelihood
+            FROM dc_fits f
+            WHERE version = (SELECT MAX(version) FROM dc_fits l WHERE l.league_id = f.league_id)
+        ''')
+        for row in c.fetchall():
+            params[row[1]] = LeagueParams(row[1], row[0], row[2], row[3], row[4], row[5],
+                                          row[6], row[7], row[8], row[9])
+
+        c.execute('''
+            SELECT t.league_id, t.team_id, t.attack, t.defence
+            FROM dc_team_params t
+            WHERE t.version = (SELECT MAX(version) FROM dc_fits l WHERE l.league_id = t.league_id)
+        ''')
+        for league_id, team_id, attack, defence in c.fetchall():
+            params[league_id].attack[team_id] = attack
+            params[league_id].defence[team_id] = defence
+    return params
+
+
+def save_params(db: DatabaseManager, fits: Dict[int, LeagueParams]) -> int:
+    """Store one fitting run as a new version, returns the version"""
+    ph = db.placeholder
+    with db.connection() as conn:
+        c = conn.cursor()
+        c.execute('SELECT MAX(version) FROM dc_fits')
+        version = (c.fetchone()[0] or 0) + 1
+
+        for fit in fits.values():
+            fit.version = version
+        c.executemany(f'INSERT INTO dc_fits (version, league_id, fitted_at, matches, intercept, home_advantage, '
+                      f'rho, avg_goals, decay, log_likelihood) VALUES ({", ".join([ph] * 10)})',
+                      [(version, f.league_id, f.fitted_at, f.matches, f.intercept, f.home_advantage,
+                        f.rho, f.avg_goals, f.decay, f.log_likelihood) for f in fits.values()])
+        c.executemany(f'INSERT INTO dc_team_params (version, league_id, team_id, attack, defence) '
+                      f'VALUES ({ph}, {ph}, {ph}, {ph}, {ph})',
+                      [(version, f.league_id, team_id, f.attack[team_id], f.defence[team_id])
+                       for f in fits.values() for team_id in f.attack])
+
+        # Alte Versionen aufräumen
+        c.execute(f'DELETE FROM dc_fits WHERE version <= {ph}', (version - KEEP_VERSIONS,))
+        c.execute(f'DELETE FROM dc_team_params WHERE version <= {ph}', (version - KEEP_VERSIONS,))
+    return version
+
+
+# =============================================================================
+# FITTING JOB
+# =============================================================================
+
+def fit_all_leagues(db: DatabaseManager, decay: float = DECAY,
+                    today: Optional[date] = None) -> Dict[int, LeagueParams]:
+    """
+    Refit every league with enough finished matches and store a new version
+
+    Leagues whose fit fails (no convergence, non-finite values) keep their
+    previous parameters, copied into the new version.
+
+    Returns:
+        {league_id: LeagueParams} of this run
+    """
+    if not SCIPY_AVAILABLE:
+        print("⚠️ scipy not installed - Dixon-Coles fit skipped")
+        return {}
+
+    start = time.time()
+    today_day = epoch_day(today or date.today())
+
+    with db.connection() as conn:
+        c = conn.cursor()
+        c.execute(f'''
+            SELECT league_id, date, home_team_id, away_team_id, home_goals, away_goals
+            FROM matches
+            WHERE date >= {db.placeholder} AND league_id IS NOT NULL
+              AND home_team_id IS NOT NULL AND away_team_id IS NOT NULL
+              AND home_goals IS NOT NULL AND away_goals IS NOT NULL
+        ''', (today_day - MAX_AGE_DAYS,))
+        rows = c.fetchall()
+
+    try:
+        previous = load_params(db)
+    except Exception as e:
+        print(f"⚠️ No previous Dixon-Coles fit for warm start: {e}")
+        previous = {}
+
+    if not rows:
+        return {}
+
+    data = np.array(rows, dtype=np.int64)
+    fits: Dict[int, LeagueParams] = {}
+
+    for league_id in np.unique(data[:, 0]):
+        league = data[data[:, 0] == league_id]
+        if len(league) < MIN_MATCHES:
+            continue
+
+        team_ids, idx = np.unique(league[:, 2:4], return_inverse=True)
+        idx = idx.reshape(-1, 2)
+        weights = np.exp(-decay * np.maximum(today_day - league[:, 1], 0))
+
+        last = previous.get(int(league_id))
+        try:
+            fits[int(league_id)] = fit_league(league_id, team_ids, idx[:, 0], idx[:, 1],
+                                              league[:, 4].astype(float), league[:, 5].astype(float),
+                                              weights, last, decay)
+        except Exception as e:
+            # Letzten guten Fit übernehmen, damit er nicht als "neueste Version"
+            # ersetzt oder beim Aufräumen gelöscht wird
+            print(f"⚠️ Dixon-Coles fit failed for league {league_id}: {e}"
+                  + (f" - keeping v{last.version}" if last is not None else ""))
+            if last is not None:
+                fits[int(league_id)] = replace(last, attack=dict(last.attack), defence=dict(last.defence))
+
+    if fits:
+        version = save_params(db, fits)
+        print(f"📐 Dixon-Coles fit v{version}: {len(fits)} leagues, {len(data)} matches "
+              f"({time.time() - start:.1f}s)")
+    return fits
+
+
+# =============================================================================
+# PROCESS-WIDE PARAMETERS (loaded at startup)
+# =============================================================================
+
+_league_params: Dict[int, LeagueParams] = {}
+_params_lock = threading.Lock()
+
+
+def load_league_params(db: DatabaseManager) -> Dict[int, LeagueParams]:
+    """Load the newest fits into the process-wide cache"""
+    try:
+        params = load_params(db)
+    except Exception as e:
+        print(f"⚠️ Dixon-Coles params not loaded: {e}")
+        return {}
+
+    with _params_lock:
+        _league_params.clear()
+        _league_params.update(params)
+    if params:
+        print(f"📐 Dixon-Coles params loaded for {len(params)} leagues")
+    return params
+
+
+def get_league_params(league_id: Optional[int]) -> Optional[LeagueParams]:
+    """Fitted parameters of a league (None = not fitted / not loaded)"""
+    with _params_lock:
+        return _league_params.get(league_id)
+
+
+def league_rho(league_id: Optional[int], default: float = DEFAULT_RHO) -> float:
+    """Fitted ρ of a league, default if not fitted"""
+    params = get_league_params(league_id)
+    return params.rho if params is not None else default
+
+
+def league_home_away_factors(league_id: Optional[int],
+                             default: Tuple[float, float] = (1.0, 1.0)) -> Tuple[float, float]:
+    """Fitted (home, away) λ multipliers of a league, default if not fitted"""
+    params = get_league_params(league_id)
+    return params.home_away_factors if params is not None else default
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Refit per-league Dixon-Coles parameters')
+    parser.add_argument('--db', default='btts_data.db', help='SQLite path (ignored with SUPABASE_DB_URL)')
+    parser.add_argument('--decay', type=float, default=DECAY, help='Time decay per day')
+    args = parser.parse_args()
+
+    from data_engine import DataEngine
+    from db_migrations import run_migrations
+
+    manager = get_db_manager(args.db)
+    run_migrations(manager, DataEngine.LEAGUES_CONFIG)
+
+    for league_id, fit in sorted(fit_all_leagues(manager, args.decay).items()):
+        print(f"   {league_id:>4}: home x{fit.home_multiplier:.2f}  rho {fit.rho:+.3f}  "
+              f"goals {fit.avg_goals:.2f}  ({fit.matches} matches)")
@@ -0,0 +1,105 @@
+"""
+FIXTURE CALENDAR - Alle Spiele eines Tages mit einem API-Call
+==============================================================
+Statt fixtures?league=&season=&from=&to= pro Liga (28 Calls für "Alle Ligen")
+wird fixtures?date=YYYY-MM-DD (alle Wettbewerbe) einmal pro Tag geholt
+und lokal nach Liga gefiltert.
+
+"Alle Ligen" über 7 Tage = 7 Calls statt 28.
+Alle Tabs nutzen damit dieselbe Fixture-Quelle.
+
+Cache:
+- In-Memory pro Tag (CALENDAR_TTL / TODAY_TTL)
+- Zusätzlich persistenter Response-Cache (api_cache.py)
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta, date as date_type
+from typing import Dict, Iterable, List, Optional, Union
+
+# Heute ändern sich Status/Anstoßzeiten öfter als an künftigen Tagen
+TODAY_TTL = 30 * 60
+CALENDAR_TTL = 6 * 3600
+
+
+class FixtureCalendar:
+    """
+    Day-based fixture source on top of the shared APIFootball client
+
+    Every APIFootball client owns one (api.calendar).
+
+    Usage:
+        fixtures = api.calendar.get_upcoming([78, 39], days_ahead=7)
+    """
+
+    def __init__(self, api_football):
+        self.api = api_football
+        self._days: Dict[str, tuple] = {}  # 'YYYY-MM-DD' → (fetched_at, fixtures)
+        self._lock = threading.Lock()
+
+    def get_fixtures(self, day: Union[str, date_type, datetime]) -> List[Dict]:
+        """
+        Get ALL fixtures (all competitions, any status) of one day
+
+        Args:
+            day: Date as 'YYYY-MM-DD', date or datetime
+
+        Returns:
+            Raw API-Football fixture objects
+        """
+        day_str = day if isinstance(day, str) else day.strftime('%Y-%m-%d')
+        ttl = TODAY_TTL if day_str <= datetime.now().strftime('%Y-%m-%d') else CALENDAR_TTL
+
+        with self._lock:
+            cached = self._days.get(day_str)
+        if cached and time.time() - cached[0] < ttl:
+            return cached[1]
+
+        try:
+            response = self.api.get('fixtures', params={'date': day_str}, timeout=30, ttl=ttl)
+
+            if response.status_code != 200:
+                print(f"   ❌ API error {response.status_code} for fixtures on {day_str}")
+                return cached[1] if cached else []
+
+            fixtures = response.json().get('response', [])
+        except Exception as e:
+            print(f"   ❌ Error fetching fixtures for {day_str}: {e}")
+            return cached[1] if cached else []
+
+        with self._lock:
+            self._days[day_str] = (time.time(), fixtures)
+
+        return fixtures
+
+    def get_fixtures_for_leagues(self, day: Union[str, date_type, datetime],
+                                 league_ids: Iterable[int]) -> List[Dict]:
+        """All fixtures of one day in the given leagues"""
+        wanted = set(league_ids)
+        return [f for f in self.get_fixtures(day) if f.get('league', {}).get('id') in wanted]
+
+    def get_upcoming(self, league_ids: Iterable[int], days_ahead: int = 7,
+                     status: Optional[str] = 'NS') -> List[Dict]:
+        """
+        Upcoming fixtures of the given leagues from today to today + days_ahead
+
+        Args:
+            league_ids: API-Football league IDs
+            days_ahead: Number of days ahead (inclusive, like from/to)
+            status: Only fixtures with this status.short (None = all)
+        """
+        wanted = set(league_ids)
+        today = datetime.now()
+
+        result = []
+        for offset in range(days_ahead + 1):
+            for fixture in self.get_fixtures(today + timedelta(days=offset)):
+                if fixture.get('league', {}).get('id') not in wanted:
+                    continue
+                if status and fixture.get('fixture', {}).get('status', {}).get('short') != status:
+                    continue
+                result.append(fixture)
+
+        return result
+
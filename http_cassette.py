@@ -0,0 +1,199 @@
+"""
+HTTP CASSETTE - Record/Replay für API-Football & Odds API
+==========================================================
+Transport-Adapter auf der gemeinsamen requests.Session (api_football.get_http_session).
+Damit lassen sich analyze_upcoming_matches, UltraLiveScanner, HighestProbabilityFinder
+und RedCardBotEnhanced.monitor_loop offline und reproduzierbar benchmarken.
+
+Modi (Environment):
+- HTTP_CASSETTE_MODE=record   → echte Requests, jede Antwort wird angehängt
+- HTTP_CASSETTE_MODE=replay   → keine Netzwerkzugriffe, Antworten aus der Cassette
+- HTTP_CASSETTE_PATH          → Cassette-Datei (JSON Lines, default: http_cassette.jsonl)
+- HTTP_CASSETTE_LATENCY       → Replay-Latenz: 'recorded' (aufgezeichnete Dauer)
+                                oder Millisekunden (default: 0)
+
+Matching: Methode + URL mit sortierten Query-Params (API-Keys entfernt).
+Gleiche Requests werden in Aufnahme-Reihenfolge abgespielt (Live-Polling!),
+danach wird die letzte Antwort wiederholt.
+
+Tipp: Für Cold-Cache-Messungen zusätzlich API_CACHE_DISABLED=1 setzen,
+sonst beantwortet der Response-Cache Requests bevor sie den Adapter erreichen.
+"""
+
+import base64
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Dict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Query-Params die nie in die Cassette dürfen
+SECRET_PARAMS = {'apikey', 'api_key', 'key', 'token'}
+
+# Telegram Bot-Token steckt im Pfad (/bot<token>/sendMessage)
+_TELEGRAM_TOKEN_PATH = re.compile(r'/bot[^/]+/')
+
+
+def normalize_url(url: str) -> str:
+    """URL with sorted query params and secrets removed"""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if k.lower() not in SECRET_PARAMS)
+    path = _TELEGRAM_TOKEN_PATH.sub('/bot***/', parts.path)
+    return urlunsplit((parts.scheme, parts.netloc, path, urlencode(query), ''))
+
+
+def _interaction_key(method: str, url: str) -> str:
+    return f"{method.upper()} {normalize_url(url)}"
+
+
+class CassetteAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that records to / replays from a JSON Lines cassette
+
+    Args:
+        mode: 'record' or 'replay'
+        path: Cassette file
+        latency: Replay latency - 'recorded' or milliseconds
+    """
+
+    def __init__(self, mode: str, path: str, latency: str = '0', **kwargs):
+        super().__init__(**kwargs)
+        self.mode = mode
+        self.path = path
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._interactions: Dict[str, deque] = defaultdict(deque)
+        self._last: Dict[str, dict] = {}
+
+        self.recorded = 0
+        self.replayed = 0
+        self.missed = 0
+
+        if mode == 'replay':
+            self._load()
+
+    def _load(self):
+        """Load all interactions of the cassette"""
+        if not os.path.exists(self.path):
+            print(f"⚠️ Cassette not found: {self.path}")
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    interaction = json.loads(line)
+                except ValueError:
+                    continue
+                self._interactions[interaction['key']].append(interaction)
+
+        total = sum(len(q) for q in self._interactions.values())
+        print(f"📼 Cassette loaded: {total} interactions from {self.path}")
+
+    def send(self, request, **kwargs):
+        key = _interaction_key(request.method, request.url)
+
+        if self.mode == 'replay':
+            return self._replay(key, request)
+
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        elapsed = time.perf_counter() - start
+        self._record(key, response, elapsed)
+        return response
+
+    def _record(self, key: str, response, elapsed: float):
+        """Append one interaction to the cassette"""
+        interaction = {
+            'key': key,
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': dict(response.headers),
+            'body': base64.b64encode(response.content).decode('ascii'),
+            'elapsed': round(elapsed, 4),
+            'recorded_at': time.time(),
+        }
+
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(interaction) + '\n')
+            self.recorded += 1
+
+    def _replay(self, key: str, request):
+        """Serve the next recorded interaction for this request"""
+        with self._lock:
+            queue = self._interactions.get(key)
+            if queue:
+                interaction = queue.popleft()
+                self._last[key] = interaction
+            else:
+                interaction = self._last.get(key)
+
+            if interaction is None:
+                self.missed += 1
+            else:
+                self.replayed += 1
+
+        if interaction is None:
+            raise requests.ConnectionError(f"Request not in cassette (replay mode): {key}")
+
+        if self.latency == 'recorded':
+            time.sleep(interaction.get('elapsed', 0))
+        else:
+            try:
+                delay_ms = float(self.latency)
+            except ValueError:
+                delay_ms = 0
+            if delay_ms > 0:
+                time.sleep(delay_ms / 1000.0)
+
+        response = requests.Response()
+        response.status_code = interaction['status']
+        response.reason = interaction.get('reason')
+        response.headers = CaseInsensitiveDict(interaction.get('headers', {}))
+        response._content = base64.b64decode(interaction['body'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def stats(self) -> Dict:
+        """Recorded / replayed / missed interaction counts"""
+        with self._lock:
+            return {
+                'mode': self.mode,
+                'path': self.path,
+                'recorded': self.recorded,
+                'replayed': self.replayed,
+                'missed': self.missed,
+            }
+
+
+def create_transport_adapter(**kwargs) -> HTTPAdapter:
+    """
+    Build the adapter for the shared session
+
+    Returns a CassetteAdapter if HTTP_CASSETTE_MODE is 'record' or 'replay',
+    otherwise a plain HTTPAdapter. kwargs go to HTTPAdapter (pool sizes).
+    """
+    mode = os.environ.get('HTTP_CASSETTE_MODE', '').lower()
+
+    if mode in ('record', 'replay'):
+        path = os.environ.get('HTTP_CASSETTE_PATH', 'http_cassette.jsonl')
+        latency = os.environ.get('HTTP_CASSETTE_LATENCY', '0')
+        print(f"📼 HTTP cassette {mode} mode: {path}")
+        return CassetteAdapter(mode, path, latency, **kwargs)
+
+    return HTTPAdapter(**kwargs)
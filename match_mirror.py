@@ -0,0 +1,202 @@
+"""
+MATCH MIRROR - Lokaler SQLite-Spiegel der Supabase Match-Daten
+===============================================================
+Mit SUPABASE_DB_URL ging jede Stats-Abfrage (Form, H2H, Team-/Liga-Stats)
+übers Netz zu Postgres (~100ms), obwohl sich die Historie nur ein paar Mal
+am Tag ändert. Der Mirror hält matches, team_aggregates, teams und leagues
+in einer lokalen SQLite-Datei (WAL, persistente Verbindung):
+
+- DataEngine liest standardmäßig aus dem Mirror, Writes gehen weiter an Supabase
+- Sync inkrementell über matches.fetched_at (Watermark + Überlappung für
+  Transaktionen, die beim letzten Sync noch offen waren), team_aggregates und
+  die Dimensionen werden bei Änderungen komplett kopiert (klein)
+- nach einer Schema-Migration wird einmal komplett neu synchronisiert
+- ist der Mirror älter als max_age, synchronisiert der nächste Read zuerst
+- status() liefert Watermark, letzten Sync und Alter (Staleness)
+
+Konfiguration (Environment):
+    MATCH_MIRROR=0              Mirror abschalten (direkt aus Supabase lesen)
+    MATCH_MIRROR_MAX_AGE=900    Sekunden bis zum nächsten Sync
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from db_migrations import (AGGREGATE_COLUMNS, AGGREGATE_KEY_COLUMNS, MATCH_COLUMNS,
+                           get_schema_version, hot_query, run_migrations)
+from db_pool import DatabaseManager, get_db_manager
+
+MIRROR_ENABLED = os.environ.get('MATCH_MIRROR', '1') != '0'
+MIRROR_MAX_AGE = int(os.environ.get('MATCH_MIRROR_MAX_AGE', '900'))
+
+# Zeilen, deren Transaktion beim letzten Sync noch nicht committed war (Sekunden)
+SYNC_OVERLAP = 600
+
+# IDs pro "WHERE id IN (...)" beim Diff der Überlappung (SQLite-Variablenlimit)
+SYNC_DIFF_CHUNK = 500
+
+# Kleine Tabellen, die bei Änderungen komplett kopiert werden
+SNAPSHOT_TABLES = {
+    'team_aggregates': AGGREGATE_KEY_COLUMNS + AGGREGATE_COLUMNS,
+    'teams': ('id', 'name'),
+    'leagues': ('id', 'code'),
+}
+
+
+class MatchMirror:
+    """
+    Read-through SQLite mirror of the primary match store
+
+    Args:
+        source: Primary DatabaseManager (Supabase)
+        path: SQLite file of the mirror
+        league_ids: League code → API-Football id (for the schema migrations)
+        max_age: Seconds after which reads trigger a sync
+    """
+
+    def __init__(self, source: DatabaseManager, path: str = "btts_data_mirror.db",
+                 league_ids: Optional[Dict[str, int]] = None, max_age: int = MIRROR_MAX_AGE):
+        self.source = source
+        self.path = path
+        self.max_age = max_age
+        self.db = get_db_manager(path, '')
+        self._lock = threading.RLock()
+
+        with self.db.connection() as conn:
+            version = get_schema_version(conn.cursor())
+        migrated = run_migrations(self.db, league_ids) != version
+
+        with self.db.connection() as conn:
+            # Neues Schema → Watermark verwerfen, nächster Sync ist komplett
+            if migrated:
+                conn.execute('DROP TABLE IF EXISTS mirror_state')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS mirror_state (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    watermark INTEGER,
+                    synced_at TEXT,
+                    rows_synced INTEGER
+                )
+            ''')
+            row = conn.execute('SELECT watermark, synced_at FROM mirror_state WHERE id = 1').fetchone()
+
+        self.watermark: Optional[int] = row[0] if row else None
+        self.synced_at: Optional[datetime] = datetime.fromisoformat(row[1]) if row and row[1] else None
+
+    def age_seconds(self) -> Optional[float]:
+        """Seconds since the last successful sync (None = never synced)"""
+        if self.synced_at is None:
+            return None
+        return (datetime.now() - self.synced_at).total_seconds()
+
+    def status(self) -> Dict:
+        """Staleness info for UI / logs"""
+        age = self.age_seconds()
+        with self.db.connection() as conn:
+            rows = conn.execute('SELECT COUNT(*) FROM matches').fetchone()[0]
+        return {
+            'path': self.path,
+            'rows': rows,
+            'watermark': self.watermark,
+            'synced_at': self.synced_at.isoformat() if self.synced_at else None,
+            'age_seconds': round(age, 1) if age is not None else None,
+            'stale': age is None or age >= self.max_age,
+        }
+
+    def ensure_fresh(self) -> bool:
+        """
+        Sync if older than max_age
+
+        Returns:
+            True if the mirror can serve reads (possibly slightly stale while
+            another thread syncs or the primary is unreachable)
+        """
+        age = self.age_seconds()
+        if age is not None and age < self.max_age:
+            return True
+
+        # Nur ein Thread synchronisiert, die anderen lesen den bisherigen Stand
+        if not self._lock.acquire(blocking=age is None):
+            return True
+        try:
+            self.sync()
+            return True
+        except Exception as e:
+            print(f"⚠️ Mirror sync failed: {e}")
+            return self.synced_at is not None
+        finally:
+            self._lock.release()
+
+    def _changed_rows(self, rows) -> list:
+        """Source rows that are missing or different in the mirror"""
+        id_idx = MATCH_COLUMNS.index('id')
+        existing = {}
+        with self.db.connection() as conn:
+            for i in range(0, len(rows), SYNC_DIFF_CHUNK):
+                ids = [row[id_idx] for row in rows[i:i + SYNC_DIFF_CHUNK]]
+                cursor = conn.execute(f'SELECT {", ".join(MATCH_COLUMNS)} FROM matches '
+                                      f'WHERE id IN ({", ".join(["?"] * len(ids))})', ids)
+                existing.update((row[id_idx], tuple(row)) for row in cursor)
+        return [row for row in rows if existing.get(row[id_idx]) != tuple(row)]
+
+    def sync(self, full: bool = False) -> int:
+        """
+        Pull changed matches from the primary store
+
+        Args:
+            full: Copy the whole table (e.g. after deletes or a rebuild)
+
+        Returns:
+            Number of new or changed matches
+        """
+        with self._lock:
+            start = time.time()
+            watermark = None if full else self.watermark
+            full = watermark is None
+            columns = ', '.join(MATCH_COLUMNS)
+            fetched_idx = MATCH_COLUMNS.index('fetched_at')
+
+            with self.source.connection() as src:
+                c = src.cursor()
+                if full:
+                    c.execute(f'SELECT {columns} FROM matches')
+                else:
+                    c.execute(hot_query('mirror_delta', self.source.is_postgres), (watermark - SYNC_OVERLAP,))
+                rows = c.fetchall()
+
+                # Überlappung gegen den Mirror diffen: spät committete Zeilen haben
+                # fetched_at <= watermark und wären bei einem Watermark-Filter verloren
+                changed = rows if full else self._changed_rows(rows)
+
+                tables = {}
+                if changed or full:
+                    for table, table_columns in SNAPSHOT_TABLES.items():
+                        c.execute(f'SELECT {", ".join(table_columns)} FROM {table}')
+                        tables[table] = c.fetchall()
+
+            new_watermark = max([row[fetched_idx] for row in rows if row[fetched_idx]] + [watermark or 0])
+            synced_at = datetime.now()
+
+            with self.db.connection() as conn:
+                if full:
+                    conn.execute('DELETE FROM matches')
+                if changed:
+                    conn.executemany(f'INSERT OR REPLACE INTO matches ({columns}) '
+                                     f'VALUES ({", ".join(["?"] * len(MATCH_COLUMNS))})', changed)
+                for table, table_rows in tables.items():
+                    table_columns = SNAPSHOT_TABLES[table]
+                    conn.execute(f'DELETE FROM {table}')
+                    conn.executemany(f'INSERT INTO {table} ({", ".join(table_columns)}) '
+                                     f'VALUES ({", ".join(["?"] * len(table_columns))})', table_rows)
+                conn.execute('INSERT OR REPLACE INTO mirror_state (id, watermark, synced_at, rows_synced) '
+                             'VALUES (1, ?, ?, ?)', (new_watermark or None, synced_at.isoformat(), len(changed)))
+
+            self.watermark = new_watermark or None
+            self.synced_at = synced_at
+
+            if changed or full:
+                print(f"🔄 Mirror sync: {len(changed)} matches ({time.time() - start:.1f}s)")
+            return len(changed)
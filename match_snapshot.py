@@ -0,0 +1,288 @@
+"""
+MATCH SNAPSHOT - Spaltenbasierter Export der matches-Tabelle
+=============================================================
+Training, Backtests und Liga-Baselines lesen die komplette Historie.
+Statt bei jedem Retrain die ganze Tabelle über pd.read_sql_query aus
+Supabase zu ziehen, wird sie einmal als NumPy-Spalten (.npy) exportiert
+und danach per Memory-Map geladen (Millisekunden, kein DB-Zugriff).
+
+Layout (Verzeichnis, default: match_snapshot/):
+    meta.json          Zeilenzahl, Export-Zeit, Dictionaries (Teams, Ligen)
+    id.npy             int32   Fixture-ID
+    date.npy           int32   Tage seit 1970-01-01
+    league.npy         int16   Index in meta['league_codes']
+    league_id.npy      int16   API-Football Liga-ID
+    home_team.npy      int32   Index in team_ids.npy / meta['team_names']
+    away_team.npy      int32
+    home_goals.npy     int16
+    away_goals.npy     int16
+    btts.npy           int8
+    team_ids.npy       int32   Dictionary: Team-Index → API-Football Team-ID
+
+Refresh:
+    python match_snapshot.py --db btts_data.db
+oder refresh_snapshot(db_path) nach einem Sync (nur wenn sich matches geändert hat).
+
+(Kein pyarrow im Projekt → NumPy statt Parquet/Arrow.)
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from db_pool import get_db_manager
+
+SNAPSHOT_DIR = os.environ.get('MATCH_SNAPSHOT_DIR', 'match_snapshot')
+SNAPSHOT_VERSION = 1
+
+COLUMN_TYPES = {
+    'id': np.int32,
+    'date': np.int32,
+    'league': np.int16,
+    'league_id': np.int16,
+    'home_team': np.int32,
+    'away_team': np.int32,
+    'home_goals': np.int16,
+    'away_goals': np.int16,
+    'btts': np.int8,
+}
+
+_FETCH_SIZE = 10000
+
+
+def _source_state(c) -> Dict:
+    """Row count + newest fetched_at of matches (cheap staleness check)"""
+    c.execute('SELECT COUNT(*), MAX(fetched_at) FROM matches')
+    count, last_fetched = c.fetchone()
+    return {'source_rows': int(count or 0), 'source_fetched_at': last_fetched}
+
+
+class MatchSnapshot:
+    """
+    Memory-mapped columnar view of the matches table
+
+    Usage:
+        snap = load_snapshot()
+        goals = snap['home_goals'] + snap['away_goals']
+        df = snap.to_dataframe()
+    """
+
+    def __init__(self, path: str, meta: Dict, columns: Dict[str, np.ndarray], team_ids: np.ndarray):
+        self.path = path
+        self.meta = meta
+        self.columns = columns
+        self.team_ids = team_ids
+        self.team_names: List[str] = meta.get('team_names', [])
+        self.league_codes: List[str] = meta.get('league_codes', [])
+
+    def __len__(self) -> int:
+        return self.meta.get('rows', 0)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def dates(self) -> np.ndarray:
+        """Dates as numpy datetime64[D]"""
+        return self.columns['date'].astype('datetime64[D]')
+
+    def league_mask(self, league_code: str) -> np.ndarray:
+        """Boolean mask of all matches in one league"""
+        if league_code not in self.league_codes:
+            return np.zeros(len(self), dtype=bool)
+        return self.columns['league'] == self.league_codes.index(league_code)
+
+    def league_baselines(self) -> Dict[str, Dict]:
+        """Per-league averages (matches, home/away goals, total goals, BTTS rate)"""
+        league = self.columns['league']
+        n_leagues = len(self.league_codes)
+        counts = np.bincount(league, minlength=n_leagues)
+        home = np.bincount(league, weights=self.columns['home_goals'], minlength=n_leagues)
+        away = np.bincount(league, weights=self.columns['away_goals'], minlength=n_leagues)
+        btts = np.bincount(league, weights=self.columns['btts'], minlength=n_leagues)
+
+        baselines = {}
+        for i, code in enumerate(self.league_codes):
+            if counts[i] == 0:
+                continue
+            baselines[code] = {
+                'total_matches': int(counts[i]),
+                'avg_home_scored': round(float(home[i] / counts[i]), 2),
+                'avg_away_scored': round(float(away[i] / counts[i]), 2),
+                'avg_total_goals': round(float((home[i] + away[i]) / counts[i]), 2),
+                'btts_rate': round(float(btts[i] / counts[i] * 100), 1),
+            }
+        return baselines
+
+    def to_dataframe(self):
+        """Decode into a pandas DataFrame with the matches table columns"""
+        import pandas as pd
+
+        names = np.array(self.team_names + [''], dtype=object)
+        codes = np.array(self.league_codes + [''], dtype=object)
+        home, away = self.columns['home_team'], self.columns['away_team']
+
+        return pd.DataFrame({
+            'id': self.columns['id'],
+            'league_code': codes[self.columns['league']],
+            'league_id': self.columns['league_id'],
+            'date': np.datetime_as_string(self.dates(), unit='D'),
+            'home_team': names[home],
+            'away_team': names[away],
+            'home_team_id': self.team_ids[home],
+            'away_team_id': self.team_ids[away],
+            'home_goals': self.columns['home_goals'],
+            'away_goals': self.columns['away_goals'],
+            'btts': self.columns['btts'],
+            'total_goals': self.columns['home_goals'].astype(np.int32) + self.columns['away_goals'],
+        })
+
+
+def export_snapshot(db_path: str = "btts_data.db", path: str = SNAPSHOT_DIR) -> Optional[MatchSnapshot]:
+    """
+    Materialize the matches table into a columnar snapshot
+
+    Writes into a temp directory and swaps it in, so readers never see a
+    half-written snapshot.
+    """
+    start = time.time()
+    db = get_db_manager(db_path)
+
+    columns: Dict[str, List[int]] = {name: [] for name in COLUMN_TYPES}
+    team_index: Dict[int, int] = {}
+    team_names: List[str] = []
+    league_index: Dict[str, int] = {}
+
+    def team_code(team_id, name) -> int:
+        code = team_index.get(team_id)
+        if code is None:
+            code = len(team_names)
+            team_index[team_id] = code
+            team_names.append(name or '')
+        return code
+
+    try:
+        with db.connection() as conn:
+            c = conn.cursor()
+            state = _source_state(c)
+            # date ist bereits Tage seit 1970-01-01, Namen/Codes aus den Dimensionen
+            c.execute('''
+                SELECT m.id, m.date, l.code, m.league_id, m.home_team_id, ht.name,
+                       m.away_team_id, at.name, m.home_goals, m.away_goals
+                FROM matches m
+                LEFT JOIN leagues l ON l.id = m.league_id
+                LEFT JOIN teams ht ON ht.id = m.home_team_id
+                LEFT JOIN teams at ON at.id = m.away_team_id
+                WHERE m.home_goals IS NOT NULL AND m.away_goals IS NOT NULL
+                ORDER BY m.date, m.id
+            ''')
+            while True:
+                rows = c.fetchmany(_FETCH_SIZE)
+                if not rows:
+                    break
+                for (match_id, match_date, league_code, league_id, home_id, home_name,
+                     away_id, away_name, home_goals, away_goals) in rows:
+                    league = league_index.setdefault(league_code or '', len(league_index))
+                    columns['id'].append(match_id)
+                    columns['date'].append(match_date if match_date is not None else -1)
+                    columns['league'].append(league)
+                    columns['league_id'].append(league_id or 0)
+                    columns['home_team'].append(team_code(home_id, home_name))
+                    columns['away_team'].append(team_code(away_id, away_name))
+                    columns['home_goals'].append(home_goals)
+                    columns['away_goals'].append(away_goals)
+                    columns['btts'].append(1 if home_goals > 0 and away_goals > 0 else 0)
+    except Exception as e:
+        print(f"❌ Snapshot export failed: {e}")
+        return None
+
+    tmp_path = f"{path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    for name, dtype in COLUMN_TYPES.items():
+        np.save(os.path.join(tmp_path, f"{name}.npy"), np.asarray(columns[name], dtype=dtype))
+    np.save(os.path.join(tmp_path, 'team_ids.npy'),
+            np.asarray([team_id or 0 for team_id in team_index], dtype=np.int32))
+
+    meta = {
+        'version': SNAPSHOT_VERSION,
+        'rows': len(columns['id']),
+        'exported_at': datetime.now().isoformat(),
+        'team_names': team_names,
+        'league_codes': list(league_index),
+        **state,
+    }
+    with open(os.path.join(tmp_path, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+    old_path = f"{path}.old"
+    shutil.rmtree(old_path, ignore_errors=True)
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+    print(f"✅ Match snapshot: {meta['rows']} matches, {len(team_names)} teams "
+          f"→ {path} ({time.time() - start:.1f}s)")
+    return load_snapshot(path)
+
+
+def load_snapshot(path: str = SNAPSHOT_DIR) -> Optional[MatchSnapshot]:
+    """Memory-map a snapshot (None if missing or incompatible)"""
+    meta_path = os.path.join(path, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != SNAPSHOT_VERSION:
+            return None
+
+        columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')
+                   for name in COLUMN_TYPES}
+        team_ids = np.load(os.path.join(path, 'team_ids.npy'), mmap_mode='r')
+    except Exception as e:
+        print(f"⚠️ Could not load match snapshot: {e}")
+        return None
+
+    return MatchSnapshot(path, meta, columns, team_ids)
+
+
+def refresh_snapshot(db_path: str = "btts_data.db", path: str = SNAPSHOT_DIR,
+                     force: bool = False) -> Optional[MatchSnapshot]:
+    """Re-export only if matches changed since the last snapshot"""
+    snapshot = load_snapshot(path)
+
+    if snapshot is not None and not force:
+        try:
+            with get_db_manager(db_path).connection() as conn:
+                state = _source_state(conn.cursor())
+            if (state['source_rows'] == snapshot.meta.get('source_rows')
+                    and state['source_fetched_at'] == snapshot.meta.get('source_fetched_at')):
+                return snapshot
+        except Exception as e:
+            print(f"⚠️ Snapshot staleness check failed: {e}")
+            return snapshot
+
+    return export_snapshot(db_path, path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export the matches table to a columnar snapshot')
+    parser.add_argument('--db', default='btts_data.db', help='SQLite fallback path')
+    parser.add_argument('--out', default=SNAPSHOT_DIR)
+    parser.add_argument('--force', action='store_true', help='Export even if unchanged')
+    args = parser.parse_args()
+
+    snap = refresh_snapshot(args.db, args.out, force=args.force)
+    if snap is not None:
+        load_start = time.perf_counter()
+        load_snapshot(args.out)
+        print(f"📊 {len(snap)} matches, load time {(time.perf_counter() - load_start) * 1000:.1f}ms")
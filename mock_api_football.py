@@ -0,0 +1,714 @@
+"""
+MOCK API-FOOTBALL - Lokaler Stand-in Server für Lasttests
+==========================================================
+Implementiert die Teilmenge der API-Football v3 Endpoints, die dieses
+Projekt nutzt, mit synthetischen aber konsistenten Daten:
+
+    fixtures, fixtures/statistics, fixtures/events, fixtures/headtohead,
+    teams/statistics, injuries, standings, odds
+
+Konsistent heißt: gleiche Saison-Spielpläne, Ergebnisse, Statistiken und
+Tabellen bei jedem Start (deterministisch aus Seed + IDs). Spiele vor
+"jetzt" sind FT, laufende Spiele sind live, spätere NS.
+
+Konfigurierbar:
+- Latenz (+ Jitter), Fehlerrate (HTTP 500)
+- Rate-Limit Header (pro Minute + pro Tag), 429 bei Überschreitung
+- Skalierung: --scale 10 → 10× so viele Ligen/Fixtures
+
+Start:
+    python mock_api_football.py --port 8099 --latency-ms 80 --error-rate 0.01 --rate-limit 300
+
+Projekt darauf zeigen lassen:
+    export API_FOOTBALL_BASE_URL=http://127.0.0.1:8099
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+# Die 28 Ligen aus APIFootball.league_ids
+LEAGUE_IDS = [78, 39, 140, 135, 61, 88, 94, 203, 40, 79, 262, 71, 2, 3, 848,
+              179, 144, 207, 218, 265, 330, 165, 188, 89, 209, 113, 292, 301]
+
+FINISHED = 'FT'
+MATCH_MINUTES = 115  # inkl. Halbzeit + Nachspielzeit
+
+STATUS_LONG = {'NS': 'Not Started', '1H': 'First Half', 'HT': 'Halftime',
+               '2H': 'Second Half', 'FT': 'Match Finished'}
+
+POSITIONS = ['Goalkeeper', 'Defender', 'Midfielder', 'Attacker']
+BOOKMAKERS = [(8, 'Bet365'), (6, 'Bwin'), (11, '1xBet'), (16, 'Unibet')]
+
+
+# =============================================================================
+# SYNTHETIC WORLD
+# =============================================================================
+
+class SyntheticWorld:
+    """
+    Deterministic leagues, teams, season schedules and match data
+
+    Args:
+        season: Season year (2025 = 2025/26, None = season running today)
+        scale: League multiplier (1 = 28 leagues, 10 = 280 leagues)
+        teams_per_league: Even number of teams per league
+        seed: Global seed
+    """
+
+    def __init__(self, season: Optional[int] = None, scale: int = 1, teams_per_league: int = 20, seed: int = 42):
+        if season is None:
+            today = datetime.now(timezone.utc)
+            season = today.year if today.month >= 7 else today.year - 1
+        self.season = season
+        self.teams_per_league = teams_per_league + (teams_per_league % 2)
+        self.seed = seed
+
+        self.league_ids = list(LEAGUE_IDS)
+        for i in range(len(LEAGUE_IDS) * (max(1, scale) - 1)):
+            self.league_ids.append(10000 + i)
+
+        self.season_start = datetime(season, 8, 15, 15, 0, tzinfo=timezone.utc)
+
+        self._schedules: Dict[int, List[Dict]] = {}
+        self._fixtures_by_id: Dict[int, Tuple[int, Dict]] = {}
+        self._lock = threading.Lock()
+
+    def _rng(self, *keys) -> random.Random:
+        # zlib statt hash(): str-Hashes sind pro Prozess randomisiert
+        return random.Random(zlib.crc32(repr((self.seed,) + keys).encode('utf-8')))
+
+    # ---------- teams ----------
+
+    def team_ids(self, league_id: int) -> List[int]:
+        return [league_id * 100 + i for i in range(1, self.teams_per_league + 1)]
+
+    def team_name(self, team_id: int) -> str:
+        return f"Team {team_id}"
+
+    def team_league(self, team_id: int) -> int:
+        return team_id // 100
+
+    def team_strength(self, team_id: int) -> Tuple[float, float]:
+        """(attack, defense) multipliers around 1.0"""
+        rng = self._rng('strength', team_id)
+        return rng.uniform(0.7, 1.4), rng.uniform(0.7, 1.4)
+
+    # ---------- schedule ----------
+
+    def schedule(self, league_id: int) -> List[Dict]:
+        """Double round robin (circle method), one round per week"""
+        with self._lock:
+            cached = self._schedules.get(league_id)
+            if cached is not None:
+                return cached
+
+            teams = self.team_ids(league_id)
+            n = len(teams)
+            rounds = []
+            rotation = teams[:]
+            for r in range(n - 1):
+                pairs = [(rotation[i], rotation[n - 1 - i]) for i in range(n // 2)]
+                if r % 2:
+                    pairs = [(b, a) for a, b in pairs]
+                rounds.append(pairs)
+                rotation = [rotation[0]] + [rotation[-1]] + rotation[1:-1]
+            rounds += [[(b, a) for a, b in pairs] for pairs in rounds]
+
+            offset_days = self.league_ids.index(league_id) % 3 if league_id in self.league_ids else 0
+            fixtures = []
+            for r, pairs in enumerate(rounds):
+                for m, (home, away) in enumerate(pairs):
+                    kickoff = self.season_start + timedelta(days=7 * r + offset_days, hours=(m % 3) * 2)
+                    fixture = {
+                        'id': league_id * 10000 + r * 100 + m,
+                        'league_id': league_id,
+                        'round': r + 1,
+                        'home': home,
+                        'away': away,
+                        'kickoff': kickoff,
+                    }
+                    fixtures.append(fixture)
+                    self._fixtures_by_id[fixture['id']] = (league_id, fixture)
+
+            self._schedules[league_id] = fixtures
+            return fixtures
+
+    def fixture(self, fixture_id: int) -> Optional[Dict]:
+        league_id = fixture_id // 10000
+        if league_id not in self.league_ids:
+            return None
+        self.schedule(league_id)
+        entry = self._fixtures_by_id.get(fixture_id)
+        return entry[1] if entry else None
+
+    def team_fixtures(self, team_id: int) -> List[Dict]:
+        league_id = self.team_league(team_id)
+        if league_id not in self.league_ids:
+            return []
+        return [f for f in self.schedule(league_id) if team_id in (f['home'], f['away'])]
+
+    # ---------- match state ----------
+
+    def final_score(self, fx: Dict) -> Tuple[int, int]:
+        rng = self._rng('score', fx['id'])
+        home_att, home_def = self.team_strength(fx['home'])
+        away_att, away_def = self.team_strength(fx['away'])
+        lam_home = 1.45 * home_att / away_def
+        lam_away = 1.15 * away_att / home_def
+        return _poisson(rng, lam_home), _poisson(rng, lam_away)
+
+    def state(self, fx: Dict, now: datetime) -> Tuple[str, Optional[int], Optional[int], Optional[int]]:
+        """(status_short, elapsed, home_goals, away_goals) at time 'now'"""
+        minutes = (now - fx['kickoff']).total_seconds() / 60
+        if minutes < 0:
+            return 'NS', None, None, None
+
+        home, away = self.final_score(fx)
+        if minutes >= MATCH_MINUTES:
+            return FINISHED, 90, home, away
+
+        elapsed = int(minutes) if minutes < 45 else (45 if minutes < 60 else min(90, int(minutes) - 15))
+        status = '1H' if minutes < 45 else ('HT' if minutes < 60 else '2H')
+        goals = [e for e in self.goal_events(fx) if e['minute'] <= elapsed]
+        return (status, elapsed,
+                sum(1 for e in goals if e['team'] == fx['home']),
+                sum(1 for e in goals if e['team'] == fx['away']))
+
+    def goal_events(self, fx: Dict) -> List[Dict]:
+        rng = self._rng('goals', fx['id'])
+        home, away = self.final_score(fx)
+        events = [{'team': fx['home'], 'minute': rng.randint(1, 90)} for _ in range(home)]
+        events += [{'team': fx['away'], 'minute': rng.randint(1, 90)} for _ in range(away)]
+        return sorted(events, key=lambda e: e['minute'])
+
+    def card_events(self, fx: Dict) -> List[Dict]:
+        rng = self._rng('cards', fx['id'])
+        events = []
+        for team in (fx['home'], fx['away']):
+            for _ in range(_poisson(rng, 2.0)):
+                events.append({'team': team, 'minute': rng.randint(5, 90), 'detail': 'Yellow Card',
+                               'player': rng.randint(1, 25)})
+            if rng.random() < 0.06:
+                events.append({'team': team, 'minute': rng.randint(20, 90), 'detail': 'Red Card',
+                               'player': rng.randint(1, 25)})
+        return sorted(events, key=lambda e: e['minute'])
+
+    def team_match_stats(self, fx: Dict, team_id: int, elapsed: int) -> Dict:
+        """Per-team statistics scaled to the elapsed minutes"""
+        rng = self._rng('stats', fx['id'], team_id)
+        attack, _ = self.team_strength(team_id)
+        share = max(0.0, min(1.0, elapsed / 90))
+        shots = int(round(rng.uniform(8, 16) * attack * share))
+        on_goal = int(round(shots * rng.uniform(0.25, 0.45)))
+        blocked = int(round((shots - on_goal) * rng.uniform(0.2, 0.35)))
+        yellows = sum(1 for e in self.card_events(fx)
+                      if e['team'] == team_id and e['detail'] == 'Yellow Card' and e['minute'] <= elapsed)
+        reds = sum(1 for e in self.card_events(fx)
+                   if e['team'] == team_id and e['detail'] == 'Red Card' and e['minute'] <= elapsed)
+        return {
+            'Shots on Goal': on_goal,
+            'Shots off Goal': shots - on_goal - blocked,
+            'Total Shots': shots,
+            'Blocked Shots': blocked,
+            'Shots insidebox': int(round(shots * 0.6)),
+            'Fouls': int(round(rng.uniform(8, 15) * share)),
+            'Corner Kicks': int(round(rng.uniform(3, 7) * attack * share)),
+            'Offsides': int(round(rng.uniform(0, 4) * share)),
+            'Ball Possession': f"{int(rng.uniform(40, 60))}%",
+            'Yellow Cards': yellows,
+            'Red Cards': reds,
+            'Goalkeeper Saves': int(round(rng.uniform(1, 5) * share)),
+            'Total passes': int(round(rng.uniform(350, 600) * share)),
+            'Passes accurate': int(round(rng.uniform(280, 520) * share)),
+            'expected_goals': f"{shots * 0.11:.2f}",
+            'Total attacks': int(round(rng.uniform(80, 120) * share)),
+            'Dangerous attacks': int(round(rng.uniform(30, 60) * attack * share)),
+        }
+
+
+def _poisson(rng: random.Random, lam: float) -> int:
+    """Knuth Poisson sample"""
+    limit, k, p = math.exp(-lam), 0, 1.0
+    while True:
+        p *= rng.random()
+        if p <= limit:
+            return k
+        k += 1
+
+
+# =============================================================================
+# RESPONSE BUILDERS (API-Football v3 shapes)
+# =============================================================================
+
+class MockAPIFootball:
+    """Endpoint implementations on top of a SyntheticWorld"""
+
+    def __init__(self, world: SyntheticWorld):
+        self.world = world
+
+    def now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    def fixture_object(self, fx: Dict, now: datetime, embed: bool = False) -> Dict:
+        status, elapsed, home_goals, away_goals = self.world.state(fx, now)
+        finished = status == FINISHED
+        winner_home = None if not finished or home_goals == away_goals else home_goals > away_goals
+
+        obj = {
+            'fixture': {
+                'id': fx['id'],
+                'referee': f"Referee {fx['id'] % 40}",
+                'timezone': 'UTC',
+                'date': fx['kickoff'].isoformat(),
+                'timestamp': int(fx['kickoff'].timestamp()),
+                'venue': {'id': fx['home'], 'name': f"Stadium {fx['home']}", 'city': 'City'},
+                'status': {'long': STATUS_LONG[status], 'short': status, 'elapsed': elapsed},
+            },
+            'league': {
+                'id': fx['league_id'], 'name': f"League {fx['league_id']}", 'country': 'Mock',
+                'season': self.world.season, 'round': f"Regular Season - {fx['round']}",
+            },
+            'teams': {
+                'home': {'id': fx['home'], 'name': self.world.team_name(fx['home']),
+                         'winner': winner_home},
+                'away': {'id': fx['away'], 'name': self.world.team_name(fx['away']),
+                         'winner': None if winner_home is None else not winner_home},
+            },
+            'goals': {'home': home_goals, 'away': away_goals},
+            'score': {'fulltime': {'home': home_goals if finished else None,
+                                   'away': away_goals if finished else None}},
+        }
+
+        if embed and status != 'NS':
+            obj['statistics'] = self.statistics(fx, elapsed)
+            obj['events'] = self.events(fx, elapsed)
+
+        return obj
+
+    def statistics(self, fx: Dict, elapsed: int) -> List[Dict]:
+        out = []
+        for team_id in (fx['home'], fx['away']):
+            stats = self.world.team_match_stats(fx, team_id, elapsed)
+            out.append({
+                'team': {'id': team_id, 'name': self.world.team_name(team_id)},
+                'statistics': [{'type': k, 'value': v} for k, v in stats.items()],
+            })
+        return out
+
+    def events(self, fx: Dict, elapsed: int) -> List[Dict]:
+        out = []
+        for goal in self.world.goal_events(fx):
+            if goal['minute'] <= elapsed:
+                out.append({'time': {'elapsed': goal['minute'], 'extra': None},
+                            'team': {'id': goal['team'], 'name': self.world.team_name(goal['team'])},
+                            'player': {'id': goal['team'] * 100, 'name': f"Striker {goal['team']}"},
+                            'type': 'Goal', 'detail': 'Normal Goal'})
+        for card in self.world.card_events(fx):
+            if card['minute'] <= elapsed:
+                out.append({'time': {'elapsed': card['minute'], 'extra': None},
+                            'team': {'id': card['team'], 'name': self.world.team_name(card['team'])},
+                            'player': {'id': card['team'] * 100 + card['player'],
+                                       'name': f"Player {card['team']}-{card['player']}"},
+                            'type': 'Card', 'detail': card['detail']})
+        return sorted(out, key=lambda e: e['time']['elapsed'])
+
+    # ---------- endpoints ----------
+
+    def get_fixtures(self, params: Dict) -> List[Dict]:
+        now = self.now()
+        world = self.world
+
+        if 'id' in params or 'ids' in params:
+            ids = [int(x) for x in str(params.get('ids', params.get('id'))).split('-') if x][:20]
+            return [self.fixture_object(fx, now, embed=True)
+                    for fx in (world.fixture(i) for i in ids) if fx]
+
+        if 'live' in params:
+            today = [fx for lid in world.league_ids for fx in world.schedule(lid)
+                     if 0 <= (now - fx['kickoff']).total_seconds() / 60 < MATCH_MINUTES]
+            return [self.fixture_object(fx, now) for fx in today]
+
+        if 'team' in params:
+            candidates = world.team_fixtures(int(params['team']))
+        elif 'league' in params:
+            candidates = world.schedule(int(params['league'])) if int(params['league']) in world.league_ids else []
+        elif 'date' in params:
+            candidates = [fx for lid in world.league_ids for fx in world.schedule(lid)
+                          if fx['kickoff'].strftime('%Y-%m-%d') == params['date']]
+        elif 'search' in params:
+            needle = params['search'].lower()
+            candidates = [fx for lid in world.league_ids for fx in world.schedule(lid)
+                          if needle in world.team_name(fx['home']).lower()
+                          or needle in world.team_name(fx['away']).lower()]
+        else:
+            candidates = []
+
+        if 'league' in params and 'team' in params:
+            candidates = [fx for fx in candidates if fx['league_id'] == int(params['league'])]
+        if 'date' in params and ('team' in params or 'league' in params):
+            candidates = [fx for fx in candidates if fx['kickoff'].strftime('%Y-%m-%d') == params['date']]
+        if 'from' in params:
+            candidates = [fx for fx in candidates if fx['kickoff'].strftime('%Y-%m-%d') >= params['from']]
+        if 'to' in params:
+            candidates = [fx for fx in candidates if fx['kickoff'].strftime('%Y-%m-%d') <= params['to']]
+
+        if 'status' in params:
+            wanted = set(params['status'].split('-'))
+            candidates = [fx for fx in candidates if world.state(fx, now)[0] in wanted]
+
+        if 'last' in params:
+            past = [fx for fx in candidates if world.state(fx, now)[0] == FINISHED]
+            candidates = sorted(past, key=lambda f: f['kickoff'], reverse=True)[:int(params['last'])]
+        elif 'next' in params:
+            future = [fx for fx in candidates if world.state(fx, now)[0] == 'NS']
+            candidates = sorted(future, key=lambda f: f['kickoff'])[:int(params['next'])]
+
+        return [self.fixture_object(fx, now) for fx in candidates]
+
+    def get_fixture_statistics(self, params: Dict) -> List[Dict]:
+        fx = self.world.fixture(int(params.get('fixture', 0)))
+        if not fx:
+            return []
+        status, elapsed, _, _ = self.world.state(fx, self.now())
+        return [] if status == 'NS' else self.statistics(fx, elapsed)
+
+    def get_fixture_events(self, params: Dict) -> List[Dict]:
+        fx = self.world.fixture(int(params.get('fixture', 0)))
+        if not fx:
+            return []
+        status, elapsed, _, _ = self.world.state(fx, self.now())
+        return [] if status == 'NS' else self.events(fx, elapsed)
+
+    def get_headtohead(self, params: Dict) -> List[Dict]:
+        try:
+            team1, team2 = (int(x) for x in params.get('h2h', '').split('-'))
+        except ValueError:
+            return []
+        now = self.now()
+        games = [fx for fx in self.world.team_fixtures(team1)
+                 if team2 in (fx['home'], fx['away']) and self.world.state(fx, now)[0] == FINISHED]
+        games.sort(key=lambda f: f['kickoff'], reverse=True)
+        if 'last' in params:
+            games = games[:int(params['last'])]
+        return [self.fixture_object(fx, now) for fx in games]
+
+    def get_team_statistics(self, params: Dict) -> Dict:
+        team_id = int(params.get('team', 0))
+        now = self.now()
+        played = {'home': 0, 'away': 0}
+        wins = {'home': 0, 'away': 0}
+        draws = {'home': 0, 'away': 0}
+        loses = {'home': 0, 'away': 0}
+        goals_for = {'home': 0, 'away': 0}
+        goals_against = {'home': 0, 'away': 0}
+        clean = {'home': 0, 'away': 0}
+        failed = {'home': 0, 'away': 0}
+        yellows = reds = 0
+        form = ''
+
+        for fx in sorted(self.world.team_fixtures(team_id), key=lambda f: f['kickoff']):
+            status, _, home_goals, away_goals = self.world.state(fx, now)
+            if status != FINISHED:
+                continue
+            side = 'home' if fx['home'] == team_id else 'away'
+            scored, conceded = (home_goals, away_goals) if side == 'home' else (away_goals, home_goals)
+            played[side] += 1
+            goals_for[side] += scored
+            goals_against[side] += conceded
+            clean[side] += conceded == 0
+            failed[side] += scored == 0
+            if scored > conceded:
+                wins[side] += 1
+                form += 'W'
+            elif scored == conceded:
+                draws[side] += 1
+                form += 'D'
+            else:
+                loses[side] += 1
+                form += 'L'
+            for card in self.world.card_events(fx):
+                if card['team'] == team_id:
+                    yellows += card['detail'] == 'Yellow Card'
+                    reds += card['detail'] == 'Red Card'
+
+        def split(d):
+            return {'home': d['home'], 'away': d['away'], 'total': d['home'] + d['away']}
+
+        def avg(goals):
+            averages = {side: f"{goals[side] / played[side]:.1f}" if played[side] else "0.0"
+                        for side in ('home', 'away')}
+            averages['total'] = f"{(goals['home'] + goals['away']) / max(1, played['home'] + played['away']):.1f}"
+            return averages
+
+        return {
+            'league': {'id': self.world.team_league(team_id), 'season': self.world.season},
+            'team': {'id': team_id, 'name': self.world.team_name(team_id)},
+            'form': form,
+            'fixtures': {'played': split(played), 'wins': split(wins),
+                         'draws': split(draws), 'loses': split(loses)},
+            'goals': {
+                'for': {'total': split(goals_for), 'average': avg(goals_for)},
+                'against': {'total': split(goals_against), 'average': avg(goals_against)},
+            },
+            'clean_sheet': split(clean),
+            'failed_to_score': split(failed),
+            'cards': {
+                'yellow': {'0-90': {'total': yellows, 'percentage': '100%'}},
+                'red': {'0-90': {'total': reds, 'percentage': '100%'}},
+            },
+        }
+
+    def get_injuries(self, params: Dict) -> List[Dict]:
+        team_id = int(params.get('team', 0))
+        rng = self.world._rng('injuries', team_id, self.now().strftime('%Y-%W'))
+        return [{
+            'player': {'id': team_id * 100 + i, 'name': f"Player {team_id}-{i}",
+                       'type': rng.choice(POSITIONS), 'reason': rng.choice(['Knee Injury', 'Suspended', 'Illness'])},
+            'team': {'id': team_id, 'name': self.world.team_name(team_id)},
+            'reason': 'Missing Fixture',
+        } for i in range(rng.randint(0, 4))]
+
+    def get_standings(self, params: Dict) -> List[Dict]:
+        league_id = int(params.get('league', 0))
+        if league_id not in self.world.league_ids:
+            return []
+        table = {}
+        for team_id in self.world.team_ids(league_id):
+            stats = self.get_team_statistics({'team': team_id})
+            fixtures = stats['fixtures']
+            goals_for = stats['goals']['for']['total']['total']
+            goals_against = stats['goals']['against']['total']['total']
+            table[team_id] = {
+                'team': {'id': team_id, 'name': self.world.team_name(team_id)},
+                'points': fixtures['wins']['total'] * 3 + fixtures['draws']['total'],
+                'goalsDiff': goals_for - goals_against,
+                'form': stats['form'][-5:],
+                'all': {'played': fixtures['played']['total'], 'win': fixtures['wins']['total'],
+                        'draw': fixtures['draws']['total'], 'lose': fixtures['loses']['total'],
+                        'goals': {'for': goals_for, 'against': goals_against}},
+            }
+        ranked = sorted(table.values(), key=lambda t: (t['points'], t['goalsDiff']), reverse=True)
+        for rank, row in enumerate(ranked, 1):
+            row['rank'] = rank
+        return [{'league': {'id': league_id, 'season': self.world.season, 'standings': [ranked]}}]
+
+    def get_odds(self, params: Dict) -> List[Dict]:
+        fx = self.world.fixture(int(params.get('fixture', 0)))
+        if not fx:
+            return []
+        rng = self.world._rng('odds', fx['id'])
+        bookmakers = []
+        for bookie_id, name in BOOKMAKERS:
+            margin = rng.uniform(1.04, 1.08)
+            home, draw = rng.uniform(0.3, 0.55), rng.uniform(0.22, 0.3)
+            away = max(0.1, 1 - home - draw)
+            btts = rng.uniform(0.45, 0.62)
+            over25 = rng.uniform(0.42, 0.6)
+
+            def odd(p):
+                return f"{1 / (p * margin):.2f}"
+
+            bookmakers.append({'id': bookie_id, 'name': name, 'bets': [
+                {'id': 1, 'name': 'Match Winner', 'values': [
+                    {'value': 'Home', 'odd': odd(home)}, {'value': 'Draw', 'odd': odd(draw)},
+                    {'value': 'Away', 'odd': odd(away)}]},
+                {'id': 8, 'name': 'Both Teams Score', 'values': [
+                    {'value': 'Yes', 'odd': odd(btts)}, {'value': 'No', 'odd': odd(1 - btts)}]},
+                {'id': 5, 'name': 'Goals Over/Under', 'values': [
+                    {'value': 'Over 2.5', 'odd': odd(over25)}, {'value': 'Under 2.5', 'odd': odd(1 - over25)}]},
+            ]})
+        return [{'fixture': {'id': fx['id']}, 'league': {'id': fx['league_id']}, 'bookmakers': bookmakers}]
+
+
+# =============================================================================
+# HTTP SERVER
+# =============================================================================
+
+class MockServerConfig:
+    """Latency, error rate and rate limits of the mock server"""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0.0,
+                 rate_limit_per_minute: int = 300, daily_limit: int = 75000, seed: int = 42):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_per_minute = rate_limit_per_minute
+        self.daily_limit = daily_limit
+        self.rng = random.Random(seed)
+
+        self.lock = threading.Lock()
+        self.minute_window = deque()
+        self.daily_used = 0
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+
+
+ROUTES = {
+    '/fixtures': 'get_fixtures',
+    '/fixtures/statistics': 'get_fixture_statistics',
+    '/fixtures/events': 'get_fixture_events',
+    '/fixtures/headtohead': 'get_headtohead',
+    '/teams/statistics': 'get_team_statistics',
+    '/injuries': 'get_injuries',
+    '/standings': 'get_standings',
+    '/odds': 'get_odds',
+}
+
+
+def make_handler(api: MockAPIFootball, config: MockServerConfig):
+    """Build the request handler class bound to an API + config"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, payload: Dict, headers: Dict):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for key, value in headers.items():
+                self.send_header(key, str(value))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            endpoint = parts.path.rstrip('/')
+            params = dict(parse_qsl(parts.query))
+
+            # Latenz
+            delay = config.latency_ms + (config.rng.uniform(-1, 1) * config.jitter_ms if config.jitter_ms else 0)
+            if delay > 0:
+                time.sleep(delay / 1000.0)
+
+            # Rate-Limit (sliding window pro Minute + Tageszähler)
+            with config.lock:
+                now = time.time()
+                while config.minute_window and now - config.minute_window[0] >= 60:
+                    config.minute_window.popleft()
+                config.requests += 1
+
+                limited = len(config.minute_window) >= config.rate_limit_per_minute
+                if limited:
+                    config.throttled += 1
+                    retry_after = int(60 - (now - config.minute_window[0])) + 1
+                else:
+                    config.minute_window.append(now)
+                    config.daily_used += 1
+
+                headers = {
+                    'X-RateLimit-Limit': config.rate_limit_per_minute,
+                    'X-RateLimit-Remaining': max(0, config.rate_limit_per_minute - len(config.minute_window)),
+                    'x-ratelimit-requests-limit': config.daily_limit,
+                    'x-ratelimit-requests-remaining': max(0, config.daily_limit - config.daily_used),
+                }
+                failed = not limited and config.rng.random() < config.error_rate
+                if failed:
+                    config.errors += 1
+
+            if limited:
+                headers['Retry-After'] = retry_after
+                self._send(429, {'message': 'Too many requests'}, headers)
+                return
+
+            if failed:
+                self._send(500, {'message': 'Synthetic server error'}, headers)
+                return
+
+            envelope = {'get': endpoint.lstrip('/'), 'parameters': params, 'errors': [],
+                        'results': 0, 'paging': {'current': 1, 'total': 1}, 'response': []}
+
+            if not self.headers.get('x-apisports-key'):
+                envelope['errors'] = {'token': 'Missing application key'}
+                self._send(200, envelope, headers)
+                return
+
+            handler = ROUTES.get(endpoint)
+            if handler is None:
+                envelope['errors'] = {'endpoint': f'{endpoint} not implemented in mock'}
+                self._send(404, envelope, headers)
+                return
+
+            try:
+                result = getattr(api, handler)(params)
+            except (ValueError, TypeError) as e:
+                envelope['errors'] = {'parameters': str(e)}
+                self._send(200, envelope, headers)
+                return
+
+            envelope['response'] = result
+            envelope['results'] = len(result) if isinstance(result, list) else 1
+            self._send(200, envelope, headers)
+
+    return Handler
+
+
+def start_mock_server(host: str = '127.0.0.1', port: int = 0, world: Optional[SyntheticWorld] = None,
+                      config: Optional[MockServerConfig] = None) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Start the mock server in a background thread
+
+    Returns:
+        (server, base_url) - call server.shutdown() when done
+    """
+    world = world or SyntheticWorld()
+    config = config or MockServerConfig()
+    server = ThreadingHTTPServer((host, port), make_handler(MockAPIFootball(world), config))
+    server.daemon_threads = True
+    server.config = config
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local API-Football v3 stand-in for load tests')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--season', type=int, default=None)
+    parser.add_argument('--scale', type=int, default=1, help='League multiplier (10 = 10x fixtures)')
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=int, default=300, help='Requests per minute')
+    parser.add_argument('--daily-limit', type=int, default=75000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    world = SyntheticWorld(season=args.season, scale=args.scale, seed=args.seed)
+    config = MockServerConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                              error_rate=args.error_rate, rate_limit_per_minute=args.rate_limit,
+                              daily_limit=args.daily_limit, seed=args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(MockAPIFootball(world), config))
+    server.daemon_threads = True
+
+    print(f"⚽ Mock API-Football on http://{args.host}:{args.port} "
+          f"({len(world.league_ids)} leagues, {args.latency_ms:.0f}ms, "
+          f"{args.error_rate:.0%} errors, {args.rate_limit}/min)")
+    print(f"   export API_FOOTBALL_BASE_URL=http://{args.host}:{args.port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 {config.requests} requests, {config.throttled} throttled (429), {config.errors} errors")
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
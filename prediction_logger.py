@@ -0,0 +1,192 @@
+"""
+PREDICTION LOGGER - Asynchrones Write-Behind für Predictions
+=============================================================
+analyze_match, SmartBetFinder.find_value_bets und der Live-Scanner sollen
+jede Ausgabe für das CLV-Tracking loggen, ohne auf Disk/Netzwerk zu warten:
+
+- log() / log_many() legen Records nur in eine begrenzte Queue (nie blockierend,
+  bei voller Queue wird verworfen und gezählt); Records ohne Pflichtfelder
+  werden sofort abgelehnt, damit sie nicht den ganzen Batch kippen
+- ein Hintergrund-Thread schreibt in Batches über CLVTracker.record_predictions()
+  (eine Transaktion pro Batch), sobald batch_size erreicht oder flush_interval
+  abgelaufen ist
+- flush() wartet bis alles Geschriebene persistiert ist, close() (auch via atexit)
+  leert die Queue vor dem Beenden
+
+Usage:
+    logger = get_prediction_logger()
+    logger.log({'fixture_id': 123, 'home_team': 'Bayern', 'away_team': 'Dortmund',
+                'market_type': 'BTTS', 'prediction': 'Yes', 'odds': 1.85,
+                'model_probability': 62.5, 'confidence': 75})
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from clv_tracker import CLVTracker
+
+# Gleiche Datei wie AdvancedBTTSAnalyzer (btts_data.db → btts_data_clv.db)
+DEFAULT_CLV_DB = "btts_data_clv.db"
+
+MAX_QUEUE_SIZE = 10000
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 2.0  # Sekunden
+
+# NOT NULL Spalten von predictions (created_at wird ergänzt)
+REQUIRED_KEYS = ('fixture_id', 'home_team', 'away_team', 'market_type', 'prediction')
+
+_STOP = object()
+
+
+class PredictionLogger:
+    """
+    Background writer with a bounded queue
+
+    Args:
+        tracker: CLVTracker the batches are written to
+        max_queue_size: Records held in memory before log() starts dropping
+        batch_size: Flush as soon as this many records are buffered
+        flush_interval: Flush buffered records at least this often (seconds)
+    """
+
+    def __init__(self, tracker: CLVTracker, max_queue_size: int = MAX_QUEUE_SIZE,
+                 batch_size: int = BATCH_SIZE, flush_interval: float = FLUSH_INTERVAL):
+        self.tracker = tracker
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._closed = False
+        self.written = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.errors = 0
+
+        self._thread = threading.Thread(target=self._run, name='prediction-logger', daemon=True)
+        self._thread.start()
+
+    def log(self, record: Dict) -> bool:
+        """Queue one prediction (False if dropped or missing a required key)"""
+        if self._closed:
+            return False
+        if any(record.get(key) in (None, '') for key in REQUIRED_KEYS):
+            self.rejected += 1
+            return False
+        if not record.get('created_at'):
+            record = {**record, 'created_at': datetime.now().isoformat()}
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def log_many(self, records: Iterable[Dict]) -> int:
+        """Queue several predictions, returns how many were accepted"""
+        return sum(1 for record in records if self.log(record))
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Write everything queued so far (True if done within timeout)"""
+        if self._closed or not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 10.0):
+        """Drain the queue and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict:
+        return {
+            'queued': self._queue.qsize(),
+            'written': self.written,
+            'dropped': self.dropped,
+            'rejected': self.rejected,
+            'errors': self.errors,
+        }
+
+    def _write(self, batch: List[Dict]):
+        if not batch:
+            return
+        try:
+            self.written += self.tracker.record_predictions(batch)
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ Prediction logger: could not write {len(batch)} predictions: {e}")
+        batch.clear()
+
+    def _run(self):
+        batch: List[Dict] = []
+        deadline = time.monotonic() + self.flush_interval
+
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._write(batch)
+                return
+            if isinstance(item, threading.Event):
+                self._write(batch)
+                item.set()
+            elif item is not None:
+                batch.append(item)
+
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._write(batch)
+                deadline = time.monotonic() + self.flush_interval
+
+
+# =============================================================================
+# PROCESS-WIDE REGISTRY (one writer per CLV database)
+# =============================================================================
+
+_loggers: Dict[str, PredictionLogger] = {}
+_loggers_lock = threading.Lock()
+
+
+def get_prediction_logger(tracker: Optional[CLVTracker] = None,
+                          db_path: str = DEFAULT_CLV_DB) -> PredictionLogger:
+    """
+    Get the shared PredictionLogger
+
+    Args:
+        tracker: Existing CLVTracker (its db_path wins over db_path)
+        db_path: CLV database used when no tracker is given
+    """
+    if tracker is not None:
+        db_path = tracker.db_path
+
+    key = os.path.abspath(db_path)
+    with _loggers_lock:
+        logger = _loggers.get(key)
+        if logger is None:
+            logger = PredictionLogger(tracker or CLVTracker(db_path=db_path))
+            _loggers[key] = logger
+        return logger
+
+
+@atexit.register
+def _close_loggers():
+    with _loggers_lock:
+        loggers = list(_loggers.values())
+    for logger in loggers:
+        logger.close()
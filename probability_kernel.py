@@ -0,0 +1,183 @@
+"""
+PROBABILITY KERNEL - Gemeinsame Poisson pmf/cdf Lookup-Tabellen
+================================================================
+Die Schleife "sum(λ**k * exp(-λ) / factorial(k))" steckte in jedem Modul
+(Analyzer, Live-Scanner, Karten, Ecken, Best-Bet-Finder) und berechnete die
+Fakultäten bei jedem Aufruf neu. Dieses Modul rechnet pmf und cdf einmal beim
+Import auf einem feinen λ-Raster vor:
+
+- λ = 0 .. LAMBDA_MAX in Schritten von LAMBDA_STEP, k = 0 .. K_MAX
+- Werte zwischen zwei Rasterpunkten werden linear interpoliert (Fehler < 1e-4)
+- außerhalb des Rasters (großes λ oder k) wird exakt im Log-Raum gerechnet
+- alle Funktionen sind vektorisiert (Skalare oder NumPy-Arrays)
+
+Für Ecken (überdispersiv, Ecken kommen in Serien) gibt es die Negative Binomial
+mit Mittelwert μ und Dispersion r (Var = μ + μ²/r), komplett im Log-Raum über
+gammaln - math.gamma(k + r) lief für realistische r über und fiel dann still
+auf Poisson zurück. Mittelwerte, Dispersionen und Linien dürfen Arrays sein.
+Karten bleiben bewusst Poisson, Tore O/U kommen aus der Dixon-Coles Matrix
+(scoreline_engine), damit sie zu 1X2/BTTS passen.
+
+Usage:
+    from probability_kernel import over, at_least, nb_over
+
+    over(2.7, 2.5)          # P(X > 2.5)
+    at_least(1.4, 1)        # P(X >= 1)
+    over(np.array([8.1, 9.4]), 9.5)
+    nb_over(10.2, np.array([8.5, 9.5, 10.5]), dispersion=5.0)
+"""
+
+import math
+from typing import Union
+
+import numpy as np
+
+try:
+    from scipy.special import gammaln
+    SCIPY_AVAILABLE = True
+except ImportError:
+    gammaln = np.vectorize(math.lgamma, otypes=[float])
+    SCIPY_AVAILABLE = False
+
+LAMBDA_MAX = 30.0
+LAMBDA_STEP = 0.01
+K_MAX = 60
+
+ArrayLike = Union[float, int, np.ndarray]
+
+# log(k!) - auch für scoreline_engine
+LOG_FACTORIAL = np.array([math.lgamma(k + 1) for k in range(256)])
+
+
+def pmf_table(lams: ArrayLike, max_k: int) -> np.ndarray:
+    """Exact P(X = k) for k = 0..max_k, one row per λ (λ <= 0 → all mass on 0)"""
+    lams = np.asarray(lams, dtype=float)[..., None]
+    k = np.arange(max_k + 1)
+    safe = np.where(lams > 0, lams, 1.0)
+    table = np.exp(k * np.log(safe) - safe - LOG_FACTORIAL[:max_k + 1])
+    return np.where(lams > 0, table, (k == 0).astype(float))
+
+
+def _build_tables():
+    lams = np.arange(int(round(LAMBDA_MAX / LAMBDA_STEP)) + 1) * LAMBDA_STEP
+    pmf = pmf_table(lams, K_MAX)
+    return pmf, np.minimum(np.cumsum(pmf, axis=1), 1.0)
+
+
+_PMF, _CDF = _build_tables()
+_LAST_ROW = len(_PMF) - 2
+
+
+def _exact_pmf(lam: float, k: int) -> float:
+    if k < 0:
+        return 0.0
+    if lam <= 0:
+        return 1.0 if k == 0 else 0.0
+    return math.exp(k * math.log(lam) - lam - math.lgamma(k + 1))
+
+
+def _exact_cdf(lam: float, k: int) -> float:
+    if k < 0:
+        return 0.0
+    if lam <= 0:
+        return 1.0
+    return min(1.0, float(pmf_table(lam, k).sum()))
+
+
+def _lookup(table: np.ndarray, exact, lam: ArrayLike, k: ArrayLike) -> ArrayLike:
+    """Interpolate table[λ, k] on the grid, exact fallback outside"""
+    if np.isscalar(lam) and np.isscalar(k):
+        lam, k = float(lam), int(k)
+        if k < 0 or lam <= 0 or lam > LAMBDA_MAX or k > K_MAX:
+            return exact(lam, k)
+        pos = lam / LAMBDA_STEP
+        i = min(int(pos), _LAST_ROW)
+        frac = pos - i
+        return float(table[i, k] * (1 - frac) + table[i + 1, k] * frac)
+
+    lam, k = np.broadcast_arrays(np.asarray(lam, dtype=float), np.asarray(k, dtype=int))
+    result = np.empty(lam.shape)
+    on_grid = (k >= 0) & (lam > 0) & (lam <= LAMBDA_MAX) & (k <= K_MAX)
+
+    pos = lam[on_grid] / LAMBDA_STEP
+    i = np.minimum(pos.astype(int), _LAST_ROW)
+    frac = pos - i
+    kk = k[on_grid]
+    result[on_grid] = table[i, kk] * (1 - frac) + table[i + 1, kk] * frac
+
+    for idx in zip(*np.nonzero(~on_grid)):
+        result[idx] = exact(float(lam[idx]), int(k[idx]))
+    return result
+
+
+def pmf(lam: ArrayLike, k: ArrayLike) -> ArrayLike:
+    """P(X = k)"""
+    return _lookup(_PMF, _exact_pmf, lam, k)
+
+
+def cdf(lam: ArrayLike, k: ArrayLike) -> ArrayLike:
+    """P(X <= k)"""
+    return _lookup(_CDF, _exact_cdf, lam, k)
+
+
+def at_least(lam: ArrayLike, k: ArrayLike) -> ArrayLike:
+    """P(X >= k) - 1 for k <= 0"""
+    if np.isscalar(k):
+        return 1 - cdf(lam, int(k) - 1)
+    return 1 - cdf(lam, np.asarray(k, dtype=int) - 1)
+
+
+def over(lam: ArrayLike, line: ArrayLike) -> ArrayLike:
+    """P(X > line), e.g. over(λ, 2.5) = P(X >= 3)"""
+    if np.isscalar(line):
+        return 1 - cdf(lam, math.floor(line))
+    return 1 - cdf(lam, np.floor(np.asarray(line, dtype=float)).astype(int))
+
+
+# =============================================================================
+# NEGATIVE BINOMIAL (log space)
+# =============================================================================
+
+def _all_scalar(*values) -> bool:
+    return all(np.isscalar(v) for v in values)
+
+
+def nb_pmf(k: ArrayLike, mean: ArrayLike, dispersion: ArrayLike) -> ArrayLike:
+    """
+    P(X = k) for NB with mean μ and dispersion r
+
+    P(X=k) = Γ(k+r) / (Γ(k+1) Γ(r)) · (r/(r+μ))^r · (μ/(r+μ))^k
+    μ <= 0 → all mass on 0
+    """
+    scalar = _all_scalar(k, mean, dispersion)
+    k = np.asarray(k, dtype=float)
+    mean = np.asarray(mean, dtype=float)
+    r = np.asarray(dispersion, dtype=float)
+
+    safe_mean = np.where(mean > 0, mean, 1.0)
+    log_pmf = (gammaln(k + r) - gammaln(k + 1) - gammaln(r)
+               + r * np.log(r / (r + safe_mean)) + k * np.log(safe_mean / (r + safe_mean)))
+    result = np.where(mean > 0, np.exp(log_pmf), (k == 0).astype(float))
+    result = np.where(k < 0, 0.0, result)
+    return float(result) if scalar else result
+
+
+def nb_cdf(k: ArrayLike, mean: ArrayLike, dispersion: ArrayLike) -> ArrayLike:
+    """P(X <= k), broadcasting k, mean and dispersion"""
+    scalar = _all_scalar(k, mean, dispersion)
+    k, mean, r = np.broadcast_arrays(np.floor(np.asarray(k, dtype=float)).astype(int),
+                                     np.asarray(mean, dtype=float), np.asarray(dispersion, dtype=float))
+    k_max = max(int(k.max()), 0) if k.size else 0
+
+    # pmf 0..k_max einmal pro (μ, r), danach nur noch cumsum + Index
+    pmf = nb_pmf(np.arange(k_max + 1), mean[..., None], r[..., None])
+    cdf = np.cumsum(pmf, axis=-1)
+    result = np.take_along_axis(cdf, np.clip(k, 0, k_max)[..., None], axis=-1)[..., 0]
+    result = np.where(k < 0, 0.0, np.minimum(result, 1.0))
+    return float(result) if scalar else result
+
+
+def nb_over(mean: ArrayLike, line: ArrayLike, dispersion: ArrayLike) -> ArrayLike:
+    """P(X > line), e.g. nb_over(10.2, 9.5, 5.0) = P(X >= 10)"""
+    return 1 - nb_cdf(np.floor(line) if np.isscalar(line) else np.floor(np.asarray(line, dtype=float)),
+                      mean, dispersion)
@@ -0,0 +1,201 @@
+"""
+RATE LIMITER - Prozessweiter Token-Bucket für API-Football
+===========================================================
+Ein Limiter pro API-Key, geteilt von allen Modulen und Threads.
+
+- Token-Bucket: rate = Requests/Sekunde, capacity = erlaubter Burst
+- Passt sich an die Quota-Header der API an:
+    X-RateLimit-Limit / X-RateLimit-Remaining          (pro Minute)
+    x-ratelimit-requests-limit / -requests-remaining   (pro Tag)
+- 429 → Bucket leeren + Cooldown (Retry-After)
+- Wartende Aufrufer werden FIFO bedient (Ticket-Queue), kein Busy-Sleep
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+# Vor dem ersten Response: konservativ wie bisher (1 Request/Sekunde)
+DEFAULT_RATE = 1.0
+DEFAULT_CAPACITY = 1.0
+
+# Burst = so viele Sekunden Quota auf einmal
+BURST_SECONDS = 10
+
+# Unter dieser Tagesquota wird gewarnt
+DAILY_QUOTA_WARNING = 100
+
+
+def _header_int(headers, name: str) -> Optional[int]:
+    """Read an integer header (case-insensitive), None if missing/invalid"""
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucketRateLimiter:
+    """
+    Thread-safe token bucket with FIFO waiting
+
+    Usage:
+        limiter.acquire()                 # blocks until a token is free
+        response = session.get(...)
+        limiter.update_from_response(response)
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: float = DEFAULT_CAPACITY):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+        self.cooldown_until = 0.0
+        self.minute_limit: Optional[int] = None
+        self.daily_limit: Optional[int] = None
+        self.daily_remaining: Optional[int] = None
+
+        self._cond = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+        self._abandoned = set()
+
+        self.total_acquired = 0
+        self.total_wait = 0.0
+        self.throttled = 0
+
+    def _refill(self, now: float):
+        """Add tokens for the elapsed time (caller holds the lock)"""
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take one token, waiting in FIFO order if the bucket is empty
+
+        Args:
+            timeout: Max seconds to wait (None = wait as long as needed)
+
+        Returns:
+            True if a token was taken, False on timeout
+        """
+        start = time.monotonic()
+
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+
+                    if ticket == self._serving and now >= self.cooldown_until and self.tokens >= 1:
+                        self.tokens -= 1
+                        self.total_acquired += 1
+                        self.total_wait += now - start
+                        return True
+
+                    if ticket == self._serving:
+                        wait = max(self.cooldown_until - now, (1 - self.tokens) / self.rate, 0.001)
+                    else:
+                        wait = None  # Nicht dran → auf notify warten
+
+                    if timeout is not None:
+                        remaining = timeout - (now - start)
+                        if remaining <= 0:
+                            return False
+                        wait = remaining if wait is None else min(wait, remaining)
+
+                    self._cond.wait(wait)
+            finally:
+                # Ticket abgeben (auch bei Timeout), nächsten Wartenden wecken
+                if ticket == self._serving:
+                    self._serving += 1
+                else:
+                    self._abandoned.add(ticket)
+                while self._serving in self._abandoned:
+                    self._abandoned.discard(self._serving)
+                    self._serving += 1
+                self._cond.notify_all()
+
+    def update_from_response(self, response) -> None:
+        """Adapt rate/capacity from API-Football quota headers and status code"""
+        headers = getattr(response, 'headers', None) or {}
+        status_code = getattr(response, 'status_code', 200)
+
+        minute_limit = _header_int(headers, 'X-RateLimit-Limit')
+        minute_remaining = _header_int(headers, 'X-RateLimit-Remaining')
+        daily_limit = _header_int(headers, 'x-ratelimit-requests-limit')
+        daily_remaining = _header_int(headers, 'x-ratelimit-requests-remaining')
+
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+
+            if minute_limit and minute_limit > 0:
+                self.minute_limit = minute_limit
+                self.rate = minute_limit / 60.0
+                self.capacity = max(1.0, self.rate * BURST_SECONDS)
+
+            # Server weiß es besser: nie mehr Tokens als Restquota dieser Minute
+            if minute_remaining is not None:
+                self.tokens = min(self.tokens, float(minute_remaining))
+
+            if daily_limit is not None:
+                self.daily_limit = daily_limit
+            if daily_remaining is not None:
+                self.daily_remaining = daily_remaining
+                if daily_remaining < DAILY_QUOTA_WARNING and daily_remaining % 25 == 0:
+                    print(f"⚠️ API-Football daily quota low: {daily_remaining} requests left")
+
+            if status_code == 429:
+                retry_after = _header_int(headers, 'Retry-After')
+                cooldown = retry_after if retry_after is not None else 60.0 / (self.minute_limit or 60)
+                self.cooldown_until = max(self.cooldown_until, now + max(cooldown, 1.0))
+                self.tokens = 0.0
+                self.updated_at = self.cooldown_until  # Kein Nachfüllen während Cooldown
+                self.throttled += 1
+                print(f"⚠️ API-Football 429 - pausing {cooldown:.0f}s")
+
+            self._cond.notify_all()
+
+    def stats(self) -> Dict:
+        """Current limiter state"""
+        with self._cond:
+            self._refill(time.monotonic())
+            return {
+                'rate_per_min': round(self.rate * 60, 1),
+                'capacity': round(self.capacity, 1),
+                'tokens': round(self.tokens, 2),
+                'waiting': self._next_ticket - self._serving - len(self._abandoned),
+                'minute_limit': self.minute_limit,
+                'daily_limit': self.daily_limit,
+                'daily_remaining': self.daily_remaining,
+                'acquired': self.total_acquired,
+                'avg_wait': self.total_wait / self.total_acquired if self.total_acquired else 0.0,
+                'throttled': self.throttled,
+            }
+
+
+# =============================================================================
+# PROCESS-WIDE REGISTRY (one limiter per API key)
+# =============================================================================
+
+_limiters: Dict[str, TokenBucketRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(api_key: str) -> TokenBucketRateLimiter:
+    """Get the shared rate limiter for an API key"""
+    with _limiters_lock:
+        limiter = _limiters.get(api_key)
+        if limiter is None:
+            limiter = TokenBucketRateLimiter()
+            _limiters[api_key] = limiter
+        return limiter
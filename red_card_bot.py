@@ -12,10 +12,11 @@ KEINE FAKE DATEN - ALLES ECHT!
 
 import os
 import json
-import requests
 from datetime import datetime
 from typing import Dict, List, Set, Optional
 
+from api_football import get_api_football, get_http_session
+
 # Import predictor
 try:
     from red_card_impact_predictor import RedCardImpactPredictor
@@ -53,8 +54,8 @@ class RedCardBotEnhanced:
         if not self.api_key:
             raise ValueError("❌ API_FOOTBALL_KEY not set!")
         
-        self.base_url = "https://v3.football.api-sports.io"
-        self.headers = {'x-apisports-key': self.api_key}
+        # Shared API-Football client (pooled session, rate limit, response cache)
+        self.api = get_api_football(self.api_key)
         
         # Initialize predictor
         if PREDICTOR_AVAILABLE:
@@ -108,9 +109,8 @@ class RedCardBotEnhanced:
         - corners_home, corners_away: Corners
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/fixtures/statistics",
-                headers=self.headers,
+            response = self.api.get(
+                'fixtures/statistics',
                 params={'fixture': fixture_id},
                 timeout=15
             )
@@ -190,9 +190,8 @@ class RedCardBotEnhanced:
             else:
                 print("📡 Fetching live matches...")
             
-            response = requests.get(
-                f"{self.base_url}/fixtures",
-                headers=self.headers,
+            response = self.api.get(
+                'fixtures',
                 params={'live': 'all'},
                 timeout=15
             )
@@ -233,9 +232,8 @@ class RedCardBotEnhanced:
         try:
             fixture_id = match['fixture']['id']
             
-            response = requests.get(
-                f"{self.base_url}/fixtures/events",
-                headers=self.headers,
+            response = self.api.get(
+                'fixtures/events',
                 params={'fixture': fixture_id},
                 timeout=15
             )
@@ -370,7 +368,7 @@ class RedCardBotEnhanced:
         # Send to Telegram
         try:
             url = f"https://api.telegram.org/bot{self.telegram_token}/sendMessage"
-            response = requests.post(url, json={
+            response = get_http_session().post(url, json={
                 'chat_id': self.telegram_chat_id,
                 'text': message,
                 'parse_mode': 'Markdown'
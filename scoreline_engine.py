@@ -0,0 +1,352 @@
+"""
+SCORELINE ENGINE - Eine Scoreline-Matrix für alle Tor-Märkte
+=============================================================
+Statt für jeden Markt die 9×9 Score-Tabelle in Python-Schleifen neu zu
+bauen (poisson_probability / dixon_coles_adjustment 81× pro Aufruf), wird
+die gemeinsame Verteilung P(Heim = i, Auswärts = j) einmal als NumPy
+Outer-Product aufgebaut und mit Dixon-Coles (1997) korrigiert:
+
+    M = outer(Poisson(λh), Poisson(λa)),  M[:2, :2] *= τ(λh, λa, ρ)
+
+Alle Märkte sind danach nur noch Reduktionen derselben Matrix:
+1X2, Doppelte Chance, Over/Under (alle Linien), BTTS, Clean Sheets,
+Team-Totals, exakte Ergebnisse, Siegmargen, Asian Handicaps.
+
+Für ganze Spieltage rechnet price_fixtures() N Fixtures auf einmal über
+einen N×G×G Tensor (Broadcasting, keine Python-Schleife pro Fixture) und
+liefert ein DataFrame mit einer Zeile pro Fixture und einer Spalte pro Markt.
+Daten holen und Pricing bleiben getrennt: erst alle λ sammeln, dann einmal rechnen.
+
+Usage:
+    matrix = ScorelineMatrix.from_lambdas(1.6, 1.1, rho=-0.10)
+    home, draw, away = matrix.match_result()
+    markets = matrix.markets()
+
+    prices = price_fixtures(home_lambdas, away_lambdas, rhos, index=fixture_ids)
+    prices.loc[fixture_id, 'over_2.5']
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from probability_kernel import pmf_table
+
+DEFAULT_MAX_GOALS = 10
+DEFAULT_RHO = -0.10
+
+OVER_UNDER_LINES = (0.5, 1.5, 2.5, 3.5, 4.5, 5.5)
+TEAM_TOTAL_LINES = (0.5, 1.5, 2.5, 3.5)
+ASIAN_HANDICAP_LINES = (-2.5, -2.0, -1.5, -1.0, -0.75, -0.5, -0.25, 0.0,
+                        0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 2.5)
+
+
+def poisson_pmf(lam: float, max_goals: int = DEFAULT_MAX_GOALS) -> np.ndarray:
+    """P(X = k) for k = 0..max_goals (λ <= 0 → all mass on 0)"""
+    return pmf_table(lam, max_goals)
+
+
+def dixon_coles_tau(home_lambda: float, away_lambda: float, rho: float = DEFAULT_RHO) -> np.ndarray:
+    """
+    2×2 low-score correction τ[home_goals, away_goals] (Dixon & Coles 1997)
+
+    0-0: 1 - λh·λa·ρ   0-1: 1 + λh·ρ   1-0: 1 + λa·ρ   1-1: 1 - ρ
+    """
+    tau = np.array([[1 - home_lambda * away_lambda * rho, 1 + home_lambda * rho],
+                    [1 + away_lambda * rho, 1 - rho]])
+    return np.maximum(tau, 0.01)
+
+
+def poisson_pmf_batch(lams: np.ndarray, max_goals: int = DEFAULT_MAX_GOALS) -> np.ndarray:
+    """N×(G+1) pmf table, one row per λ"""
+    return pmf_table(np.asarray(lams, dtype=float), max_goals)
+
+
+def dixon_coles_tau_batch(home_lambdas: np.ndarray, away_lambdas: np.ndarray, rhos: np.ndarray) -> np.ndarray:
+    """N×2×2 version of dixon_coles_tau()"""
+    tau = np.empty((len(home_lambdas), 2, 2))
+    tau[:, 0, 0] = 1 - home_lambdas * away_lambdas * rhos
+    tau[:, 0, 1] = 1 + home_lambdas * rhos
+    tau[:, 1, 0] = 1 + away_lambdas * rhos
+    tau[:, 1, 1] = 1 - rhos
+    return np.maximum(tau, 0.01)
+
+
+@lru_cache(maxsize=8)
+def _projections(max_goals: int) -> Tuple[np.ndarray, np.ndarray]:
+    """0/1 matrices (G+1)²×(2G+1) mapping flattened scorelines to total goals and margin + G"""
+    g = np.arange(max_goals + 1)
+    size = 2 * max_goals + 1
+    totals = (g[:, None] + g[None, :]).ravel()
+    margins = (g[:, None] - g[None, :] + max_goals).ravel()
+    return np.eye(size)[totals], np.eye(size)[margins]
+
+
+def _over_under_arrays(dist: np.ndarray, lines: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """(P(X > line), P(X < line)) for goal-count distributions (..., K) → (..., L)"""
+    k = np.arange(dist.shape[-1])[:, None]
+    line_arr = np.asarray(lines, dtype=float)[None, :]
+    return dist @ (k > line_arr), dist @ (k < line_arr)
+
+
+def _asian_handicap_arrays(margins: np.ndarray, line: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(home, push, away) for margin distributions (..., 2G+1); quarter lines average both halves"""
+    if (line * 4) % 2 == 1:
+        low, high = _asian_handicap_arrays(margins, line - 0.25), _asian_handicap_arrays(margins, line + 0.25)
+        return tuple((l + h) / 2 for l, h in zip(low, high))
+    max_goals = (margins.shape[-1] - 1) // 2
+    adjusted = np.arange(-max_goals, max_goals + 1) + line
+    return margins @ (adjusted > 0), margins @ (adjusted == 0), margins @ (adjusted < 0)
+
+
+def _over_under(dist: np.ndarray, lines: Iterable[float]) -> Dict[float, Tuple[float, float]]:
+    """{line: (P(X > line), P(X < line))} from a goal-count distribution (whole lines push)"""
+    lines = list(lines)
+    if not lines:
+        return {}
+    over, under = _over_under_arrays(dist, lines)
+    return {line: (float(o), float(u)) for line, o, u in zip(lines, over, under)}
+
+
+class ScorelineMatrix:
+    """
+    Joint scoreline distribution and every goal market derived from it
+
+    Args:
+        matrix: (G+1)×(G+1) array, matrix[i, j] = P(home i, away j)
+    """
+
+    def __init__(self, matrix: np.ndarray):
+        self.matrix = matrix
+        self.max_goals = matrix.shape[0] - 1
+
+    @classmethod
+    def from_lambdas(cls, home_lambda: float, away_lambda: float, rho: float = DEFAULT_RHO,
+                     max_goals: int = DEFAULT_MAX_GOALS, tau: Optional[np.ndarray] = None,
+                     normalize: bool = True) -> 'ScorelineMatrix':
+        """
+        Build the Dixon-Coles adjusted matrix from expected goals
+
+        Args:
+            rho: Dixon-Coles ρ (0 = independent Poisson)
+            tau: Custom correction multiplied into the top-left corner
+                 (2×2 low-score τ or a full-size matrix, overrides rho)
+            normalize: Rescale to sum 1 (mass beyond max_goals is dropped)
+        """
+        matrix = np.outer(poisson_pmf(home_lambda, max_goals), poisson_pmf(away_lambda, max_goals))
+        if tau is None and rho:
+            tau = dixon_coles_tau(home_lambda, away_lambda, rho)
+        if tau is not None:
+            matrix[:tau.shape[0], :tau.shape[1]] *= tau
+        if normalize:
+            total = matrix.sum()
+            if total > 0:
+                matrix /= total
+        return cls(matrix)
+
+    # -------------------------------------------------------------------------
+    # Verteilungen
+    # -------------------------------------------------------------------------
+
+    def home_goals(self) -> np.ndarray:
+        """P(home scores k)"""
+        return self.matrix.sum(axis=1)
+
+    def away_goals(self) -> np.ndarray:
+        """P(away scores k)"""
+        return self.matrix.sum(axis=0)
+
+    def total_goals(self) -> np.ndarray:
+        """P(total goals = k) for k = 0..2G"""
+        return self.matrix.ravel() @ _projections(self.max_goals)[0]
+
+    def margins(self) -> np.ndarray:
+        """P(home - away = m) for m = -G..G (index m + G)"""
+        return self.matrix.ravel() @ _projections(self.max_goals)[1]
+
+    # -------------------------------------------------------------------------
+    # Märkte
+    # -------------------------------------------------------------------------
+
+    def match_result(self) -> Tuple[float, float, float]:
+        """(Home Win, Draw, Away Win)"""
+        margins = self.margins()
+        g = self.max_goals
+        return float(margins[g + 1:].sum()), float(margins[g]), float(margins[:g].sum())
+
+    def double_chance(self) -> Tuple[float, float, float]:
+        """(1X, X2, 12)"""
+        home, draw, away = self.match_result()
+        return home + draw, draw + away, home + away
+
+    def over_under(self, lines: Iterable[float] = OVER_UNDER_LINES) -> Dict[float, Tuple[float, float]]:
+        """{line: (over, under)} for total goals"""
+        return _over_under(self.total_goals(), lines)
+
+    def btts(self) -> Tuple[float, float]:
+        """(BTTS Yes, BTTS No) - Yes = 1 - P(one side scoreless)"""
+        no = float(self.matrix[0, :].sum() + self.matrix[1:, 0].sum())
+        return 1 - no, no
+
+    def clean_sheets(self) -> Tuple[float, float]:
+        """(home keeps a clean sheet, away keeps a clean sheet)"""
+        return float(self.matrix[:, 0].sum()), float(self.matrix[0, :].sum())
+
+    def team_totals(self, lines: Iterable[float] = TEAM_TOTAL_LINES) -> Dict[str, Dict[float, Tuple[float, float]]]:
+        """{'home': {line: (over, under)}, 'away': {...}}"""
+        lines = list(lines)
+        return {'home': _over_under(self.home_goals(), lines),
+                'away': _over_under(self.away_goals(), lines)}
+
+    def exact_scores(self, top_n: int = 10) -> List[Tuple[Tuple[int, int], float]]:
+        """Most likely scorelines [((home, away), prob), ...]"""
+        flat = self.matrix.ravel()
+        top = np.argsort(flat)[::-1][:top_n]
+        size = self.max_goals + 1
+        return [((int(i // size), int(i % size)), float(flat[i])) for i in top]
+
+    def winning_margins(self, max_margin: int = 3) -> Dict[str, float]:
+        """{'home_1', 'home_2', 'home_3+', 'draw', 'away_1', ...}"""
+        margins = self.margins()
+        g = self.max_goals
+        result = {}
+        for side, sign in (('home', 1), ('away', -1)):
+            for m in range(1, max_margin):
+                result[f'{side}_{m}'] = float(margins[g + sign * m])
+            tail = margins[g + max_margin:] if sign > 0 else margins[:g - max_margin + 1]
+            result[f'{side}_{max_margin}+'] = float(tail.sum())
+        result['draw'] = float(margins[g])
+        return result
+
+    def asian_handicap(self, line: float) -> Dict[str, float]:
+        """
+        Home handicap `line` → {'home', 'push', 'away'}
+
+        Quarter lines (±0.25, ±0.75) split the stake over the two
+        neighbouring lines, the result is the average of both halves.
+        """
+        home, push, away = _asian_handicap_arrays(self.margins(), line)
+        return {'home': float(home), 'push': float(push), 'away': float(away)}
+
+    def as_dict(self) -> Dict[Tuple[int, int], float]:
+        """{(home_goals, away_goals): prob} like the old score tables"""
+        size = self.max_goals + 1
+        return {(i, j): float(self.matrix[i, j]) for i in range(size) for j in range(size)}
+
+    def markets(self) -> Dict:
+        """All goal markets in one dict"""
+        home, draw, away = self.match_result()
+        btts_yes, btts_no = self.btts()
+        home_cs, away_cs = self.clean_sheets()
+        return {
+            'match_result': {'home': home, 'draw': draw, 'away': away},
+            'double_chance': dict(zip(('1X', 'X2', '12'), self.double_chance())),
+            'over_under': self.over_under(),
+            'btts': {'yes': btts_yes, 'no': btts_no},
+            'clean_sheet': {'home': home_cs, 'away': away_cs},
+            'team_totals': self.team_totals(),
+            'exact_scores': self.exact_scores(),
+            'winning_margins': self.winning_margins(),
+            'asian_handicap': {line: self.asian_handicap(line) for line in ASIAN_HANDICAP_LINES},
+        }
+
+
+# =============================================================================
+# BATCH PRICING (N fixtures at once)
+# =============================================================================
+
+def scoreline_tensor(home_lambdas: Sequence[float], away_lambdas: Sequence[float],
+                     rhos: Union[float, Sequence[float]] = DEFAULT_RHO,
+                     max_goals: int = DEFAULT_MAX_GOALS, normalize: bool = True) -> np.ndarray:
+    """
+    N×(G+1)×(G+1) Dixon-Coles scoreline tensor
+
+    Args:
+        rhos: One ρ per fixture (e.g. per league) or a scalar for all
+    """
+    home_lambdas = np.asarray(home_lambdas, dtype=float)
+    away_lambdas = np.asarray(away_lambdas, dtype=float)
+    rhos = np.broadcast_to(np.asarray(rhos, dtype=float), home_lambdas.shape)
+
+    tensor = poisson_pmf_batch(home_lambdas, max_goals)[:, :, None] * poisson_pmf_batch(away_lambdas, max_goals)[:, None, :]
+    tensor[:, :2, :2] *= dixon_coles_tau_batch(home_lambdas, away_lambdas, rhos)
+    if normalize:
+        totals = tensor.sum(axis=(1, 2), keepdims=True)
+        tensor /= np.where(totals > 0, totals, 1.0)
+    return tensor
+
+
+def price_fixtures(home_lambdas: Sequence[float], away_lambdas: Sequence[float],
+                   rhos: Union[float, Sequence[float]] = DEFAULT_RHO,
+                   max_goals: int = DEFAULT_MAX_GOALS, index: Optional[Sequence] = None,
+                   ou_lines: Sequence[float] = OVER_UNDER_LINES,
+                   team_total_lines: Sequence[float] = TEAM_TOTAL_LINES,
+                   ah_lines: Sequence[float] = ASIAN_HANDICAP_LINES) -> pd.DataFrame:
+    """
+    Price every goal market for N fixtures in one pass
+
+    Args:
+        home_lambdas / away_lambdas: Expected goals per fixture
+        rhos: Dixon-Coles ρ per fixture (or scalar)
+        index: Row labels, e.g. fixture ids
+
+    Returns:
+        DataFrame, one row per fixture: home_win, draw, away_win, dc_1X, dc_X2,
+        dc_12, btts_yes, btts_no, over_<line>, under_<line>, home_clean_sheet,
+        away_clean_sheet, home_over_<line>, away_over_<line>, ah_<line>_home/
+        _push/_away (home handicap)
+    """
+    home_lambdas = np.asarray(home_lambdas, dtype=float)
+    away_lambdas = np.asarray(away_lambdas, dtype=float)
+    rhos = np.broadcast_to(np.asarray(rhos, dtype=float), home_lambdas.shape)
+
+    tensor = scoreline_tensor(home_lambdas, away_lambdas, rhos, max_goals)
+    flat = tensor.reshape(len(tensor), (max_goals + 1) ** 2)
+    to_total, to_margin = _projections(max_goals)
+    totals, margins = flat @ to_total, flat @ to_margin
+
+    home_win = margins[:, max_goals + 1:].sum(axis=1)
+    draw = margins[:, max_goals]
+    away_win = margins[:, :max_goals].sum(axis=1)
+    home_cs = tensor[:, :, 0].sum(axis=1)
+    away_cs = tensor[:, 0, :].sum(axis=1)
+    btts_no = home_cs + away_cs - tensor[:, 0, 0]
+
+    columns = {
+        'home_lambda': home_lambdas,
+        'away_lambda': away_lambdas,
+        'rho': rhos,
+        'home_win': home_win,
+        'draw': draw,
+        'away_win': away_win,
+        'dc_1X': home_win + draw,
+        'dc_X2': draw + away_win,
+        'dc_12': home_win + away_win,
+        'btts_yes': 1 - btts_no,
+        'btts_no': btts_no,
+        'home_clean_sheet': home_cs,
+        'away_clean_sheet': away_cs,
+    }
+
+    if len(ou_lines):
+        over, under = _over_under_arrays(totals, ou_lines)
+        for i, line in enumerate(ou_lines):
+            columns[f'over_{line}'] = over[:, i]
+            columns[f'under_{line}'] = under[:, i]
+
+    if len(team_total_lines):
+        for side, dist in (('home', tensor.sum(axis=2)), ('away', tensor.sum(axis=1))):
+            over, under = _over_under_arrays(dist, team_total_lines)
+            for i, line in enumerate(team_total_lines):
+                columns[f'{side}_over_{line}'] = over[:, i]
+                columns[f'{side}_under_{line}'] = under[:, i]
+
+    for line in ah_lines:
+        home, push, away = _asian_handicap_arrays(margins, line)
+        columns[f'ah_{line}_home'] = home
+        columns[f'ah_{line}_push'] = push
+        columns[f'ah_{line}_away'] = away
+
+    return pd.DataFrame(columns, index=index)
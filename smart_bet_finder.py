@@ -19,10 +19,17 @@ import streamlit as st
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 import math
-import requests
 from datetime import datetime
 import os
 
+from api_football import get_api_football, get_http_session
+
+try:
+    from prediction_logger import get_prediction_logger
+    PREDICTION_LOGGER_AVAILABLE = True
+except ImportError:
+    PREDICTION_LOGGER_AVAILABLE = False
+
 
 @dataclass
 class SmartBet:
@@ -128,7 +135,7 @@ class OddsAPIClient:
             'oddsFormat': 'decimal'
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = get_http_session().get(url, params=params, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -144,17 +151,16 @@ class OddsAPIClient:
     def _get_from_api_football(self, home_team: str, away_team: str) -> Dict:
         """Get odds from API-Football"""
         # This would need fixture_id, simplified for now
-        headers = {'x-apisports-key': self.api_football_key}
+        api = get_api_football(self.api_football_key)
         
         # Search for fixture first
-        url = "https://v3.football.api-sports.io/fixtures"
         params = {
             'search': home_team,
             'next': 5  # Next 5 fixtures
         }
         
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = api.get('fixtures', params=params, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 fixtures = data.get('response', [])
@@ -170,12 +176,10 @@ class OddsAPIClient:
     
     def _get_api_football_odds(self, fixture_id: int) -> Dict:
         """Get odds for specific fixture from API-Football"""
-        headers = {'x-apisports-key': self.api_football_key}
-        url = f"https://v3.football.api-sports.io/odds"
         params = {'fixture': fixture_id}
         
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = get_api_football(self.api_football_key).get('odds', params=params, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 return self._parse_api_football_odds(data.get('response', []))
@@ -422,11 +426,12 @@ class SmartBetFinder:
     
     def find_value_bets(self, analysis_results: Dict, 
                         home_team: str = None, away_team: str = None,
-                        min_edge: float = 3.0) -> List[SmartBet]:
+                        min_edge: float = 3.0, fixture_id: int = None) -> List[SmartBet]:
         """
         Finde Value Bets aus allen Märkten
         
         VERBESSERT: Nutzt echte Odds wenn verfügbar
+        Mit fixture_id werden die Value Bets asynchron für das CLV-Tracking geloggt.
         """
         value_bets = []
         
@@ -459,8 +464,16 @@ class SmartBetFinder:
         
         # Sort by edge
         value_bets.sort(key=lambda x: x.edge, reverse=True)
+        value_bets = value_bets[:10]  # Top 10
+        
+        # Nur die zurückgegebenen Tipps loggen (Wiederholungen dedupliziert der CLVTracker)
+        if fixture_id and PREDICTION_LOGGER_AVAILABLE:
+            self._log_predictions(fixture_id,
+                                  home_team or analysis_results.get('home_team', 'Home'),
+                                  away_team or analysis_results.get('away_team', 'Away'),
+                                  value_bets)
         
-        return value_bets[:10]  # Top 10
+        return value_bets
     
     def find_high_confidence_bets(self, analysis_results: Dict,
                                    home_team: str = None, away_team: str = None,
@@ -611,6 +624,41 @@ class SmartBetFinder:
         
         return probs
     
+    def _log_predictions(self, fixture_id: int, home_team: str, away_team: str,
+                         bets: List[SmartBet]):
+        """Queue bets for CLV tracking (write-behind, never blocks)"""
+        try:
+            logger = get_prediction_logger()
+        except Exception as e:
+            print(f"⚠️ Prediction logging disabled: {e}")
+            return
+        
+        records = []
+        for bet in bets:
+            market_type, prediction = self._clv_selection(bet.sub_market)
+            records.append({
+                'fixture_id': fixture_id,
+                'home_team': home_team,
+                'away_team': away_team,
+                'market_type': market_type,
+                'prediction': prediction,
+                'odds': bet.real_odds,
+                'model_probability': bet.probability,
+                'confidence': None,
+            })
+        logger.log_many(records)
+    
+    def _clv_selection(self, market: str) -> Tuple[str, str]:
+        """Map internal market keys to CLVTracker market/selection ('over_2.5' → Over/Under, 'Over 2.5')"""
+        results = {'btts_yes': ('BTTS', 'Yes'), 'btts_no': ('BTTS', 'No'),
+                   'home_win': ('1X2', 'Home'), 'draw': ('1X2', 'Draw'), 'away_win': ('1X2', 'Away')}
+        if market in results:
+            return results[market]
+        for side in ('over', 'under'):
+            if market.startswith(f'{side}_'):
+                return 'Over/Under', f"{side.capitalize()} {market[len(side) + 1:]}"
+        return self._get_market_category(market), market
+    
     def _get_market_category(self, market: str) -> str:
         """Get market category"""
         if 'btts' in market:
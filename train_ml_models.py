@@ -16,10 +16,10 @@ pip install scikit-learn xgboost pandas numpy requests joblib
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import requests
 import json
 import os
-import time
+
+from api_football import get_api_football
 
 # Import our V3 engine
 from betboy_v3_ml_engine import (
@@ -39,8 +39,7 @@ class HistoricalDataCollector:
     
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self.base_url = "https://v3.football.api-sports.io"
-        self.headers = {'x-apisports-key': api_key}
+        self.api = get_api_football(api_key)
     
     def collect_season_data(self, league_id: int, season: int) -> pd.DataFrame:
         """
@@ -51,9 +50,8 @@ class HistoricalDataCollector:
         print(f"📥 Collecting {league_id} Season {season}...")
         
         try:
-            response = requests.get(
-                f"{self.base_url}/fixtures",
-                headers=self.headers,
+            response = self.api.get(
+                'fixtures',
                 params={
                     'league': league_id,
                     'season': season,
@@ -133,7 +131,7 @@ class HistoricalDataCollector:
                 df = self.collect_season_data(league_id, season)
                 if not df.empty:
                     all_data.append(df)
-                time.sleep(1)  # Rate limiting
+                # Rate limiting + caching happen in the shared API-Football client
         
         if all_data:
             return pd.concat(all_data, ignore_index=True)
@@ -27,6 +27,8 @@ from collections import defaultdict
 import time
 import math
 
+from probability_kernel import at_least
+
 
 class UltraLiveScanner:
     """
@@ -203,7 +205,7 @@ class UltraLiveScanner:
             
             print(f"\n💰 FINAL: BTTS {btts_prob:.1f}% | O/U {ou_result['recommendation']}")
             
-            return {
+            result = {
                 'fixture_id': fixture_id,
                 'home_team': home_team,
                 'away_team': away_team,
@@ -238,6 +240,10 @@ class UltraLiveScanner:
                 'phase': self._get_phase(minute),
                 'timestamp': datetime.now().isoformat()
             }
+            
+            self._log_predictions(result)
+            
+            return result
         
         except Exception as e:
             print(f"\n❌ ERROR: {e}")
@@ -245,6 +251,33 @@ class UltraLiveScanner:
             traceback.print_exc()
             return None
     
+    def _log_predictions(self, analysis: Dict):
+        """Queue live BTTS / Over lines for CLV tracking (write-behind, never blocks)"""
+        logger = getattr(self.analyzer, 'prediction_logger', None)
+        if logger is None:
+            return
+        
+        base = {
+            'fixture_id': analysis['fixture_id'],
+            'home_team': analysis['home_team'],
+            'away_team': analysis['away_team'],
+            'odds': None,
+            'confidence': None,
+        }
+        records = []
+        
+        # Bereits entschiedene Märkte nicht loggen
+        if analysis['btts_confidence'] != 'COMPLETE':
+            records.append({**base, 'market_type': 'BTTS', 'prediction': 'Yes',
+                            'model_probability': analysis['btts_prob']})
+        for line in analysis['over_under'].get('thresholds', {}).values():
+            if line.get('status') != 'HIT':
+                records.append({**base, 'market_type': 'Over/Under',
+                                'prediction': f"Over {line['threshold']}",
+                                'model_probability': line['over_probability']})
+        
+        logger.log_many(records)
+    
     def _calculate_btts_probability(self, home_score: int, away_score: int,
                                     xg_home: float, xg_away: float, 
                                     minute: int,
@@ -441,9 +474,7 @@ class UltraLiveScanner:
         """P(X >= goals_needed) mit Poisson"""
         if expected <= 0:
             return 10.0
-        p_under = sum((expected ** k) * math.exp(-expected) / math.factorial(k) 
-                      for k in range(goals_needed))
-        return max(5, min(95, (1 - p_under) * 100))
+        return max(5, min(95, at_least(expected, goals_needed) * 100))
     
     def _calculate_next_goal(self, home_score: int, away_score: int,
                              xg_home: float, xg_away: float,